@@ -1,9 +1,27 @@
-from .src.logger import Logger  # main logger class
-from .src.loggerDecorator import gaurav_logger  # decorator class
-from .src.loggerMessageDecorators import SimpleLogger, LoggerMessageDecorator, LoggerWithServiceName, LoggerWithTimeStamp  # Decorators to add details with logger
-from .src.logLevelEnum import LoglevelEnum  # log status
-from .src.writeLogMessage import WriteLogMessage, AsyncFileWriterLog, FileWriterLog, WriteLogsInQueue # write logs into certain filess
-
-__all__ = ['Logger', 'gaurav_logger', 'SimpleLogger', 'LoggerMessageDecorator', 'LoggerWithServiceName',
-           'LoggerWithTimeStamp', 'LoglevelEnum', 'WriteLogMessage', 'AsyncFileWriterLog',
-           'FileWriterLog', 'WriteLogsInQueue'] 
\ No newline at end of file
+from .src.logger import Logger  # main logger class
+from .src.loggerDecorator import gaurav_logger  # decorator class
+from .src.loggerMessageDecorators import SimpleLogger, LoggerMessageDecorator, LoggerWithServiceName, LoggerWithTimeStamp  # Decorators to add details with logger
+from .src.logLevelEnum import LoglevelEnum  # log status
+from .src.overflowPolicyEnum import OverflowPolicyEnum  # what a full log queue does with new logs
+from .src.writeLogMessage import WriteLogMessage, AsyncFileWriterLog, FileWriterLog, WriteLogsInQueue, MmapFileWriterLog, RingBufferWriterLog # write logs into certain filess
+from .src.logRouter import LogRoute, RoutingWriterLog # send logs to several writers
+from .src.logSampling import LogSampler, EveryNLogSampler, ProbabilisticLogSampler, RateLimitLogSampler # sample high-frequency logs
+from .src.logRotation import LogRotationPolicy # rotate log files by size and time
+from .src.timestampFormatEnum import TimestampFormatEnum # format of the timestamp added by LoggerWithTimeStamp
+from .src.logTimestamp import LogTimestampFormatter # cached timestamp rendering
+from .src.logMessage import LazyLogMessage # message formatted only when the log is written
+from .src.logRecord import LogRecord # compact log record built by the logger
+from .src.binaryLogFormat import BinaryLogFormatter, decodebinarylog # compact binary log files
+from .src.fsyncPolicyEnum import FsyncPolicyEnum # when written logs are forced to the disk
+from .src.logDurability import LogAck # acknowledgement of a log written with Logger.logwithack
+from .src.logMetrics import LogMetricsRegistry, LogSinkMetrics # metrics about the logging pipeline
+from .src.logFormatter import LogFormatter, PipeLogFormatter, JsonLinesLogFormatter # serialize logs written to files
+
+__all__ = ['Logger', 'gaurav_logger', 'SimpleLogger', 'LoggerMessageDecorator', 'LoggerWithServiceName',
+           'LoggerWithTimeStamp', 'LoglevelEnum', 'OverflowPolicyEnum', 'WriteLogMessage', 'AsyncFileWriterLog',
+           'FileWriterLog', 'WriteLogsInQueue', 'LogRotationPolicy', 'LogFormatter', 'PipeLogFormatter', 'JsonLinesLogFormatter',
+           'TimestampFormatEnum', 'LogTimestampFormatter', 'LazyLogMessage', 'LogRecord',
+           'FsyncPolicyEnum', 'LogAck', 'MmapFileWriterLog',
+           'BinaryLogFormatter', 'decodebinarylog', 'LogRoute', 'RoutingWriterLog',
+           'LogSampler', 'EveryNLogSampler', 'ProbabilisticLogSampler', 'RateLimitLogSampler',
+           'RingBufferWriterLog', 'LogMetricsRegistry', 'LogSinkMetrics'] 
\ No newline at end of file
@@ -0,0 +1,3 @@
+from .loggerBenchmark import BenchmarkScenario, runscenario, runbenchmarks, findregressions, main  # throughput and latency benchmarks
+
+__all__ = ['BenchmarkScenario', 'runscenario', 'runbenchmarks', 'findregressions', 'main']
@@ -0,0 +1,5 @@
+import sys
+
+from .loggerBenchmark import main
+
+sys.exit(main())
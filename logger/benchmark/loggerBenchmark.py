@@ -0,0 +1,309 @@
+from typing import Callable, Iterable
+from collections import deque
+import argparse
+import platform
+import tempfile
+import threading
+import shutil
+import json
+import time
+import sys
+import os
+
+from ..src.logger import Logger
+from ..src.loggerDecorator import gaurav_logger
+from ..src.logLevelEnum import LoglevelEnum
+from ..src.loggerMessageDecorators import LoggerMessageDecorator, SimpleLogger, LoggerWithTimeStamp, LoggerWithServiceName
+from ..src.writeLogMessage import WriteLogMessage, FileWriterLog, AsyncFileWriterLog, WriteLogsInQueue, MmapFileWriterLog, RingBufferWriterLog
+
+try:
+    import resource
+except ImportError:  # not available on Windows, RSS is then read from /proc only
+    resource = None
+
+# writers under test, each factory receives the log file path of the scenario
+# (the in-memory writers never write it)
+WRITERS : dict[str, Callable[[str], WriteLogMessage]] = {
+    "file": lambda logfilepath: FileWriterLog(logfilepath),
+    "file-keepopen": lambda logfilepath: FileWriterLog(logfilepath, keepfileopen=True, flusheveryrecords=0),
+    "async": lambda logfilepath: AsyncFileWriterLog(logfilepath),
+    "mmap": lambda logfilepath: MmapFileWriterLog(logfilepath),
+    "queue": lambda logfilepath: WriteLogsInQueue(deque()),
+    "ring": lambda logfilepath: RingBufferWriterLog(65536, FileWriterLog(logfilepath), dumponexception=False),
+}
+
+# writers keeping the records in memory, their log file stays empty
+INMEMORY_WRITERS : frozenset[str] = frozenset(("queue", "ring"))
+
+# decorator chains under test
+CHAINS : dict[str, Callable[[], LoggerMessageDecorator]] = {
+    "simple": lambda: SimpleLogger(),
+    "timestamp": lambda: SimpleLogger(LoggerWithTimeStamp()),
+    "servicename": lambda: SimpleLogger(LoggerWithServiceName(serviceName="benchmark")),
+    "full": lambda: SimpleLogger(LoggerWithTimeStamp(additionallogger=LoggerWithServiceName(serviceName="benchmark"))),
+}
+
+DEFAULT_THREADS : tuple[int, ...] = (1, 10, 100, 1000)
+
+class BenchmarkScenario:
+    """
+        One benchmark run: a writer and a decorator chain logging from several threads.
+
+        Attributes:
+            writer (str): Key of the writer in `WRITERS`.
+            chain (str): Key of the decorator chain in `CHAINS`.
+            threads (int): Number of threads logging concurrently.
+            records (int): Total number of records logged, split evenly across the threads.
+            messagesize (int): Length of every log message in characters.
+    """
+    def __init__(self, writer: str, chain: str, threads: int, records: int, messagesize: int = 100) -> None:
+        self.writer : str = writer
+        self.chain : str = chain
+        self.threads : int = threads
+        self.records : int = records
+        self.messagesize : int = messagesize
+
+    @property
+    def key(self) -> str:
+        """
+            Identifies the scenario when comparing results against a baseline.
+        """
+        return f"{self.writer}/{self.chain}/{self.threads}"
+
+def percentile(sortedvalues: list[int], fraction: float) -> int:
+    """
+        Returns the nearest-rank percentile of an already sorted list, 0 when it is empty.
+    """
+    if not sortedvalues:
+        return 0
+    return sortedvalues[min(len(sortedvalues) - 1, int(fraction * len(sortedvalues)))]
+
+def currentrss() -> int|None:
+    """
+        Returns the resident set size of the process in bytes.
+
+        Reads `/proc/self/statm` where available. Elsewhere falls back to the peak
+        RSS reported by `resource`, which still shows growth but never shrinks.
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def waitfordrain(logfilepath: str, expectedlines: int, timeout: float) -> bool:
+    """
+        Blocks until `logfilepath` holds `expectedlines` lines or `timeout` seconds passed.
+
+        The file is read incrementally, so polling a large file stays cheap.
+
+        Returns:
+            bool: True if every line reached the file.
+    """
+    deadline = time.monotonic() + timeout
+    offset, lines = 0, 0
+    while True:
+        try:
+            with open(logfilepath, "rb") as f:
+                f.seek(offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            chunk = b""
+        offset += len(chunk)
+        lines += chunk.count(b"\n")
+        if lines >= expectedlines:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.005)
+
+def runscenario(scenario: BenchmarkScenario, directory: str, draintimeout: float = 60.0) -> dict:
+    """
+        Runs one scenario and returns its measurements.
+
+        Every thread waits on a barrier, then logs its share of the records through
+        `Logger.log` from a function decorated with `gaurav_logger`, timing every
+        call. Throughput only counts the time the producers spent logging. Drain
+        time is the extra time until every record reached the log file, which is
+        what the asynchronous writer defers.
+
+        Args:
+            scenario (BenchmarkScenario): Scenario to run.
+            directory (str): Directory the log file of the scenario is created in.
+            draintimeout (float): Seconds to wait for the log file to be complete.
+
+        Returns:
+            dict: The scenario and its measurements, latencies in nanoseconds.
+    """
+    logfilepath = os.path.join(directory, f"{scenario.writer}-{scenario.chain}-{scenario.threads}.log")
+    writer = WRITERS[scenario.writer](logfilepath)
+
+    # the logger is a singleton, drop the previous scenario's instance
+    Logger._instance = None
+    Logger(writer, loggerDecorator=CHAINS[scenario.chain]())
+
+    threads = max(1, scenario.threads)
+    perthread = [scenario.records // threads + (1 if index < scenario.records % threads else 0) for index in range(threads)]
+    latencies : list[list[int]] = [[] for _ in range(threads)]
+    message = "x" * scenario.messagesize
+    barrier = threading.Barrier(threads + 1)
+
+    @gaurav_logger()
+    def produce(records: int, timings: list[int]) -> None:
+        log = Logger.log
+        clock = time.perf_counter_ns
+        level = LoglevelEnum.INFO
+        append = timings.append
+        for _ in range(records):
+            start = clock()
+            log(message, level)
+            append(clock() - start)
+
+    def worker(index: int) -> None:
+        barrier.wait()
+        produce(perthread[index], latencies[index])
+
+    # measured before the threads exist, so their stacks do not hide the logger's growth
+    rssbefore = currentrss()
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    for thread in workers:
+        thread.start()
+
+    cpubefore = time.process_time()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    produced = time.perf_counter()
+
+    flush = getattr(writer, "flush", None)
+    if flush is not None:
+        flush()
+    drained = scenario.writer in INMEMORY_WRITERS or waitfordrain(logfilepath, scenario.records, draintimeout)
+    finished = time.perf_counter()
+    cpuafter = time.process_time()
+    rssafter = currentrss()
+
+    close = getattr(writer, "close", None)
+    if close is not None:
+        close()
+
+    alllatencies = sorted(latency for timings in latencies for latency in timings)
+    elapsed = produced - started
+    return {
+        "scenario": scenario.key,
+        "writer": scenario.writer,
+        "chain": scenario.chain,
+        "threads": threads,
+        "records": scenario.records,
+        "messagesize": scenario.messagesize,
+        "logspersecond": scenario.records / elapsed if elapsed > 0 else 0.0,
+        "p50ns": percentile(alllatencies, 0.50),
+        "p99ns": percentile(alllatencies, 0.99),
+        "maxns": alllatencies[-1] if alllatencies else 0,
+        "producerseconds": elapsed,
+        "drainseconds": finished - produced,
+        "drained": drained,
+        "cpuseconds": cpuafter - cpubefore,
+        "rssgrowthbytes": rssafter - rssbefore if rssafter is not None and rssbefore is not None else None,
+    }
+
+def runbenchmarks(writers: Iterable[str], chains: Iterable[str], threadcounts: Iterable[int],
+                  records: int, messagesize: int = 100) -> list[dict]:
+    """
+        Runs every combination of writer, decorator chain and thread count.
+
+        Returns:
+            list[dict]: Measurements of every scenario, see `runscenario`.
+    """
+    directory = tempfile.mkdtemp(prefix="logger-benchmark-")
+    try:
+        return [runscenario(BenchmarkScenario(writer, chain, threads, records, messagesize), directory)
+                for writer in writers for chain in chains for threads in threadcounts]
+    finally:
+        Logger._instance = None
+        shutil.rmtree(directory, ignore_errors=True)
+
+def findregressions(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """
+        Compares throughput and p99 latency with a baseline run of the same scenarios.
+
+        Args:
+            results (list[dict]): Measurements of the current run.
+            baseline (list[dict]): Measurements of the baseline run.
+            tolerance (float): Allowed relative slowdown, e.g. 0.2 for 20%.
+
+        Returns:
+            list[str]: One description per regressed scenario.
+    """
+    previous = {result["scenario"]: result for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(result["scenario"])
+        if before is None:
+            continue
+        if result["logspersecond"] < before["logspersecond"] * (1 - tolerance):
+            regressions.append(f"{result['scenario']}: logs/sec {before['logspersecond']:.0f} -> {result['logspersecond']:.0f}")
+        if before["p99ns"] and result["p99ns"] > before["p99ns"] * (1 + tolerance):
+            regressions.append(f"{result['scenario']}: p99 {before['p99ns']}ns -> {result['p99ns']}ns")
+    return regressions
+
+def formattable(results: list[dict]) -> str:
+    """
+        Renders the measurements as a human readable table.
+    """
+    header = f"{'scenario':<32} {'logs/sec':>12} {'p50 us':>9} {'p99 us':>9} {'drain s':>9} {'rss MiB':>9}"
+    rows = [header, "-" * len(header)]
+    for result in results:
+        rss = result["rssgrowthbytes"]
+        rows.append(f"{result['scenario']:<32} {result['logspersecond']:>12.0f} {result['p50ns'] / 1000:>9.2f} "
+                    f"{result['p99ns'] / 1000:>9.2f} {result['drainseconds']:>9.3f} "
+                    f"{(rss / 1048576 if rss is not None else float('nan')):>9.2f}")
+    return "\n".join(rows)
+
+def main(argv: list[str]|None = None) -> int:
+    """
+        Command line entry point, see `python -m logger.benchmark --help`.
+
+        Returns:
+            int: Exit code, 1 when a regression against `--baseline` was found.
+    """
+    parser = argparse.ArgumentParser(prog="python -m logger.benchmark",
+                                     description="Measure throughput, call latency, memory and drain time of the logger.")
+    parser.add_argument("--writers", nargs="+", choices=sorted(WRITERS), default=list(WRITERS))
+    parser.add_argument("--chains", nargs="+", choices=sorted(CHAINS), default=list(CHAINS))
+    parser.add_argument("--threads", nargs="+", type=int, default=list(DEFAULT_THREADS))
+    parser.add_argument("--records", type=int, default=100_000, help="records logged per scenario")
+    parser.add_argument("--messagesize", type=int, default=100, help="characters per log message")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args(argv)
+
+    results = runbenchmarks(args.writers, args.chains, args.threads, args.records, args.messagesize)
+    print(formattable(results))
+
+    if args.output:
+        report = {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpucount": os.cpu_count(),
+            "createdat": time.time(),
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            regressions = findregressions(results, json.load(f)["results"], args.tolerance)
+        for regression in regressions:
+            print(f"[LoggerBenchmark] Regression {regression}")
+        if regressions:
+            return 1
+    return 0
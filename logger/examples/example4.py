@@ -1,21 +1,21 @@
-# Simplest Hello World Examples for testing a logger 
-
-# create a simple sync filewriter and injected into logger to tell where to write the logs
-# and then use logger to do the logging process. and multiple data using decorators
-
-from logger import Logger
-from logger import *
-
-logMessanger : WriteLogMessage = FileWriterLog("log.txt")
-logdecorator : LoggerMessageDecorator = SimpleLogger(LoggerWithTimeStamp(additionallogger=LoggerWithServiceName(serviceName="Service1")))
-
-# remove log level even though we have provided.. as a statement
-logger = Logger(logMessanger, loggerDecorator=logdecorator, includeloglevel=False)
-
-@gaurav_logger()
-def func1(msg: str):
-    Logger.log("before writing message", LoglevelEnum.DEBUG)
-    print(msg)
-    Logger.log("after writing message", LoglevelEnum.DEBUG)
-
-func1("hello World")
+# Simplest Hello World Examples for testing a logger 
+
+# create a simple sync filewriter and injected into logger to tell where to write the logs
+# and then use logger to do the logging process. and multiple data using decorators
+
+from logger import Logger
+from logger import *
+
+logMessanger : WriteLogMessage = FileWriterLog("log.txt")
+logdecorator : LoggerMessageDecorator = SimpleLogger(LoggerWithTimeStamp(additionallogger=LoggerWithServiceName(serviceName="Service1")))
+
+# remove log level even though we have provided.. as a statement
+logger = Logger(logMessanger, loggerDecorator=logdecorator, includeloglevel=False)
+
+@gaurav_logger()
+def func1(msg: str):
+    Logger.log("before writing message", LoglevelEnum.DEBUG)
+    print(msg)
+    Logger.log("after writing message", LoglevelEnum.DEBUG)
+
+func1("hello World")
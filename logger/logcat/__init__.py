@@ -0,0 +1,3 @@
+from .logCat import main  # decode binary logs back to text
+
+__all__ = ['main']
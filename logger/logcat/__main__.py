@@ -0,0 +1,5 @@
+import sys
+
+from .logCat import main
+
+sys.exit(main())
@@ -0,0 +1,52 @@
+from zoneinfo import ZoneInfo
+from datetime import timezone
+import argparse
+import sys
+import os
+
+from ..src.binaryLogFormat import decodebinarylog
+from ..src.logFormatter import LogFormatter, PipeLogFormatter, JsonLinesLogFormatter
+from ..src.logTimestamp import LogTimestampFormatter
+from ..src.timestampFormatEnum import TimestampFormatEnum
+from ..src.loggerException import LoggerException
+
+# text formats the binary logs can be converted to
+OUTPUT_FORMATTERS : dict[str, type[LogFormatter]] = {
+    "text": PipeLogFormatter,
+    "json": JsonLinesLogFormatter,
+}
+
+def main(argv: list[str]|None = None) -> int:
+    """
+        Command line entry point, see `python -m logger.logcat --help`.
+
+        Returns:
+            int: Exit code, 1 when a file could not be read or decoded.
+    """
+    parser = argparse.ArgumentParser(prog="python -m logger.logcat",
+                                     description="Convert logs written with BinaryLogFormatter back to text or JSON lines.")
+    parser.add_argument("files", nargs="+", help="binary log files, decoded in the given order")
+    parser.add_argument("--output", choices=sorted(OUTPUT_FORMATTERS), default="text", help="output format")
+    parser.add_argument("--timestampformat", choices=[member.name for member in TimestampFormatEnum],
+                        default=TimestampFormatEnum.DEFAULT.name, help="format of the decoded timestamps")
+    parser.add_argument("--timezone", default="UTC", help="IANA timezone the timestamps are rendered in")
+    args = parser.parse_args(argv)
+
+    localtimezone = timezone.utc if args.timezone == "UTC" else ZoneInfo(args.timezone)
+    timestampformatter = LogTimestampFormatter(localtimezone, TimestampFormatEnum[args.timestampformat])
+    formatter = OUTPUT_FORMATTERS[args.output]()
+
+    for path in args.files:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            for loggerjson in decodebinarylog(data, timestampformatter):
+                sys.stdout.write(formatter.format(loggerjson))
+        except BrokenPipeError:  # e.g. piped into head, the reader is gone
+            # silence the flush at exit as well, see the `signal` module documentation
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 0
+        except (OSError, LoggerException) as e:
+            print(f"[LogCat] Failed to decode {path}: {e}", file=sys.stderr)
+            return 1
+    return 0
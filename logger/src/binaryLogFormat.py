@@ -0,0 +1,242 @@
+from typing import Iterable, Iterator, Any, override
+import mmap
+
+from .logConstants import LogConstants
+from .logFormatter import LogFormatter
+from .logRecord import LogRecord
+from .logTimestamp import LogTimestampFormatter
+from .loggerException import LoggerException, LoggerExceptionMessageConstant
+
+# every block starts with these bytes, the last one is the format version
+BINARY_LOG_MAGIC : bytes = b'\xa7LG\x01'
+
+# fields whose values repeat across records and are interned in the string table
+BINARY_LOG_INTERNED_FIELDS : frozenset[str] = frozenset((LogConstants.LOG_SERVICE_NAME,
+                                                         LogConstants.LOG_FUNCTION_NAME,
+                                                         LogConstants.LOG_LEVEL))
+
+# kinds of field values, stored in the low bits of the field header
+TAG_STRING = 0
+TAG_INTERNED = 1
+TAG_TIMESTAMP = 2
+
+def appendvarint(buffer: bytearray, value: int) -> None:
+    """
+        Appends a non-negative integer as an unsigned LEB128 varint.
+    """
+    while value > 0x7f:
+        buffer.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+def readvarint(data: bytes|memoryview, offset: int) -> tuple[int, int]:
+    """
+        Reads an unsigned LEB128 varint.
+
+        Returns:
+            tuple[int, int]: The value and the offset right after it.
+
+        Raises:
+            IndexError: If the varint runs past the end of `data`.
+    """
+    value, shift = 0, 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+class BinaryLogFormatter(LogFormatter):
+    """
+        Formats log records into a compact binary format, see `decodebinarylog`
+        and `python -m logger.logcat` to read it back.
+
+        Records are encoded in self-contained blocks. A block holds a string table
+        and length-prefixed records: the field names and the values of the service
+        name, function id and level are stored once per block and referenced by
+        their index, and the timestamp is stored as the varint delta of the
+        record's `timestampns` to the previous record. The timestamp is rendered
+        again when the log is decoded, all other fields are kept as they are.
+
+        `AsyncFileWriterLog` encodes every batch it drains as one block, which is
+        where the savings come from. `format` encodes a single record as a block
+        on its own, as used by `FileWriterLog`. Because no block depends on
+        another, rotation, several processes appending to one file and records
+        replayed from a write-ahead log never break the file.
+
+        Records without `timestampns` (plain dictionaries) keep their timestamp as
+        text.
+
+        Attributes:
+            __logsequence (tuple[str, ...]): Order in which the fields are encoded,
+                missing fields are skipped.
+    """
+
+    # the writers write the returned bytes as they are
+    binary : bool = True
+    def __init__(self, logsequence: Iterable[str] = LogConstants.LOG_SEQUENCE) -> None:
+        super().__init__()
+        self.__logsequence : tuple[str, ...] = tuple(logsequence)
+
+    @override
+    def format(self, loggerjson: dict[str, str]) -> bytes: # type: ignore[override]
+        """
+            Encodes a single record as a block.
+        """
+        return self.formatbatch((loggerjson,))
+
+    def __eq__(self, other: object) -> bool:
+        return type(other) is BinaryLogFormatter and other.__logsequence == self.__logsequence
+
+    def __hash__(self) -> int:
+        return hash(self.__logsequence)
+
+    def formatbatch(self, records: Iterable[dict[str, str]]) -> bytes:
+        """
+            Encodes records into one block sharing a single string table.
+
+            Args:
+                records (Iterable[dict[str, str]]): Log records, messages already rendered.
+
+            Returns:
+                bytes: The encoded block.
+        """
+        strings : dict[str, int] = {}
+        body = bytearray()
+        record = bytearray()
+        basetimestamp = -1
+        previoustimestamp = 0
+        count = 0
+        for loggerjson in records:
+            record.clear()
+            for key in self.__logsequence:
+                value = loggerjson.get(key)
+                if value is None:
+                    continue
+                keyid = strings.setdefault(key, len(strings))
+                if key == LogConstants.LOG_TIMESTAMP and type(loggerjson) is LogRecord and loggerjson.timestampns:
+                    timestamp = loggerjson.timestampns
+                    if basetimestamp < 0:
+                        basetimestamp = previoustimestamp = timestamp
+                    delta = timestamp - previoustimestamp
+                    previoustimestamp = timestamp
+                    appendvarint(record, keyid << 2 | TAG_TIMESTAMP)
+                    appendvarint(record, delta << 1 if delta >= 0 else (-delta << 1) - 1)  # zigzag
+                elif key in BINARY_LOG_INTERNED_FIELDS:
+                    appendvarint(record, keyid << 2 | TAG_INTERNED)
+                    appendvarint(record, strings.setdefault(str(value), len(strings)))
+                else:
+                    encoded = str(value).encode('utf-8')
+                    appendvarint(record, keyid << 2 | TAG_STRING)
+                    appendvarint(record, len(encoded))
+                    record += encoded
+            appendvarint(body, len(record))
+            body += record
+            count += 1
+
+        payload = bytearray()
+        appendvarint(payload, len(strings))
+        for text in strings:
+            encoded = text.encode('utf-8')
+            appendvarint(payload, len(encoded))
+            payload += encoded
+        appendvarint(payload, max(basetimestamp, 0))
+        appendvarint(payload, count)
+        payload += body
+
+        block = bytearray(BINARY_LOG_MAGIC)
+        appendvarint(block, len(payload))
+        block += payload
+        return bytes(block)
+
+def decodebinarylog(data: bytes, timestampformatter: LogTimestampFormatter|None = None) -> Iterator[dict[str, str]]:
+    """
+        Decodes logs written with `BinaryLogFormatter`.
+
+        A block cut short at the end of `data`, e.g. by a crash during the write,
+        is ignored.
+
+        Args:
+            data (bytes): Content of the log file.
+            timestampformatter (LogTimestampFormatter | None): Renders the encoded
+                timestamps, UTC in the default format if None.
+
+        Yields:
+            dict[str, str]: The logger json of every record, in the order written.
+
+        Raises:
+            LoggerException: If `data` is not a binary log or is corrupted.
+    """
+    timestampformatter = timestampformatter if timestampformatter is not None else LogTimestampFormatter()
+    view = memoryview(data)
+    offset = 0
+    while offset < len(view):
+        if view[offset:offset + len(BINARY_LOG_MAGIC)] != BINARY_LOG_MAGIC:
+            if len(view) - offset < len(BINARY_LOG_MAGIC) and BINARY_LOG_MAGIC.startswith(bytes(view[offset:])):
+                return
+            raise LoggerException(f"{LoggerExceptionMessageConstant.BINARY_LOG_CORRUPTED_EXCEPTION} (offset {offset})")
+        try:
+            length, start = readvarint(view, offset + len(BINARY_LOG_MAGIC))
+        except IndexError:
+            return
+        end = start + length
+        if end > len(view):
+            return
+        try:
+            yield from decodeblock(view[start:end], timestampformatter)
+        except (IndexError, UnicodeDecodeError, KeyError) as e:
+            raise LoggerException(f"{LoggerExceptionMessageConstant.BINARY_LOG_CORRUPTED_EXCEPTION} (offset {offset})") from e
+        offset = end
+
+def binarylogdatalength(data: bytes|memoryview|mmap.mmap) -> int:
+    """
+        Returns the length of the complete blocks at the start of `data`, e.g. to
+        find where a binary log ends in a file followed by zero padding.
+    """
+    offset = 0
+    while offset < len(data):
+        if data[offset:offset + len(BINARY_LOG_MAGIC)] != BINARY_LOG_MAGIC:
+            break
+        try:
+            length, start = readvarint(data, offset + len(BINARY_LOG_MAGIC))
+        except IndexError:
+            break
+        if start + length > len(data):
+            break
+        offset = start + length
+    return offset
+
+def decodeblock(payload: memoryview, timestampformatter: LogTimestampFormatter) -> list[dict[str, Any]]:
+    """
+        Decodes the records of one block, see `BinaryLogFormatter.formatbatch`.
+    """
+    count, offset = readvarint(payload, 0)
+    strings : list[str] = []
+    for _ in range(count):
+        length, offset = readvarint(payload, offset)
+        strings.append(bytes(payload[offset:offset + length]).decode('utf-8'))
+        offset += length
+    timestamp, offset = readvarint(payload, offset)
+    count, offset = readvarint(payload, offset)
+
+    records : list[dict[str, Any]] = []
+    for _ in range(count):
+        length, offset = readvarint(payload, offset)
+        end = offset + length
+        loggerjson : dict[str, Any] = {}
+        while offset < end:
+            header, offset = readvarint(payload, offset)
+            key, tag = strings[header >> 2], header & 3
+            value, offset = readvarint(payload, offset)
+            if tag == TAG_TIMESTAMP:
+                timestamp += value >> 1 if not value & 1 else -((value + 1) >> 1)
+                loggerjson[key] = timestampformatter.format(timestamp)
+            elif tag == TAG_INTERNED:
+                loggerjson[key] = strings[value]
+            else:
+                loggerjson[key] = bytes(payload[offset:offset + value]).decode('utf-8')
+                offset += value
+        records.append(loggerjson)
+    return records
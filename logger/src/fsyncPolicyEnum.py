@@ -0,0 +1,22 @@
+from enum import Enum
+
+# fsync policy enum
+class FsyncPolicyEnum(Enum):
+    """
+        Defines when a file writer forces written logs from the operating system
+        cache to the disk with `fsync`, so they survive a crash of the machine.
+
+        Attributes:
+            NEVER: Leave it to the operating system. Logs survive a crash of the
+                process, but not of the machine.
+            EVERY_RECORD: Fsync after every write. A batch written by
+                `AsyncFileWriterLog` is fsynced once as a whole.
+            EVERY_N_RECORDS: Fsync once `fsynceveryrecords` records were written
+                since the last fsync.
+            INTERVAL: Fsync once `fsynceveryms` milliseconds passed since the last
+                fsync.
+    """
+    NEVER = 'NEVER'
+    EVERY_RECORD = 'EVERY_RECORD'
+    EVERY_N_RECORDS = 'EVERY_N_RECORDS'
+    INTERVAL = 'INTERVAL'
@@ -0,0 +1,84 @@
+from collections import OrderedDict
+from typing import Any
+
+from .logConstants import LogConstants
+
+class CoalescedLogRecord:
+    """
+        A log record standing for itself and the identical records collapsed into it.
+
+        Attributes:
+            record (dict[str, str]): First record, written in place of all of them.
+            count (int): Number of records collapsed, the first one included.
+            last (dict[str, str]): Latest record collapsed.
+    """
+    __slots__ = ('record', 'count', 'last')
+
+    def __init__(self, record: dict[str, str]) -> None:
+        self.record : dict[str, str] = record
+        self.count : int = 1
+        self.last : dict[str, str] = record
+
+    def torecord(self) -> dict[str, str]:
+        """
+            Returns the record to write: the first record itself if nothing was
+            collapsed into it, otherwise a copy whose message ends with the repeat
+            count and the timestamps of the first and the last record.
+        """
+        if self.count == 1:
+            return self.record
+        record : Any = self.record.copy()
+        first = self.record.get(LogConstants.LOG_TIMESTAMP)
+        last = self.last.get(LogConstants.LOG_TIMESTAMP)
+        summary = f"repeated {self.count} times"
+        if first is not None and last is not None:
+            summary += f", first {first}, last {last}"
+        record[LogConstants.LOG_MESSAGE] = f"{record.get(LogConstants.LOG_MESSAGE)} [{summary}]"
+        return record
+
+class LogCoalescer:
+    """
+        Collapses identical records of a batch into one, see `AsyncFileWriterLog`.
+
+        Records are identical when their service name, function id, level and
+        rendered message match; timestamps may differ. The most recently seen
+        `windowsize` distinct records are remembered, the least recently seen one
+        is forgotten when another distinct record arrives, so a record is only
+        collapsed into an earlier one still in the window.
+
+        Attributes:
+            __windowsize (int): Number of distinct records remembered.
+            __window (OrderedDict[tuple, CoalescedLogRecord]): Remembered records,
+                least recently seen first.
+    """
+    def __init__(self, windowsize: int) -> None:
+        self.__windowsize : int = max(1, windowsize)
+        self.__window : OrderedDict[tuple, CoalescedLogRecord] = OrderedDict()
+
+    def add(self, record: dict[str, str]) -> CoalescedLogRecord|None:
+        """
+            Offers a record with a rendered message.
+
+            Returns:
+                CoalescedLogRecord | None: The entry to write in the place of
+                    `record`, or None if it was collapsed into an earlier entry.
+        """
+        key = (record.get(LogConstants.LOG_SERVICE_NAME), record.get(LogConstants.LOG_FUNCTION_NAME),
+               record.get(LogConstants.LOG_LEVEL), record.get(LogConstants.LOG_MESSAGE))
+        window = self.__window
+        entry = window.get(key)
+        if entry is not None:
+            entry.count += 1
+            entry.last = record
+            window.move_to_end(key)
+            return None
+        entry = window[key] = CoalescedLogRecord(record)
+        if len(window) > self.__windowsize:
+            window.popitem(last=False)
+        return entry
+
+    def reset(self) -> None:
+        """
+            Forgets every record, later records are never collapsed into earlier ones.
+        """
+        self.__window.clear()
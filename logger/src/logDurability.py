@@ -0,0 +1,238 @@
+from typing import Any
+import threading
+import struct
+import os
+
+# header of every write-ahead log entry: sequence number and payload length
+WAL_ENTRY_HEADER = struct.Struct('>QI')
+
+# spill file size (bytes) from which written entries are dropped even while newer ones are pending
+WAL_COMPACT_SIZE : int = 1024 * 1024
+
+class LogAck:
+    """
+        Acknowledgement of one record written with `writelogwithack`.
+
+        The acknowledgement completes once the record is written to the log file,
+        and fsynced unless the writer's fsync policy is `FsyncPolicyEnum.NEVER`.
+        A record whose write failed is never acknowledged, so a caller that waits
+        for the acknowledgement and retries otherwise gets at-least-once delivery.
+        Waiting callers are woken up when the write fails, see `fail`.
+
+        Attributes:
+            sequence (int): Sequence number of the record, in the order records were queued.
+            __done (threading.Event): Set once the record is durable or its write failed.
+            __failed (bool): True if the write failed.
+    """
+    __slots__ = ('sequence', '__done', '__failed')
+
+    def __init__(self, sequence: int = 0) -> None:
+        self.sequence : int = sequence
+        self.__done : threading.Event = threading.Event()
+        self.__failed : bool = False
+
+    @property
+    def done(self) -> bool:
+        """
+            True once the record was written.
+        """
+        return self.__done.is_set() and not self.__failed
+
+    @property
+    def failed(self) -> bool:
+        """
+            True if writing the record failed, it will never be acknowledged.
+        """
+        return self.__failed
+
+    def wait(self, timeout: float|None = None) -> bool:
+        """
+            Blocks until the record was written, its write failed or `timeout`
+            seconds passed.
+
+            Returns:
+                bool: True if the record was written.
+        """
+        return self.__done.wait(timeout) and not self.__failed
+
+    def complete(self) -> None:
+        """
+            Marks the record as written and wakes up every waiting caller.
+        """
+        self.__done.set()
+
+    def fail(self) -> None:
+        """
+            Marks the write of the record as failed and wakes up every waiting caller.
+        """
+        self.__failed = True
+        self.__done.set()
+
+class PendingLogRecord:
+    """
+        Queue entry of `AsyncFileWriterLog` for a record that is acknowledged or
+        spilled to the write-ahead log.
+
+        Attributes:
+            sequence (int): Sequence number of the record.
+            record (Any): The log record, None once it was formatted into `message`.
+            message (str | bytes | None): The formatted line, formatted by the producer
+                when it was spilled to the write-ahead log.
+            ack (LogAck | None): Acknowledgement completed once the record is written.
+    """
+    __slots__ = ('sequence', 'record', 'message', 'ack')
+
+    def __init__(self, sequence: int, record: Any, message: str|bytes|None, ack: LogAck|None) -> None:
+        self.sequence : int = sequence
+        self.record : Any = record
+        self.message : str|bytes|None = message
+        self.ack : LogAck|None = ack
+
+class WriteAheadLog:
+    """
+        Spill file keeping the records queued by `AsyncFileWriterLog` until they
+        reached the log file, so they survive the process being killed.
+
+        Every entry is the formatted line prefixed with its sequence number and
+        length, appended with a single unbuffered write: once `append` returned
+        the entry is in the operating system and survives SIGKILL or an OOM kill
+        of the process. A checkpoint file next to it holds the sequence number of
+        the last record known to be in the log file. On the next start `recover`
+        returns every entry after the checkpoint, a torn entry at the end is
+        ignored. A record written to the log file just before the crash but not
+        yet checkpointed is replayed again, so delivery is at-least-once.
+
+        Checkpointed entries are dropped with `reset` once nothing is pending,
+        or with `compact` while newer entries still are, so the spill file only
+        holds the records not yet written plus the last few batches.
+
+        Attributes:
+            __walpath (str): Path of the spill file.
+            __checkpointpath (str): Path of the checkpoint file, `<walpath>.checkpoint`.
+            __walfd (int | None): Descriptor the entries are appended to.
+            __checkpointfd (int | None): Descriptor of the checkpoint file.
+            __size (int): Length of the spill file in bytes.
+    """
+    def __init__(self, walpath: str) -> None:
+        self.__walpath : str = walpath
+        self.__checkpointpath : str = walpath + '.checkpoint'
+        self.__walfd : int|None = None
+        self.__checkpointfd : int|None = None
+        self.__size : int = 0
+
+    def recover(self) -> tuple[list[bytes], int]:
+        """
+            Reads the entries not covered by the checkpoint and opens the files for appending.
+
+            Returns:
+                tuple[list[bytes], int]: The encoded lines to replay in order, and the highest
+                    sequence number ever used, which new records continue from.
+        """
+        checkpoint = self.__readcheckpoint()
+        lastsequence = checkpoint
+        pending : list[bytes] = []
+        try:
+            with open(self.__walpath, 'rb') as walfile:
+                data = walfile.read()
+        except FileNotFoundError:
+            data = b''
+
+        offset = 0
+        while offset + WAL_ENTRY_HEADER.size <= len(data):
+            sequence, length = WAL_ENTRY_HEADER.unpack_from(data, offset)
+            start = offset + WAL_ENTRY_HEADER.size
+            if start + length > len(data):
+                break  # torn by a crash in the middle of the append
+            if sequence > checkpoint:
+                pending.append(data[start:start + length])
+            lastsequence = max(lastsequence, sequence)
+            offset = start + length
+
+        self.__walfd = os.open(self.__walpath, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self.__checkpointfd = os.open(self.__checkpointpath, os.O_RDWR | os.O_CREAT, 0o644)
+        self.__size = len(data)
+        return pending, lastsequence
+
+    @property
+    def size(self) -> int:
+        """
+            Length of the spill file in bytes.
+        """
+        return self.__size
+
+    def append(self, sequence: int, message: str|bytes) -> None:
+        """
+            Appends one formatted line, UTF-8 encoded, or the output of a binary
+            formatter with a single write.
+        """
+        payload = message.encode('utf-8') if type(message) is str else message
+        entry = WAL_ENTRY_HEADER.pack(sequence, len(payload)) + payload
+        written = os.write(self.__walfd, entry) # type: ignore[arg-type]
+        while written < len(entry):
+            written += os.write(self.__walfd, entry[written:]) # type: ignore[arg-type]
+        self.__size += len(entry)
+
+    def checkpoint(self, sequence: int) -> None:
+        """
+            Records that every entry up to `sequence` reached the log file.
+        """
+        os.pwrite(self.__checkpointfd, b'%020d' % sequence, 0) # type: ignore[arg-type]
+
+    def reset(self) -> None:
+        """
+            Empties the spill file. Only call it when every entry is checkpointed and
+            no append can run concurrently.
+        """
+        os.ftruncate(self.__walfd, 0) # type: ignore[arg-type]
+        self.__size = 0
+
+    def compact(self, sequence: int) -> None:
+        """
+            Drops the entries up to `sequence`, which must be checkpointed, and keeps
+            the ones after it. They are copied into a new file replacing the spill
+            file, so a crash meanwhile leaves one of both complete. Only call it
+            when no append can run concurrently.
+        """
+        with open(self.__walpath, 'rb') as walfile:
+            data = walfile.read()
+        offset = 0
+        while offset + WAL_ENTRY_HEADER.size <= len(data):
+            entrysequence, length = WAL_ENTRY_HEADER.unpack_from(data, offset)
+            if entrysequence > sequence:
+                break
+            offset += WAL_ENTRY_HEADER.size + length
+        tail = data[offset:]
+
+        temppath = self.__walpath + '.tmp'
+        tempfd = os.open(temppath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(tail)
+            while view:
+                view = view[os.write(tempfd, view):]
+        finally:
+            os.close(tempfd)
+        os.close(self.__walfd) # type: ignore[arg-type]
+        try:
+            os.replace(temppath, self.__walpath)
+        finally:
+            self.__walfd = os.open(self.__walpath, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self.__size = len(tail)
+
+    def close(self) -> None:
+        """
+            Closes both files, they are kept on disk for the next start.
+        """
+        for fd in (self.__walfd, self.__checkpointfd):
+            if fd is not None:
+                os.close(fd)
+        self.__walfd = self.__checkpointfd = None
+
+    def __readcheckpoint(self) -> int:
+        """
+            Returns the checkpointed sequence number, 0 if there is none or it is unreadable.
+        """
+        try:
+            with open(self.__checkpointpath, 'rb') as checkpointfile:
+                return int(checkpointfile.read(20) or b'0')
+        except (OSError, ValueError):
+            return 0
@@ -0,0 +1,422 @@
+from typing import IO
+import threading
+import time
+import os
+
+from .logRotation import LogRotationPolicy, LogRotator
+from .logLifecycle import LogLifecycleHooks
+from .fsyncPolicyEnum import FsyncPolicyEnum
+from .loggerException import LoggerException, LoggerExceptionMessageConstant
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows, large writes are then not locked
+    fcntl = None
+
+class LogFileHandle:
+    """
+        File handle shared by the file based log writers.
+
+        By default the handle keeps the historical behaviour of opening the log
+        file in append mode, writing the message and closing it again for every
+        call. When `keepfileopen` is enabled the handle keeps a single, buffered
+        file object open for its whole lifetime and flushes it according to the
+        configured flush policy, which removes the open/close syscall pair paid
+        on every record.
+
+        While the file is kept open the handle periodically compares the open
+        file with the file currently found at `logfilepath`. If the path was
+        removed or replaced (for example by an external logrotate), the file is
+        reopened so that logs keep landing at the configured path.
+
+        When a `LogRotationPolicy` is given, the handle rolls the file over by
+        size and/or wall-clock interval. The size check uses a byte counter kept
+        by the `LogRotator`, so no `stat()` call is made per write.
+
+        With `processsafe` enabled, several processes (e.g. pre-forked workers)
+        can append to the same file without interleaving or tearing lines. The
+        file is opened with O_APPEND and every call to `write` (or every flushed
+        buffer when the file is kept open) reaches the file through a single
+        `write()` syscall, which the kernel appends atomically. Writes larger than
+        `LOCKED_WRITE_SIZE` additionally hold an exclusive `fcntl.flock` lock.
+        Rotation is not supported in this mode, since every process would rotate
+        the shared file on its own.
+
+        The `fsyncpolicy` decides when written records are forced to the disk with
+        `fsync`: never, after every write, every `fsynceveryrecords` records or
+        every `fsynceveryms` milliseconds. A file is always fsynced before it is
+        closed or rotated if records were written since the last fsync; in the
+        open-per-write mode, that fsync reopens the file, since it was closed
+        after the last write. `write(sync=True)` fsyncs a record whatever the
+        policy says.
+
+        Attributes:
+            __logfilepath (str): File path where the logs are written.
+            __keepfileopen (bool): Keep one long-lived file object instead of
+                opening the file for every write.
+            __buffersize (int): Buffer size used when opening the file, -1 uses
+                the default buffer size of the platform.
+            __flusheveryrecords (int): Flush the buffer after this many records,
+                0 disables record based flushing.
+            __flusheveryms (float | None): Flush the buffer once this many
+                milliseconds have passed since the last flush.
+            __encoding (str): Encoding used to turn log messages into bytes.
+            __rotator (LogRotator | None): Performs the rollover when a rotation
+                policy is configured.
+            __processsafe (bool): Append with single unbuffered writes so several
+                processes can share the file.
+            __buffer (bytearray): Records buffered by the handle itself when the file
+                is kept open in process safe mode.
+            __fsyncpolicy (FsyncPolicyEnum): When written records are fsynced.
+            __fsynceveryrecords (int): Records between two fsyncs for
+                `FsyncPolicyEnum.EVERY_N_RECORDS`.
+            __fsynceveryms (float): Milliseconds between two fsyncs for
+                `FsyncPolicyEnum.INTERVAL`.
+            __unsyncedrecords (int): Records written since the last fsync.
+            __lastsync (float): Monotonic time of the last fsync.
+            __lock (threading.RLock): Lock guarding the file object, so writes and
+                background flushes never interleave.
+            __logfile (IO[bytes] | None): Currently open file object.
+            __pendingrecords (int): Records written since the last flush.
+            __lastflush (float): Monotonic time of the last flush.
+            __lastpathcheck (float): Monotonic time of the last path check.
+    """
+
+    # how often (seconds) an open file is compared against the configured path
+    PATH_CHECK_INTERVAL : float = 1.0
+
+    # process safe writes larger than this (bytes) hold an exclusive file lock
+    LOCKED_WRITE_SIZE : int = 4096
+
+    def __init__(self, logfilepath: str, keepfileopen: bool = False, buffersize: int = -1,
+                 flusheveryrecords: int = 1, flusheveryms: float|None = None, encoding: str = "utf-8",
+                 rotation: LogRotationPolicy|None = None, processsafe: bool = False,
+                 fsyncpolicy: FsyncPolicyEnum = FsyncPolicyEnum.NEVER, fsynceveryrecords: int = 100,
+                 fsynceveryms: float = 1000) -> None:
+        if processsafe and rotation is not None:
+            raise LoggerException(LoggerExceptionMessageConstant.PROCESS_SAFE_ROTATION_EXCEPTION)
+
+        self.__logfilepath : str = logfilepath
+        self.__keepfileopen : bool = keepfileopen
+        self.__buffersize : int = buffersize
+        self.__flusheveryrecords : int = flusheveryrecords
+        self.__flusheveryms : float|None = flusheveryms
+        self.__encoding : str = encoding
+        self.__rotator : LogRotator|None = LogRotator(logfilepath, rotation) if rotation is not None else None
+        self.__processsafe : bool = processsafe
+        self.__buffer : bytearray = bytearray()
+        self.__fsyncpolicy : FsyncPolicyEnum = fsyncpolicy
+        self.__fsynceveryrecords : int = max(1, fsynceveryrecords)
+        self.__fsynceveryms : float = fsynceveryms
+        self.__unsyncedrecords : int = 0
+
+        # text mode used to translate '\n' into the platform line separator, keep doing it
+        self.__linesep : str|None = os.linesep if os.linesep != "\n" else None
+
+        self.__lock = threading.RLock()
+        self.__logfile : IO[bytes]|None = None
+        self.__pendingrecords : int = 0
+        self.__lastflush : float = time.monotonic()
+        self.__lastpathcheck : float = self.__lastflush
+        self.__lastsync : float = self.__lastflush
+        self.__closed : bool = False
+
+        if self.__keepfileopen:
+            LogLifecycleHooks.registeratexit(self.close)
+            if self.__periodicinterval() is not None:
+                self.__startflushthread()
+            if self.__processsafe:
+                LogLifecycleHooks.registerafterfork(self.__resetafterfork)
+
+    @property
+    def logfilepath(self) -> str:
+        return self.__logfilepath
+
+    def write(self, message: str|bytes, records: int = 1, sync: bool = False) -> None:
+        """
+            Writes an already formatted message to the log file.
+
+            Args:
+                message (str | bytes): One or more formatted log lines, or the
+                    output of a binary formatter, which is written as is.
+                records (int): Number of log records contained in `message`,
+                    used by the record based flush policy.
+                sync (bool): Fsync the message before returning, whatever the
+                    fsync policy.
+
+            Raises:
+                OSError: If the file can not be opened or written.
+        """
+        if type(message) is bytes:
+            data = message
+        else:
+            if self.__linesep is not None:
+                message = message.replace("\n", self.__linesep) # type: ignore[union-attr]
+            data = message.encode(self.__encoding) # type: ignore[union-attr]
+
+        with self.__lock:
+            rotator = self.__rotator
+            if rotator is not None and rotator.shouldrollover(len(data)):
+                self.__rollover()
+
+            if not self.__keepfileopen:
+                if self.__processsafe:
+                    with open(self.__logfilepath, "ab", buffering=0) as logfile:
+                        self.__writeatomically(logfile, data)
+                        self.__syncifdue(logfile, records, sync)
+                else:
+                    with open(self.__logfilepath, "ab") as logfile:
+                        logfile.write(data)
+                        self.__syncifdue(logfile, records, sync)
+                if rotator is not None:
+                    rotator.byteswritten += len(data)
+                return
+
+            now = time.monotonic()
+            if self.__logfile is None:
+                self.__open()
+            elif now - self.__lastpathcheck >= self.PATH_CHECK_INTERVAL:
+                self.__lastpathcheck = now
+                if self.__pathchanged():
+                    self.__reopen()
+
+            if self.__processsafe:
+                self.__buffer += data
+            else:
+                self.__logfile.write(data) # type: ignore[union-attr]
+            self.__pendingrecords += records
+            if rotator is not None:
+                rotator.byteswritten += len(data)
+
+            if self.__flusheveryrecords and self.__pendingrecords >= self.__flusheveryrecords:
+                self.__flush(now)
+            elif self.__processsafe and 0 < self.__buffersize <= len(self.__buffer):
+                self.__flush(now)
+            elif self.__flusheveryms is not None and (now - self.__lastflush) * 1000 >= self.__flusheveryms:
+                self.__flush(now)
+            self.__syncifdue(self.__logfile, records, sync) # type: ignore[arg-type]
+
+    def flush(self) -> None:
+        """
+            Flushes any buffered records to the operating system.
+        """
+        with self.__lock:
+            self.__flush(time.monotonic())
+
+    def sync(self) -> None:
+        """
+            Flushes buffered records and forces everything written so far to the disk.
+        """
+        with self.__lock:
+            if self.__logfile is not None:
+                self.__sync(self.__logfile)
+            elif self.__unsyncedrecords:
+                self.__syncclosed()
+
+    def reopen(self) -> None:
+        """
+            Closes and reopens the log file, e.g. after it was moved by an external tool.
+        """
+        with self.__lock:
+            if self.__logfile is not None:
+                self.__reopen()
+
+    def rollover(self) -> None:
+        """
+            Rolls the log file over immediately. Requires a rotation policy.
+        """
+        with self.__lock:
+            if self.__rotator is not None:
+                self.__rollover()
+
+    def waitforrotation(self) -> None:
+        """
+            Blocks until background compression and cleanup of rotated files is done.
+        """
+        if self.__rotator is not None:
+            self.__rotator.waitformaintenance()
+
+    def close(self) -> None:
+        """
+            Flushes and closes the log file. Writing after close reopens the file.
+        """
+        with self.__lock:
+            if self.__keepfileopen and self.__periodicinterval() is not None and not self.__closed:
+                self.__stopflushing.set()
+            self.__closed = True
+            if self.__logfile is not None:
+                self.__closefile()
+            elif self.__unsyncedrecords:
+                self.__syncclosed()
+
+    def __open(self) -> None:
+        buffersize = 0 if self.__processsafe else self.__buffersize
+        self.__logfile = open(self.__logfilepath, "ab", buffering=buffersize)
+        self.__lastpathcheck = time.monotonic()
+        if self.__closed:
+            # written after close, which stopped the flush thread
+            self.__closed = False
+            if self.__periodicinterval() is not None:
+                self.__startflushthread()
+        if self.__rotator is not None:
+            self.__rotator.reset(os.fstat(self.__logfile.fileno()).st_size)
+
+    def __closefile(self) -> None:
+        """
+            Flushes the records buffered for the open file and closes it.
+        """
+        logfile = self.__logfile
+        try:
+            self.__flush(time.monotonic())
+            if self.__unsyncedrecords and self.__fsyncpolicy is not FsyncPolicyEnum.NEVER:
+                self.__sync(logfile) # type: ignore[arg-type]
+        finally:
+            self.__logfile = None
+            self.__pendingrecords = 0
+            logfile.close() # type: ignore[union-attr]
+
+    def __rollover(self) -> None:
+        if self.__logfile is not None:
+            self.__closefile()
+        elif self.__unsyncedrecords:
+            self.__syncclosed()
+        self.__rotator.rollover() # type: ignore[union-attr]
+
+    def __reopen(self) -> None:
+        self.__closefile()
+        self.__open()
+
+    def __flush(self, now: float) -> None:
+        self.__lastflush = now
+        if self.__logfile is not None and self.__pendingrecords:
+            self.__pendingrecords = 0
+            if self.__processsafe:
+                data = bytes(self.__buffer)
+                self.__buffer.clear()
+                self.__writeatomically(self.__logfile, data)
+            else:
+                self.__logfile.flush()
+
+    def __syncifdue(self, logfile: IO[bytes], records: int, force: bool = False) -> None:
+        """
+            Counts `records` as written and fsyncs `logfile` if `force` is set or
+            the fsync policy says so.
+        """
+        policy = self.__fsyncpolicy
+        if policy is FsyncPolicyEnum.NEVER and not force:
+            return
+        self.__unsyncedrecords += records
+        if force or policy is FsyncPolicyEnum.EVERY_RECORD:
+            self.__sync(logfile)
+        elif policy is FsyncPolicyEnum.EVERY_N_RECORDS:
+            if self.__unsyncedrecords >= self.__fsynceveryrecords:
+                self.__sync(logfile)
+        elif (time.monotonic() - self.__lastsync) * 1000 >= self.__fsynceveryms:
+            self.__sync(logfile)
+
+    def __sync(self, logfile: IO[bytes]) -> None:
+        """
+            Pushes buffered records to the operating system and fsyncs them.
+        """
+        now = time.monotonic()
+        if logfile is self.__logfile:
+            self.__flush(now)
+        else:
+            logfile.flush()
+        os.fsync(logfile.fileno())
+        self.__unsyncedrecords = 0
+        self.__lastsync = now
+
+    def __syncclosed(self) -> None:
+        """
+            Fsyncs records written in the open-per-write mode, whose file was
+            closed after the write. An fsync covers every write made to the file.
+        """
+        try:
+            logfile = open(self.__logfilepath, "r+b")
+        except FileNotFoundError:  # removed meanwhile, nothing left to sync
+            self.__unsyncedrecords = 0
+            return
+        with logfile:
+            self.__sync(logfile)
+
+    def __writeatomically(self, logfile: IO[bytes], data: bytes) -> None:
+        """
+            Appends `data` to an unbuffered O_APPEND file with a single `write()`,
+            holding an exclusive file lock for large writes.
+        """
+        if fcntl is not None and len(data) > self.LOCKED_WRITE_SIZE:
+            fcntl.flock(logfile.fileno(), fcntl.LOCK_EX)
+            try:
+                self.__writeall(logfile, data)
+            finally:
+                fcntl.flock(logfile.fileno(), fcntl.LOCK_UN)
+        else:
+            self.__writeall(logfile, data)
+
+    def __writeall(self, logfile: IO[bytes], data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            written = logfile.write(view)
+            view = view[written:]
+
+    def __pathchanged(self) -> bool:
+        """
+            Returns True when the file at `__logfilepath` is no longer the open file.
+        """
+        try:
+            pathstat = os.stat(self.__logfilepath)
+        except FileNotFoundError:
+            return True
+        filestat = os.fstat(self.__logfile.fileno()) # type: ignore[union-attr]
+        return (pathstat.st_dev, pathstat.st_ino) != (filestat.st_dev, filestat.st_ino)
+
+    def __startflushthread(self) -> None:
+        self.__stopflushing = threading.Event()
+        self.__flush_thread = threading.Thread(target=self.__flushperiodically, daemon=True)
+        self.__flush_thread.start()
+
+    def __resetafterfork(self) -> None:
+        """
+            Runs in a forked child: the records buffered by the parent are the
+            parent's to write, and the lock or flush thread may not have survived.
+        """
+        self.__lock = threading.RLock()
+        self.__buffer = bytearray()
+        self.__pendingrecords = 0
+        self.__unsyncedrecords = 0
+        if self.__periodicinterval() is not None and not self.__closed:
+            self.__startflushthread()
+
+    def __periodicinterval(self) -> float|None:
+        """
+            Returns the seconds between two runs of the background flush thread, or
+            None if neither time based flushing nor time based fsync is configured.
+        """
+        intervals = []
+        if self.__flusheveryms:
+            intervals.append(self.__flusheveryms)
+        if self.__fsyncpolicy is FsyncPolicyEnum.INTERVAL and self.__fsynceveryms:
+            intervals.append(self.__fsynceveryms)
+        return min(intervals) / 1000 if intervals else None
+
+    def __flushperiodically(self) -> None:
+        """
+            Flushes the buffer every `__flusheveryms` milliseconds so records do not
+            stay in memory when the application stops logging for a while, and
+            fsyncs records left unsynced for `__fsynceveryms` milliseconds.
+        """
+        interval = self.__periodicinterval()
+        while not self.__stopflushing.wait(interval):
+            try:
+                with self.__lock:
+                    logfile = self.__logfile
+                    if logfile is None:
+                        continue
+                    if self.__flusheveryms:
+                        self.__flush(time.monotonic())
+                    if self.__unsyncedrecords and self.__fsyncpolicy is FsyncPolicyEnum.INTERVAL and \
+                            (time.monotonic() - self.__lastsync) * 1000 >= self.__fsynceveryms:
+                        self.__sync(logfile)
+            except Exception as e:
+                print(f"[LogFileHandle] Failed to flush log: {e}")
@@ -0,0 +1,131 @@
+from typing import Protocol, Iterable, Callable, override
+from json.encoder import encode_basestring  # C accelerated string escaping
+
+from .logConstants import LogConstants
+from .logRecord import LogRecord, LOG_RECORD_SLOTS
+
+try:
+    import orjson
+except ImportError:  # optional fast json backend
+    orjson = None
+
+def recordslots(logsequence: Iterable[str]) -> tuple[str, ...]|None:
+    """
+        Returns the `LogRecord` slots holding the fields of `logsequence`, or None
+        if one of the fields has no slot and must be read through the mapping.
+    """
+    slots = tuple(LOG_RECORD_SLOTS.get(key, '') for key in logsequence)
+    return None if '' in slots else slots
+
+class LogFormatter(Protocol):
+    """
+        Interface responsible for turning a logger json into a line of text.
+
+        The file writers use a formatter to serialize every log record before it
+        is written, which decouples the on-disk format from the writing strategy.
+
+        A formatter that sets the class attribute `binary` to True returns bytes
+        instead of text, which the writers write as they are. It may also provide
+        `formatbatch(records) -> bytes`, which `AsyncFileWriterLog` uses to encode
+        every batch it drains at once.
+
+        Formatters producing the same output compare equal, so records routed to
+        several writers by `RoutingWriterLog` are only formatted once per format.
+    """
+    def format(self, loggerjson: dict[str, str]) -> str:
+        """
+            Serializes a log record into a single line of text.
+
+            Args:
+                loggerjson (dict[str, str]): Dictionary containing log metadata
+                    and the actual log message.
+
+            Returns:
+                str: Formatted log line, terminated by a newline.
+        """
+        ...
+
+class PipeLogFormatter(LogFormatter):
+    """
+        Formats a log record as its fields joined by ` || `, the historical format
+        of the file writers, e.g. `Service1 || module.func || <timestamp> || DEBUG || message`.
+
+        A `LogRecord` whose fields are all stored in slots is read slot by slot,
+        without going through its mapping interface.
+
+        Attributes:
+            __logsequence (tuple[str, ...]): Order in which the fields are written,
+                missing fields are skipped.
+            __slots (tuple[str, ...] | None): `LogRecord` slots of the fields, None
+                if a field has no slot.
+            __separator (str): Text placed between two fields.
+    """
+    def __init__(self, logsequence: Iterable[str] = LogConstants.LOG_SEQUENCE, separator: str = ' || ') -> None:
+        super().__init__()
+        self.__logsequence : tuple[str, ...] = tuple(logsequence)
+        self.__slots : tuple[str, ...]|None = recordslots(self.__logsequence)
+        self.__separator : str = separator
+
+    @override
+    def format(self, loggerjson: dict[str, str]) -> str:
+        if self.__slots is not None and type(loggerjson) is LogRecord:
+            parts = [value for slot in self.__slots if (value := getattr(loggerjson, slot)) is not None]
+        else:
+            parts = [loggerjson[key] for key in self.__logsequence if key in loggerjson]
+        return self.__separator.join(parts) + '\n'
+
+    def __eq__(self, other: object) -> bool:
+        return type(other) is PipeLogFormatter and (other.__logsequence, other.__separator) == (self.__logsequence, self.__separator)
+
+    def __hash__(self) -> int:
+        return hash((self.__logsequence, self.__separator))
+
+class JsonLinesLogFormatter(LogFormatter):
+    """
+        Formats a log record as one JSON object per line (JSON Lines).
+
+        Unlike the pipe format, messages containing separators or newlines stay
+        unambiguous. The serializer is built once from the field order: every
+        field gets a precomputed, already escaped `"key":` prefix, so formatting
+        a record only escapes the values using the C accelerated string encoder
+        of the standard `json` module instead of walking a generic encoder.
+
+        When `orjson` is installed and `useorjson` is True, it is used instead.
+
+        Attributes:
+            __fields (tuple[tuple[str, str], ...]): Field keys with their escaped
+                JSON key prefix, in output order. Missing fields are skipped.
+            __slotfields (tuple[tuple[str, str], ...] | None): The same fields keyed
+                by `LogRecord` slot, None if a field has no slot.
+            __formatrecord (Callable): Serializer chosen at construction time.
+    """
+    def __init__(self, logsequence: Iterable[str] = LogConstants.LOG_SEQUENCE, useorjson: bool = True) -> None:
+        super().__init__()
+        self.__fields : tuple[tuple[str, str], ...] = tuple((key, encode_basestring(key) + ':') for key in logsequence)
+        slots = recordslots(key for key, _ in self.__fields)
+        self.__slotfields : tuple[tuple[str, str], ...]|None = None if slots is None else tuple(
+            (slot, prefix) for slot, (_, prefix) in zip(slots, self.__fields))
+        self.__formatrecord : Callable[[dict[str, str]], str] = self.__formatwithorjson if useorjson and orjson is not None else self.__formatwithtemplate
+
+    @override
+    def format(self, loggerjson: dict[str, str]) -> str:
+        return self.__formatrecord(loggerjson)
+
+    def __eq__(self, other: object) -> bool:
+        return type(other) is JsonLinesLogFormatter and other.__fields == self.__fields and \
+            other.__formatrecord.__name__ == self.__formatrecord.__name__
+
+    def __hash__(self) -> int:
+        return hash(self.__fields)
+
+    def __formatwithtemplate(self, loggerjson: dict[str, str]) -> str:
+        if self.__slotfields is not None and type(loggerjson) is LogRecord:
+            parts = [prefix + encode_basestring(value) for slot, prefix in self.__slotfields
+                     if (value := getattr(loggerjson, slot)) is not None]
+        else:
+            parts = [prefix + encode_basestring(loggerjson[key]) for key, prefix in self.__fields if key in loggerjson]
+        return '{' + ','.join(parts) + '}\n'
+
+    def __formatwithorjson(self, loggerjson: dict[str, str]) -> str:
+        record = {key: loggerjson[key] for key, _ in self.__fields if key in loggerjson}
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE).decode()  # type: ignore[union-attr]
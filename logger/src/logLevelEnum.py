@@ -1,22 +1,52 @@
-from enum import Enum
-
-# logger enum
-class LoglevelEnum(Enum):
-    """
-        Defines constants representing the severity levels of logs.
-
-        These levels are used to classify log messages based on their importance
-        and urgency.
-
-        Attributes:
-            DEBUG: Detailed information for diagnosing issues.
-            INFO: General information about application flow.
-            WARNING: Indication of a potential issue.
-            ERROR: Error events that may allow the application to continue running.
-            CRITICAL: Severe errors indicating the application may be unable to continue.
-    """
-    DEBUG = 'DEBUG'
-    INFO = 'INFO'
-    ERROR = 'ERROR'
-    WARNING = 'WARNING'
-    CRITICAL = 'CRITICAL'
\ No newline at end of file
+from typing import Final
+from enum import Enum
+
+# severity of every level, higher is more severe
+LOGLEVEL_SEVERITY : Final = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40, 'CRITICAL': 50}
+
+# logger enum
+class LoglevelEnum(Enum):
+    """
+        Defines constants representing the severity levels of logs.
+
+        These levels are used to classify log messages based on their importance
+        and urgency.
+
+        Attributes:
+            DEBUG: Detailed information for diagnosing issues.
+            INFO: General information about application flow.
+            WARNING: Indication of a potential issue.
+            ERROR: Error events that may allow the application to continue running.
+            CRITICAL: Severe errors indicating the application may be unable to continue.
+
+        Every level carries a numeric `severity` (DEBUG=10 ... CRITICAL=50) and
+        levels are ordered by it, e.g. `LoglevelEnum.DEBUG < LoglevelEnum.ERROR`.
+    """
+    DEBUG = 'DEBUG'
+    INFO = 'INFO'
+    ERROR = 'ERROR'
+    WARNING = 'WARNING'
+    CRITICAL = 'CRITICAL'
+
+    def __init__(self, value: str) -> None:
+        self.severity : int = LOGLEVEL_SEVERITY[value]
+
+    def __lt__(self, other: "LoglevelEnum") -> bool:
+        if not isinstance(other, LoglevelEnum):
+            return NotImplemented
+        return self.severity < other.severity
+
+    def __le__(self, other: "LoglevelEnum") -> bool:
+        if not isinstance(other, LoglevelEnum):
+            return NotImplemented
+        return self.severity <= other.severity
+
+    def __gt__(self, other: "LoglevelEnum") -> bool:
+        if not isinstance(other, LoglevelEnum):
+            return NotImplemented
+        return self.severity > other.severity
+
+    def __ge__(self, other: "LoglevelEnum") -> bool:
+        if not isinstance(other, LoglevelEnum):
+            return NotImplemented
+        return self.severity >= other.severity
@@ -0,0 +1,83 @@
+from typing import Callable, Any
+import threading
+import weakref
+import atexit
+import os
+
+class LogLifecycleHooks:
+    """
+        Runs methods of live writers when the interpreter exits and in forked
+        child processes, without keeping the writers alive.
+
+        `atexit.register` and `os.register_at_fork` keep every callback forever,
+        fork hooks can not even be removed, so handing them bound methods keeps
+        every writer ever created, and its file, alive. Writers register their
+        methods here instead. One hook of each kind is installed for the process
+        and calls the methods of the writers still alive; writers that were
+        garbage collected drop out on their own, and the methods themselves skip
+        writers that were closed.
+
+        Exit methods run newest first, like `atexit`, so a router created after
+        its writers is closed before them. Fork methods run oldest first, like
+        `os.register_at_fork`.
+
+        Attributes:
+            __atexit (weakref.WeakKeyDictionary[Any, list[Callable]]): Methods to
+                call at exit, by the writer they are called on.
+            __afterfork (weakref.WeakKeyDictionary[Any, list[Callable]]): Methods to
+                call in a forked child, by the writer they are called on.
+            __lock (threading.Lock): Guards registration and installing the hooks.
+            __installed (bool): True once the process-wide hooks are installed.
+    """
+    __atexit : weakref.WeakKeyDictionary[Any, list[Callable[[Any], object]]] = weakref.WeakKeyDictionary()
+    __afterfork : weakref.WeakKeyDictionary[Any, list[Callable[[Any], object]]] = weakref.WeakKeyDictionary()
+    __lock = threading.Lock()
+    __installed : bool = False
+
+    @classmethod
+    def registeratexit(cls, method: Callable[[], object]) -> None:
+        """
+            Calls the bound `method` when the interpreter exits, unless its instance
+            was garbage collected by then.
+        """
+        cls.__register(cls.__atexit, method)
+
+    @classmethod
+    def registerafterfork(cls, method: Callable[[], object]) -> None:
+        """
+            Calls the bound `method` in every forked child process, unless its
+            instance was garbage collected before the fork.
+        """
+        cls.__register(cls.__afterfork, method)
+
+    @classmethod
+    def __register(cls, hooks: weakref.WeakKeyDictionary, method: Callable[[], object]) -> None:
+        with cls.__lock:
+            if not cls.__installed:
+                cls.__installed = True
+                atexit.register(cls.__runatexit)
+                if hasattr(os, "register_at_fork"):
+                    os.register_at_fork(after_in_child=cls.__runafterfork)
+            # the unbound function does not keep the instance alive, the bound method would
+            hooks.setdefault(method.__self__, []).append(method.__func__) # type: ignore[attr-defined]
+
+    @classmethod
+    def __runatexit(cls) -> None:
+        with cls.__lock:
+            entries = [(instance, methods[::-1]) for instance, methods in cls.__atexit.items()]
+        cls.__run(entries[::-1])
+
+    @classmethod
+    def __runafterfork(cls) -> None:
+        # another thread may have held the lock at the time of the fork
+        cls.__lock = threading.Lock()
+        cls.__run([(instance, list(methods)) for instance, methods in cls.__afterfork.items()])
+
+    @classmethod
+    def __run(cls, entries: list[tuple[Any, list[Callable[[Any], object]]]]) -> None:
+        for instance, methods in entries:
+            for method in methods:
+                try:
+                    method(instance)
+                except Exception as e:
+                    print(f"[LogLifecycleHooks] Failed to run hook: {e}")
@@ -0,0 +1,67 @@
+from typing import Any, Callable
+
+from .logConstants import LogConstants
+
+class LazyLogMessage:
+    """
+        Log message whose text is only built when the log is actually written.
+
+        `Logger.log` wraps a format template with its arguments, or a zero-argument
+        callable, into a `LazyLogMessage` once every enable and level check has
+        passed. Suppressed logs therefore never pay for string formatting. Writers
+        that set `defersmessageformatting` (e.g. `AsyncFileWriterLog`) receive the
+        message unrendered and call `render` on their background thread, other
+        writers receive the rendered string.
+
+        Rendering never raises: a template that does not match its arguments, or a
+        callable that fails, is written with a description of the error instead, so
+        a broken log call can not crash the writer thread.
+
+        Attributes:
+            __message (str | Callable[[], Any]): Template formatted with
+                `str.format`, or callable returning the message.
+            __args (tuple): Positional arguments for the template.
+            __kwargs (dict[str, Any]): Keyword arguments for the template.
+    """
+    __slots__ = ('__message', '__args', '__kwargs')
+
+    def __init__(self, message: str|Callable[[], Any], args: tuple = (), kwargs: dict[str, Any]|None = None) -> None:
+        self.__message : str|Callable[[], Any] = message
+        self.__args : tuple = args
+        self.__kwargs : dict[str, Any] = kwargs or {}
+
+    def render(self) -> str:
+        """
+            Builds the message text.
+
+            Returns:
+                str: The formatted message.
+        """
+        message = self.__message
+        try:
+            if callable(message):
+                return str(message())
+            return message.format(*self.__args, **self.__kwargs)
+        except Exception as e:
+            return f"{message!s} [failed to format log message: {e!r}]"
+
+    def __str__(self) -> str:
+        return self.render()
+
+    def __repr__(self) -> str:
+        return f"LazyLogMessage({self.__message!r}, {self.__args!r}, {self.__kwargs!r})"
+
+def renderlogmessage(loggerjson: dict) -> dict[str, str]:
+    """
+        Replaces a `LazyLogMessage` in a logger json by its rendered text.
+
+        Args:
+            loggerjson (dict): Logger json that may hold an unrendered message.
+
+        Returns:
+            dict[str, str]: The same logger json, holding only strings.
+    """
+    message = loggerjson.get(LogConstants.LOG_MESSAGE)
+    if type(message) is LazyLogMessage:
+        loggerjson[LogConstants.LOG_MESSAGE] = message.render()
+    return loggerjson
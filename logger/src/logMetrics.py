@@ -0,0 +1,331 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+import threading
+import bisect
+import os
+
+# upper bounds of the histogram buckets, the last bucket (+Inf) is implicit
+BATCH_SIZE_BUCKETS : tuple[float, ...] = (1, 8, 64, 512, 4096, 32768)
+WRITE_LATENCY_BUCKETS : tuple[float, ...] = (0.00001, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+PROMETHEUS_CONTENT_TYPE : str = "text/plain; version=0.0.4; charset=utf-8"
+
+class LogThreadCounters:
+    """
+        Counters of one sink updated by a single thread, see `LogSinkMetrics`.
+
+        Attributes:
+            accepted (int): Records handed to the sink.
+            filtered (int): Records discarded by a level, enable or sampling check.
+            dropped (int): Records dropped because a queue was full.
+            written (int): Records written.
+            failed (int): Records whose write failed.
+            batchbuckets (list[int]): Number of writes per `BATCH_SIZE_BUCKETS` bucket.
+            batchrecords (int): Records over all writes.
+            latencybuckets (list[int]): Number of writes per `WRITE_LATENCY_BUCKETS` bucket.
+            latencyseconds (float): Time spent in all writes.
+    """
+    __slots__ = ('accepted', 'filtered', 'dropped', 'written', 'failed',
+                 'batchbuckets', 'batchrecords', 'latencybuckets', 'latencyseconds')
+
+    def __init__(self) -> None:
+        self.accepted : int = 0
+        self.filtered : int = 0
+        self.dropped : int = 0
+        self.written : int = 0
+        self.failed : int = 0
+        self.batchbuckets : list[int] = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+        self.batchrecords : int = 0
+        self.latencybuckets : list[int] = [0] * (len(WRITE_LATENCY_BUCKETS) + 1)
+        self.latencyseconds : float = 0.0
+
+    def addto(self, total: 'LogThreadCounters') -> None:
+        """
+            Adds these counters to `total`.
+        """
+        total.accepted += self.accepted
+        total.filtered += self.filtered
+        total.dropped += self.dropped
+        total.written += self.written
+        total.failed += self.failed
+        total.batchrecords += self.batchrecords
+        total.latencyseconds += self.latencyseconds
+        for index, count in enumerate(self.batchbuckets):
+            total.batchbuckets[index] += count
+        for index, count in enumerate(self.latencybuckets):
+            total.latencybuckets[index] += count
+
+class LogSinkMetrics:
+    """
+        Metrics of one sink of the logging pipeline, e.g. a writer or a route.
+
+        Every thread updates its own `LogThreadCounters`, found through a
+        thread-local, so instrumenting a hot path never takes a lock or makes
+        threads contend for a cache line. The counters of all threads are added
+        up when the metrics are read; the counters of finished threads are folded
+        into one total at that point.
+
+        The queue depth is read from the callable given to `setqueuedepth`. The
+        high-water mark and the drain lag (age of the oldest record of a batch
+        when the batch is drained) are reported by the thread draining the queue.
+
+        Attributes:
+            name (str): Name of the sink, the `sink` label of the exported metrics.
+            __local (threading.local): Counters of the current thread.
+            __threads (list[tuple[threading.Thread, LogThreadCounters]]): Counters
+                of every thread that updated them, with their thread.
+            __retired (LogThreadCounters): Counters of finished threads.
+            __lock (threading.Lock): Guards `__threads`, only taken when a thread
+                updates the metrics for the first time and when they are read.
+            __queuedepth (Callable[[], int] | None): Returns the current queue depth.
+            __highwatermark (int): Largest queue depth seen.
+            __drainlag (float): Drain lag of the last batch, in seconds.
+            __maxdrainlag (float): Largest drain lag seen, in seconds.
+    """
+    def __init__(self, name: str) -> None:
+        self.name : str = name
+        self.__local = threading.local()
+        self.__threads : list[tuple[threading.Thread, LogThreadCounters]] = []
+        self.__retired : LogThreadCounters = LogThreadCounters()
+        self.__lock = threading.Lock()
+        self.__queuedepth : Callable[[], int]|None = None
+        self.__highwatermark : int = 0
+        self.__drainlag : float = 0.0
+        self.__maxdrainlag : float = 0.0
+
+    def counters(self) -> LogThreadCounters:
+        """
+            Returns the counters of the current thread, to be updated directly.
+        """
+        try:
+            return self.__local.counters
+        except AttributeError:
+            counters = self.__local.counters = LogThreadCounters()
+            with self.__lock:
+                self.__threads.append((threading.current_thread(), counters))
+            return counters
+
+    def addaccepted(self, records: int = 1) -> None:
+        """
+            Counts records handed to the sink.
+        """
+        self.counters().accepted += records
+
+    def addfiltered(self, records: int = 1) -> None:
+        """
+            Counts records discarded by a level, enable or sampling check.
+        """
+        self.counters().filtered += records
+
+    def adddropped(self, records: int = 1) -> None:
+        """
+            Counts records dropped because a queue was full.
+        """
+        self.counters().dropped += records
+
+    def observewrite(self, records: int, seconds: float, failed: bool = False) -> None:
+        """
+            Records one write of `records` records that took `seconds`.
+        """
+        counters = self.counters()
+        if failed:
+            counters.failed += records
+        else:
+            counters.written += records
+        counters.batchbuckets[bisect.bisect_left(BATCH_SIZE_BUCKETS, records)] += 1
+        counters.batchrecords += records
+        counters.latencybuckets[bisect.bisect_left(WRITE_LATENCY_BUCKETS, seconds)] += 1
+        counters.latencyseconds += seconds
+
+    def setqueuedepth(self, queuedepth: Callable[[], int]) -> None:
+        """
+            Sets the callable returning the current queue depth of the sink.
+        """
+        self.__queuedepth = queuedepth
+
+    def observequeue(self, depth: int) -> None:
+        """
+            Reports the queue depth seen by the draining thread.
+        """
+        if depth > self.__highwatermark:
+            self.__highwatermark = depth
+
+    def observedrainlag(self, seconds: float) -> None:
+        """
+            Reports the age of the oldest record of the batch being drained.
+        """
+        self.__drainlag = seconds
+        if seconds > self.__maxdrainlag:
+            self.__maxdrainlag = seconds
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+            Adds up the counters of every thread.
+
+            Returns:
+                dict[str, Any]: Counters, gauges and histograms of the sink. The
+                    histogram buckets are cumulative, as in Prometheus.
+        """
+        total = LogThreadCounters()
+        with self.__lock:
+            alive = []
+            for thread, counters in self.__threads:
+                if thread.is_alive():
+                    alive.append((thread, counters))
+                else:
+                    counters.addto(self.__retired)
+            self.__threads = alive
+            self.__retired.addto(total)
+            for _, counters in alive:
+                counters.addto(total)
+
+        queuedepth = self.__queuedepth
+        return {
+            "accepted": total.accepted,
+            "filtered": total.filtered,
+            "dropped": total.dropped,
+            "written": total.written,
+            "failed": total.failed,
+            "queuedepth": queuedepth() if queuedepth is not None else 0,
+            "queuehighwatermark": self.__highwatermark,
+            "drainlagseconds": self.__drainlag,
+            "maxdrainlagseconds": self.__maxdrainlag,
+            "batchsize": histogram(BATCH_SIZE_BUCKETS, total.batchbuckets, total.batchrecords),
+            "writelatencyseconds": histogram(WRITE_LATENCY_BUCKETS, total.latencybuckets, total.latencyseconds),
+        }
+
+def histogram(bounds: tuple[float, ...], counts: list[int], total: float) -> dict[str, Any]:
+    """
+        Returns a histogram with cumulative buckets keyed by their upper bound.
+    """
+    buckets : dict[str, int] = {}
+    cumulative = 0
+    for bound, count in zip((*bounds, float("inf")), counts):
+        cumulative += count
+        buckets["+Inf" if bound == float("inf") else f"{bound:g}"] = cumulative
+    return {"buckets": buckets, "count": cumulative, "sum": total}
+
+class LogMetricsRegistry:
+    """
+        Collects the metrics of every sink and exports them.
+
+        Pass `registry.sink(name)` as `metrics` to a writer, a `LogRoute` or the
+        `Logger`. Read the metrics with `snapshot`, render them in the Prometheus
+        text format with `toprometheus`, write them to a file for the node
+        exporter textfile collector with `writeprometheus`, or serve them over
+        HTTP with `serveprometheus`.
+
+        Attributes:
+            __sinks (dict[str, LogSinkMetrics]): Metrics of every sink by name.
+            __lock (threading.Lock): Guards `__sinks`.
+    """
+    def __init__(self) -> None:
+        self.__sinks : dict[str, LogSinkMetrics] = {}
+        self.__lock = threading.Lock()
+
+    def sink(self, name: str) -> LogSinkMetrics:
+        """
+            Returns the metrics of the sink `name`, creating them on first use.
+        """
+        with self.__lock:
+            metrics = self.__sinks.get(name)
+            if metrics is None:
+                metrics = self.__sinks[name] = LogSinkMetrics(name)
+            return metrics
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+            Returns the snapshot of every sink by name, see `LogSinkMetrics.snapshot`.
+        """
+        with self.__lock:
+            sinks = list(self.__sinks.values())
+        return {metrics.name: metrics.snapshot() for metrics in sinks}
+
+    def toprometheus(self) -> str:
+        """
+            Renders the metrics of every sink in the Prometheus text exposition format.
+        """
+        snapshot = self.snapshot()
+        lines : list[str] = []
+
+        def family(name: str, kind: str, helptext: str) -> None:
+            lines.append(f"# HELP {name} {helptext}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        for key, kind, helptext in (
+                ("accepted", "counter", "Log records handed to the sink."),
+                ("filtered", "counter", "Log records discarded by a level, enable or sampling check."),
+                ("dropped", "counter", "Log records dropped because a queue was full."),
+                ("written", "counter", "Log records written."),
+                ("failed", "counter", "Log records whose write failed.")):
+            name = f"logger_records_{key}_total"
+            family(name, kind, helptext)
+            for sink, metrics in snapshot.items():
+                lines.append(f'{name}{{sink="{escapelabel(sink)}"}} {metrics[key]}')
+
+        for key, name, helptext in (
+                ("queuedepth", "logger_queue_depth", "Log records currently queued."),
+                ("queuehighwatermark", "logger_queue_high_water_mark", "Largest number of log records queued."),
+                ("drainlagseconds", "logger_drain_lag_seconds", "Age of the oldest record of the last drained batch."),
+                ("maxdrainlagseconds", "logger_drain_lag_max_seconds", "Largest age of the oldest record of a drained batch.")):
+            family(name, "gauge", helptext)
+            for sink, metrics in snapshot.items():
+                lines.append(f'{name}{{sink="{escapelabel(sink)}"}} {metrics[key]}')
+
+        for key, name, helptext in (
+                ("batchsize", "logger_batch_records", "Log records per write."),
+                ("writelatencyseconds", "logger_write_latency_seconds", "Duration of a write.")):
+            family(name, "histogram", helptext)
+            for sink, metrics in snapshot.items():
+                label = escapelabel(sink)
+                for bound, count in metrics[key]["buckets"].items():
+                    lines.append(f'{name}_bucket{{sink="{label}",le="{bound}"}} {count}')
+                lines.append(f'{name}_sum{{sink="{label}"}} {metrics[key]["sum"]}')
+                lines.append(f'{name}_count{{sink="{label}"}} {metrics[key]["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def writeprometheus(self, path: str) -> None:
+        """
+            Writes the Prometheus text format to `path`. The file is replaced
+            atomically, so a collector never reads it half written.
+        """
+        temporarypath = f"{path}.{os.getpid()}.tmp"
+        with open(temporarypath, "w", encoding="utf-8") as f:
+            f.write(self.toprometheus())
+        os.replace(temporarypath, path)
+
+    def serveprometheus(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+            Serves the Prometheus text format over HTTP from a daemon thread.
+
+            Args:
+                port (int): Port to listen on, 0 picks a free one.
+                host (str): Address to listen on, only the local host by default.
+
+            Returns:
+                ThreadingHTTPServer: The server, call `shutdown()` to stop it.
+        """
+        registry = self
+
+        class PrometheusHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                body = registry.toprometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass  # scrapes must not be logged to stderr
+
+        server = ThreadingHTTPServer((host, port), PrometheusHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+def escapelabel(value: str) -> str:
+    """
+        Escapes a Prometheus label value.
+    """
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
@@ -0,0 +1,125 @@
+from collections.abc import MutableMapping, Iterator
+from typing import Any
+
+from .logConstants import LogConstants
+
+# logger json key of every field stored in its own slot, in LOG_SEQUENCE order
+LOG_RECORD_SLOTS : dict[str, str] = {
+    LogConstants.LOG_SERVICE_NAME: 'servicename',
+    LogConstants.LOG_FUNCTION_NAME: 'functionname',
+    LogConstants.LOG_TIMESTAMP: 'timestamp',
+    LogConstants.LOG_LEVEL: 'level',
+    LogConstants.LOG_MESSAGE: 'message',
+}
+
+class LogRecord(MutableMapping):
+    """
+        Compact log record used by the logging pipeline instead of a `dict`.
+
+        The fields defined in `LogConstants` are stored in slots, so a record
+        needs a fraction of the memory of the equivalent dictionary, which
+        matters when thousands of records wait in the queue of
+        `AsyncFileWriterLog`. A field that was never set holds None.
+
+        The record is also a mutable mapping keyed by the `LogConstants` names,
+        so decorators and writers written against the logger json keep working,
+        e.g. `record[LogConstants.LOG_TIMESTAMP] = ...`. Keys that have no slot,
+        added by custom decorators, are kept in a small dictionary created on
+        first use. `todict` returns the plain logger json and `copy` a copy of
+        the record.
+
+        Attributes:
+            message (Any): The log message, a `str` or an unrendered `LazyLogMessage`.
+            level (str | None): Value of the `LoglevelEnum` of the log.
+            functionname (str | None): Id of the decorated function that logged.
+            servicename (str | None): Name of the service, set by `LoggerWithServiceName`.
+            timestamp (str | None): Formatted timestamp, set by `LoggerWithTimeStamp`.
+            timestampns (int): `time.time_ns()` when the record was created, 0 if
+                unknown. It is not part of the mapping.
+            extra (dict[str, Any] | None): Fields without a slot.
+    """
+    __slots__ = ('message', 'level', 'functionname', 'servicename', 'timestamp', 'timestampns', 'extra')
+
+    def __init__(self, message: Any = None, level: str|None = None, functionname: str|None = None,
+                 timestampns: int = 0) -> None:
+        self.message : Any = message
+        self.level : str|None = level
+        self.functionname : str|None = functionname
+        self.servicename : str|None = None
+        self.timestamp : str|None = None
+        self.timestampns : int = timestampns
+        self.extra : dict[str, Any]|None = None
+
+    def __getitem__(self, key: str) -> Any:
+        slot = LOG_RECORD_SLOTS.get(key)
+        if slot is not None:
+            value = getattr(self, slot)
+            if value is not None:
+                return value
+        elif self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        slot = LOG_RECORD_SLOTS.get(key)
+        if slot is not None:
+            setattr(self, slot, value)
+        elif self.extra is None:
+            self.extra = {key: value}
+        else:
+            self.extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        slot = LOG_RECORD_SLOTS.get(key)
+        if slot is not None:
+            if getattr(self, slot) is None:
+                raise KeyError(key)
+            setattr(self, slot, None)
+        elif self.extra is not None and key in self.extra:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        slot = LOG_RECORD_SLOTS.get(key) # type: ignore[call-overload]
+        if slot is not None:
+            return getattr(self, slot) is not None
+        return self.extra is not None and key in self.extra
+
+    def __iter__(self) -> Iterator[str]:
+        for key, slot in LOG_RECORD_SLOTS.items():
+            if getattr(self, slot) is not None:
+                yield key
+        if self.extra is not None:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        count = sum(1 for slot in LOG_RECORD_SLOTS.values() if getattr(self, slot) is not None)
+        return count + (len(self.extra) if self.extra is not None else 0)
+
+    def __ior__(self, other: Any) -> 'LogRecord':
+        self.update(other)
+        return self
+
+    def __repr__(self) -> str:
+        return f"LogRecord({self.todict()!r})"
+
+    def copy(self) -> 'LogRecord':
+        """
+            Returns a shallow copy of the record, `timestampns` included.
+        """
+        record = LogRecord(self.message, self.level, self.functionname, self.timestampns)
+        record.servicename = self.servicename
+        record.timestamp = self.timestamp
+        if self.extra is not None:
+            record.extra = dict(self.extra)
+        return record
+
+    def todict(self) -> dict[str, Any]:
+        """
+            Returns the record as a plain logger json dictionary.
+        """
+        loggerjson = {key: value for key, slot in LOG_RECORD_SLOTS.items() if (value := getattr(self, slot)) is not None}
+        if self.extra is not None:
+            loggerjson.update(self.extra)
+        return loggerjson
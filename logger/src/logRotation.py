@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta
+import threading
+import shutil
+import queue
+import time
+import gzip
+import os
+
+class LogRotationPolicy:
+    """
+        Describes when a log file is rolled over and how many rotated files are kept.
+
+        Rotated files are renamed to `<logfilepath>.<YYYYmmdd-HHMMSS-ffffff>` so that
+        a new rollover never has to rename older backups, and optionally gzipped
+        to `<backup>.gz` by a background thread.
+
+        Attributes:
+            maxbytes (int): Roll over once writing a record would grow the file
+                beyond this many bytes. 0 disables size based rotation.
+            rotateeveryseconds (float): Roll over on wall-clock boundaries of this
+                many seconds (e.g. 3600 rolls over at the start of every hour).
+                0 disables time based rotation.
+            backupcount (int): Number of rotated files kept, older ones are
+                removed. 0 keeps every rotated file.
+            compress (bool): Gzip rotated files in a background thread.
+    """
+    def __init__(self, maxbytes: int = 0, rotateeveryseconds: float = 0,
+                 backupcount: int = 5, compress: bool = False) -> None:
+        self.maxbytes : int = maxbytes
+        self.rotateeveryseconds : float = rotateeveryseconds
+        self.backupcount : int = backupcount
+        self.compress : bool = compress
+
+class LogRotator:
+    """
+        Tracks the size of a log file and performs the rollover described by a
+        `LogRotationPolicy`.
+
+        The rollover check is O(1): the rotator keeps a byte counter that the
+        file handle increments on every write instead of calling `stat()`, and
+        compares the wall clock against a precomputed rollover time.
+
+        Renaming the active file is the only work done on the writing thread.
+        Compressing and removing old backups happens on a background daemon
+        thread, so it never blocks the hot write path.
+
+        Attributes:
+            byteswritten (int): Current size of the active log file in bytes.
+            __logfilepath (str): Path of the active log file.
+            __policy (LogRotationPolicy): Rotation configuration.
+            __nextrollover (float): Epoch time of the next time based rollover.
+            __maintenancequeue (queue.Queue): Rotated files waiting for compression
+                and backup cleanup.
+            __maintenance_thread (threading.Thread | None): Daemon thread doing the
+                compression and cleanup, started on the first rollover.
+    """
+    BACKUP_SUFFIX_FORMAT : str = "%Y%m%d-%H%M%S-%f"
+
+    def __init__(self, logfilepath: str, policy: LogRotationPolicy) -> None:
+        self.__logfilepath : str = logfilepath
+        self.__policy : LogRotationPolicy = policy
+        self.byteswritten : int = 0
+        self.__nextrollover : float = float("inf")
+        self.__maintenancequeue : queue.Queue[str] = queue.Queue()
+        self.__maintenance_thread : threading.Thread|None = None
+        self.__lastbackuptime : datetime|None = None
+        self.reset(self.__currentsize())
+
+    def reset(self, currentsize: int) -> None:
+        """
+            Restarts tracking for a freshly opened log file of `currentsize` bytes.
+        """
+        self.byteswritten = currentsize
+        interval = self.__policy.rotateeveryseconds
+        if interval > 0:
+            self.__nextrollover = (time.time() // interval + 1) * interval
+
+    def shouldrollover(self, nbytes: int) -> bool:
+        """
+            Returns True if the active file must be rolled over before writing `nbytes`.
+        """
+        if self.byteswritten == 0:
+            # an empty file is not rolled over, but it starts the current interval
+            if time.time() >= self.__nextrollover:
+                self.reset(0)
+            return False
+        maxbytes = self.__policy.maxbytes
+        if maxbytes > 0 and self.byteswritten + nbytes > maxbytes:
+            return True
+        return time.time() >= self.__nextrollover
+
+    def rollover(self) -> None:
+        """
+            Renames the active file to a timestamped backup and schedules compression
+            and cleanup of old backups. The caller must have closed the active file.
+        """
+        # keep backup names unique and ordered even for rollovers within the same microsecond
+        backuptime = datetime.now()
+        if self.__lastbackuptime is not None and backuptime <= self.__lastbackuptime:
+            backuptime = self.__lastbackuptime + timedelta(microseconds=1)
+        self.__lastbackuptime = backuptime
+
+        backuppath = f"{self.__logfilepath}.{backuptime.strftime(self.BACKUP_SUFFIX_FORMAT)}"
+        try:
+            os.replace(self.__logfilepath, backuppath)
+        except FileNotFoundError:
+            pass
+        else:
+            self.__schedulemaintenance(backuppath)
+        self.reset(0)
+
+    def waitformaintenance(self) -> None:
+        """
+            Blocks until all scheduled compression and cleanup has finished.
+        """
+        self.__maintenancequeue.join()
+
+    def __currentsize(self) -> int:
+        try:
+            return os.path.getsize(self.__logfilepath)
+        except OSError:
+            return 0
+
+    def __schedulemaintenance(self, backuppath: str) -> None:
+        if not self.__policy.compress and self.__policy.backupcount <= 0:
+            return
+        self.__maintenancequeue.put(backuppath)
+        if self.__maintenance_thread is None:
+            self.__maintenance_thread = threading.Thread(target=self.__maintain, daemon=True)
+            self.__maintenance_thread.start()
+
+    def __maintain(self) -> None:
+        """
+            Compresses rotated files and removes the backups exceeding `backupcount`.
+        """
+        while True:
+            backuppath = self.__maintenancequeue.get()
+            try:
+                if self.__policy.compress:
+                    self.__compress(backuppath)
+                if self.__policy.backupcount > 0:
+                    self.__removeoldbackups()
+            except Exception as e:
+                print(f"[LogRotator] Failed to maintain rotated log {backuppath}: {e}")
+            finally:
+                self.__maintenancequeue.task_done()
+
+    def __compress(self, backuppath: str) -> None:
+        compressedpath = backuppath + ".gz"
+        temporarypath = compressedpath + ".tmp"
+        with open(backuppath, "rb") as source, gzip.open(temporarypath, "wb") as target:
+            shutil.copyfileobj(source, target)
+        os.replace(temporarypath, compressedpath)
+        os.remove(backuppath)
+
+    def __removeoldbackups(self) -> None:
+        directory = os.path.dirname(self.__logfilepath) or "."
+        prefix = os.path.basename(self.__logfilepath) + "."
+        backups = sorted(name for name in os.listdir(directory)
+                         if name.startswith(prefix) and name[len(prefix):len(prefix) + 1].isdigit()
+                         and not name.endswith(".tmp"))
+        for name in backups[:-self.__policy.backupcount]:
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
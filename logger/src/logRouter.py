@@ -0,0 +1,429 @@
+from typing import Any, override
+from collections import deque
+import threading
+import time
+
+from .logConstants import LogConstants
+from .logLevelEnum import LoglevelEnum, LOGLEVEL_SEVERITY
+from .logMessage import LazyLogMessage, renderlogmessage
+from .logRecord import LogRecord
+from .logDurability import LogAck
+from .logMetrics import LogSinkMetrics
+from .logLifecycle import LogLifecycleHooks
+from .writeLogMessage import WriteLogMessage
+
+class RoutedLogRecord:
+    """
+        Log record shared by every route it was dispatched to.
+
+        Attributes:
+            record (dict[str, str]): The log record.
+            encoded (list[str | bytes | None]): The record formatted once per distinct
+                formatter of the router, filled by the first route that needs it.
+    """
+    __slots__ = ('record', 'encoded')
+
+    def __init__(self, record: dict[str, str], encoders: int) -> None:
+        self.record : dict[str, str] = record
+        self.encoded : list[str|bytes|None] = [None] * encoders
+
+class LogRoute:
+    """
+        One sink of a `RoutingWriterLog`: a writer, the minimum level of the
+        records it receives, and its own queue drained by its own worker thread.
+
+        Records are appended to the queue without a lock and the worker is woken
+        once `wakeupthreshold` records are waiting, otherwise it drains the queue
+        every `maxlatencyms` milliseconds. Setting `maxqueuesize` bounds the queue;
+        when it is full new records are dropped and counted in `droppedcount`, so
+        a slow sink never blocks the caller or the other routes.
+
+        The worker renders deferred messages and hands the records to the writer.
+        A writer exposing `formatter` and `writeformatted`, like `FileWriterLog`,
+        is given the drained records formatted and joined into a single write,
+        and routes whose formatters compare equal share the formatted text. Any
+        other writer receives the records one by one through `writelog`.
+
+        Passing a `LogSinkMetrics` as `metrics` counts the records the route
+        accepted, filtered by level, dropped, handed to the writer and failed to
+        hand over, its queue depth and high-water mark, the batch sizes, the
+        write latency and the drain lag, see `LogMetricsRegistry`.
+
+        Attributes:
+            __writer (WriteLogMessage): Writer the records are handed to.
+            __minseverity (int): Severity below which records are not routed here.
+            __maxqueuesize (int): Maximum number of queued records, 0 means unbounded.
+            __wakeupthreshold (int): Number of queued records waking the worker.
+            __maxlatency (float): Seconds the worker sleeps before draining records
+                that did not reach the threshold.
+            __droppedcount (int): Number of records dropped because the queue was full.
+            __metrics (LogSinkMetrics | None): Metrics of the route, if any.
+            __encoderindex (int | None): Slot of the formatted record in
+                `RoutedLogRecord.encoded`, None if the writer formats records itself.
+            __renderlock (threading.Lock): Lock of the router, shared by all of its
+                routes, so a deferred message is rendered only once.
+            __logdeque (deque): Queued records and flush markers.
+            __stop (bool): Tells the worker to drain the queue one last time and stop.
+            __drainlock (threading.Lock): Held by the thread draining the queue.
+            __wakeup (threading.Event): Wakes the worker before its deadline.
+            __worker (threading.Thread | None): Thread draining the queue, None until
+                the route is added to a router.
+    """
+    def __init__(self, writer: WriteLogMessage, minloglevel: LoglevelEnum|None = None, maxqueuesize: int = 0,
+                 wakeupthreshold: int = 64, maxlatencyms: float = 20, metrics: LogSinkMetrics|None = None) -> None:
+        self.__writer : WriteLogMessage = writer
+        self.__minseverity : int = minloglevel.severity if minloglevel is not None else 0
+        self.__maxqueuesize : int = maxqueuesize
+        self.__wakeupthreshold : int = max(1, wakeupthreshold)
+        self.__maxlatency : float = maxlatencyms / 1000
+        self.__droppedcount : int = 0
+        self.__droplock = threading.Lock()
+        self.__encoderindex : int|None = None
+        self.__renderlock = threading.Lock()
+        self.__logdeque : deque = deque()
+        self.__metrics : LogSinkMetrics|None = metrics
+        if metrics is not None:
+            metrics.setqueuedepth(lambda: len(self.__logdeque))
+        self.__stop : bool = False
+        self.__worker : threading.Thread|None = None
+
+    @property
+    def writer(self) -> WriteLogMessage:
+        """
+            Writer the records of this route are handed to.
+        """
+        return self.__writer
+
+    @property
+    def minseverity(self) -> int:
+        """
+            Severity below which records are not routed to this route.
+        """
+        return self.__minseverity
+
+    @property
+    def droppedcount(self) -> int:
+        """
+            Number of log records dropped because the bounded queue was full.
+        """
+        return self.__droppedcount
+
+    @property
+    def metrics(self) -> LogSinkMetrics|None:
+        """
+            Metrics of this route, None if it is not instrumented.
+        """
+        return self.__metrics
+
+    def _start(self, encoderindex: int|None, renderlock: threading.Lock) -> None:
+        """
+            Starts the worker thread, called once by the router owning the route.
+        """
+        self.__encoderindex = encoderindex
+        self.__renderlock = renderlock
+        self.__startworker()
+        LogLifecycleHooks.registerafterfork(self.__restartafterfork)
+
+    def _enqueue(self, routed: RoutedLogRecord) -> None:
+        """
+            Queues a record without blocking, dropping it if the bounded queue is full.
+        """
+        logdeque = self.__logdeque
+        metrics = self.__metrics
+        if metrics is not None:
+            metrics.addaccepted()
+        if self.__maxqueuesize and len(logdeque) >= self.__maxqueuesize:
+            with self.__droplock:
+                self.__droppedcount += 1
+            if metrics is not None:
+                metrics.adddropped()
+            return
+        logdeque.append(routed)
+        if len(logdeque) >= self.__wakeupthreshold and not self.__wakeup.is_set():
+            self.__wakeup.set()
+
+    def _flush(self, deadline: float|None) -> bool:
+        """
+            Blocks until every record queued before the call was handed to the
+            writer and the writer was flushed.
+
+            Returns:
+                bool: False if `deadline` passed first.
+        """
+        marker = LogAck()
+        self.__logdeque.append(marker)
+        self.__wakeup.set()
+        worker = self.__worker
+        while worker is not None and worker.is_alive():
+            wait = 0.05 if deadline is None else min(0.05, deadline - time.monotonic())
+            if wait <= 0:
+                return marker.done
+            if marker.wait(wait):
+                return True
+        self.__drainsynchronously(deadline)
+        return marker.done
+
+    def _close(self, deadline: float|None) -> int:
+        """
+            Drains the queue, stops the worker and closes the writer.
+
+            Returns:
+                int: Number of records that were not written before `deadline`.
+        """
+        self.__stop = True
+        self.__wakeup.set()
+        worker = self.__worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        if (worker is None or not worker.is_alive()) and self.__drainsynchronously(deadline):
+            close = getattr(self.__writer, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception as e:
+                    print(f"[LogRoute] Failed to close writer: {e}")
+        return sum(1 for record in list(self.__logdeque) if type(record) is not LogAck)
+
+    def __startworker(self) -> None:
+        """
+            Creates the wake-up event and starts the worker thread.
+        """
+        self.__wakeup = threading.Event()
+        self.__drainlock = threading.Lock()
+        self.__worker = threading.Thread(target=self.__processlog, daemon=True)
+        self.__worker.start()
+
+    def __restartafterfork(self) -> None:
+        """
+            Runs in a forked child process, where the worker thread no longer exists.
+            Records queued by the parent are left to the parent to write.
+        """
+        if self.__stop:
+            return
+        self.__logdeque.clear()
+        self.__startworker()
+
+    def __processlog(self) -> None:
+        """
+            Drains the queue whenever the worker is woken or the latency deadline passed.
+        """
+        wakeup = self.__wakeup
+        while True:
+            wakeup.wait(timeout=self.__maxlatency)
+            wakeup.clear()
+            if self.__stop:
+                with self.__drainlock:
+                    while self.__logdeque:
+                        self.__drain()
+                return
+            if self.__logdeque:
+                with self.__drainlock:
+                    self.__drain()
+
+    def __observedrainlag(self, metrics: LogSinkMetrics) -> None:
+        """
+            Reports the age of the oldest queued record, if it is a `LogRecord`.
+        """
+        try:
+            routed = self.__logdeque[0]
+        except IndexError:
+            return
+        record = routed.record if type(routed) is RoutedLogRecord else None
+        if type(record) is LogRecord and record.timestampns:
+            metrics.observedrainlag(max(0, time.time_ns() - record.timestampns) / 1e9)
+
+    def __drainsynchronously(self, deadline: float|None) -> bool:
+        """
+            Drains the queue on the calling thread once the worker stopped.
+
+            Returns:
+                bool: False if another thread kept draining it past the deadline.
+        """
+        remaining = -1 if deadline is None else max(0.0, deadline - time.monotonic())
+        if not self.__drainlock.acquire(timeout=remaining):
+            return False
+        try:
+            while self.__logdeque:
+                self.__drain()
+        finally:
+            self.__drainlock.release()
+        return True
+
+    def __drain(self) -> None:
+        """
+            Hands the records queued when it starts to the writer, then completes
+            the flush markers among them.
+        """
+        logdeque = self.__logdeque
+        writer = self.__writer
+        encoderindex = self.__encoderindex
+        formatter = getattr(writer, "formatter", None) if encoderindex is not None else None
+        metrics = self.__metrics
+        messages : list = []
+        acks : list[LogAck] = []
+        written = failed = 0
+        pending = len(logdeque)
+        if metrics is not None and pending:
+            metrics.observequeue(pending)
+            self.__observedrainlag(metrics)
+        started = time.perf_counter()
+        for _ in range(pending):
+            try:
+                routed = logdeque.popleft()
+            except IndexError:
+                break
+            if type(routed) is LogAck:
+                acks.append(routed)
+                continue
+            record = routed.record
+            if type(record.get(LogConstants.LOG_MESSAGE)) is LazyLogMessage:
+                with self.__renderlock:
+                    renderlogmessage(record)
+            try:
+                if formatter is None:
+                    if type(record) is LogRecord and getattr(writer, "acceptslogrecord", False) is not True:
+                        record = record.todict()
+                    writer.writelog(record)
+                    written += 1
+                    continue
+                message = routed.encoded[encoderindex]
+                if message is None:
+                    message = routed.encoded[encoderindex] = formatter.format(record)
+                messages.append(message)
+            except Exception as e:
+                failed += 1
+                print(f"[LogRoute] Failed to write log: {e}")
+
+        if messages:
+            writer.writeformatted(messages[0][:0].join(messages), len(messages)) # type: ignore[attr-defined]
+            written += len(messages)
+        if metrics is not None and (written or failed):
+            elapsed = time.perf_counter() - started
+            if written:
+                metrics.observewrite(written, elapsed)
+            if failed:
+                metrics.observewrite(failed, elapsed, failed=True)
+        if acks:
+            flush = getattr(writer, "flush", None)
+            if flush is not None:
+                try:
+                    flush()
+                except Exception as e:
+                    print(f"[LogRoute] Failed to flush writer: {e}")
+            for ack in acks:
+                ack.complete()
+
+class RoutingWriterLog(WriteLogMessage):
+    """
+        Writer dispatching every log record to several writers, each with its own
+        minimum level, queue and worker thread, see `LogRoute`.
+
+        Logging only checks the level of each route and appends the record to the
+        queues of the routes accepting it, so the caller never waits for a sink
+        and a slow sink never holds back the others. Messages are rendered on the
+        workers, once per record however many routes receive it.
+
+        Routes whose writers expose a `formatter` comparing equal, e.g. two
+        `FileWriterLog` with the default `PipeLogFormatter`, share the formatted
+        record: it is serialized by the first of their workers and reused by the
+        others.
+
+        `flush(timeout)` blocks until every route handed the records logged before
+        the call to its writer and flushed it, `close(timeout)` drains every route
+        and closes the writers; the router can also be used as a context manager
+        and is closed at exit.
+
+        Attributes:
+            __routes (tuple[LogRoute, ...]): Routes records are dispatched to.
+            __encoders (int): Number of distinct formatters shared between routes.
+            __dispatch (tuple[tuple[int, LogRoute, LogSinkMetrics | None], ...]): Minimum
+                severity, route and metrics of every route, read on every record.
+    """
+
+    # lazy messages are rendered on the route workers instead of the caller's thread
+    defersmessageformatting : bool = True
+
+    # queued records are kept as compact LogRecord objects
+    acceptslogrecord : bool = True
+
+    def __init__(self, routes: list[LogRoute]) -> None:
+        super().__init__()
+        self.__routes : tuple[LogRoute, ...] = tuple(routes)
+        encoders : dict[Any, int] = {}
+        renderlock = threading.Lock()
+        for route in self.__routes:
+            formatter = getattr(route.writer, "formatter", None)
+            encoderindex = None
+            if formatter is not None and callable(getattr(route.writer, "writeformatted", None)):
+                encoderindex = encoders.setdefault(formatter, len(encoders))
+            route._start(encoderindex, renderlock)
+        self.__encoders : int = len(encoders)
+        self.__dispatch : tuple[tuple[int, LogRoute, LogSinkMetrics|None], ...] = tuple(
+            (route.minseverity, route, route.metrics) for route in self.__routes)
+        LogLifecycleHooks.registeratexit(self.close)
+
+    @property
+    def routes(self) -> tuple[LogRoute, ...]:
+        """
+            Routes records are dispatched to.
+        """
+        return self.__routes
+
+    @override
+    def writelog(self, loggerjson: dict[str, str]) -> None:
+        """
+            Queues the record on every route whose minimum level it reaches.
+
+            Args:
+                logger_json (dict[str, str]): Dictionary containing log metadata
+                    and the actual log message.
+        """
+        severity = LOGLEVEL_SEVERITY.get(loggerjson.get(LogConstants.LOG_LEVEL, ''), 0)
+        routed = None
+        for minseverity, route, metrics in self.__dispatch:
+            if severity >= minseverity:
+                if routed is None:
+                    routed = RoutedLogRecord(loggerjson, self.__encoders)
+                route._enqueue(routed)
+            elif metrics is not None:
+                metrics.addfiltered()
+
+    def flush(self, timeout: float|None = None) -> bool:
+        """
+            Blocks until every route handed the records logged before the call to
+            its writer, and flushed the writer.
+
+            Args:
+                timeout (float | None): Seconds to wait at most, None waits until done.
+
+            Returns:
+                bool: True if every route was flushed, False if the timeout expired.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        flushed = True
+        for route in self.__routes:
+            flushed = route._flush(deadline) and flushed
+        return flushed
+
+    def close(self, timeout: float|None = None) -> int:
+        """
+            Drains every route, stops the workers and closes the writers.
+
+            Args:
+                timeout (float | None): Seconds to wait at most, None waits until done.
+
+            Returns:
+                int: Number of records, over all routes, that were not written
+                    before the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        undrained = sum(route._close(deadline) for route in self.__routes)
+        if undrained:
+            print(f"[RoutingWriterLog] {undrained} log records were not written before close")
+        return undrained
+
+    def __enter__(self) -> 'RoutingWriterLog':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
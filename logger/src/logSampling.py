@@ -0,0 +1,204 @@
+from typing import Any, Hashable, override
+from abc import ABC, abstractmethod
+import itertools
+import random
+import time
+
+class LogSamplerState:
+    """
+        Sampling state of one function or call site.
+
+        Counters are `itertools.count` objects: `next` on them is a single atomic
+        call, so threads logging from the same site never take a lock.
+
+        Attributes:
+            calls (itertools.count): Number of records offered to the sampler.
+            suppressed (itertools.count): Numbers drawn by suppressed records and by
+                summaries, see `LogSampler.takesuppressed`.
+            reportedthrough (int): Value of `suppressed` right after the last summary.
+            nextsummary (float): Monotonic time before which no summary is emitted.
+            tokens (float): Records the token bucket still admits.
+            lastrefill (float): Monotonic time the token bucket was last refilled.
+            origin (Any): Passed along with the last suppressed record, to write a
+                summary without a record, see `LogSampler.takesummaries`.
+            quiet (bool): False once a record was suppressed since the last
+                `LogSampler.takesummaries`.
+    """
+    __slots__ = ('calls', 'suppressed', 'reportedthrough', 'nextsummary', 'tokens', 'lastrefill', 'origin', 'quiet')
+
+    def __init__(self, tokens: float, now: float) -> None:
+        self.calls : itertools.count = itertools.count()
+        self.suppressed : itertools.count = itertools.count()
+        self.reportedthrough : int = 0
+        self.nextsummary : float = now
+        self.tokens : float = tokens
+        self.lastrefill : float = now
+        self.origin : Any = None
+        self.quiet : bool = True
+
+class LogSampler(ABC):
+    """
+        Decides which records of a high-frequency log site are written.
+
+        Attach a sampler to a function with `gaurav_logger(sampler=...)`. It is
+        evaluated by `Logger.log` after the level and enable checks and before
+        the record or its message is built, so a suppressed record costs a dict
+        lookup and a counter increment. By default the function shares one
+        sampling state; with `percallsite=True` every line logging in the
+        function is sampled on its own.
+
+        When a record is admitted and records were suppressed since the last
+        summary, the logger first writes a "suppressed N similar messages" record
+        for the site, at most once every `summaryintervalms` milliseconds. Sites
+        that stopped logging are reported by `takesummaries`.
+
+        Subclasses implement `admit`, a subclass without it can not be created.
+
+        Attributes:
+            percallsite (bool): Keep a separate state for every call site.
+            __summaryinterval (float): Seconds between two summaries of a site.
+            __states (dict[Hashable, LogSamplerState]): State of every function or
+                call site seen so far.
+    """
+    def __init__(self, percallsite: bool = False, summaryintervalms: float = 10_000) -> None:
+        self.percallsite : bool = percallsite
+        self.__summaryinterval : float = summaryintervalms / 1000
+        self.__states : dict[Hashable, LogSamplerState] = {}
+
+    def sample(self, key: Hashable, origin: Any = None) -> int|None:
+        """
+            Offers one record of the site `key` to the sampler.
+
+            Args:
+                key (Hashable): Function or call site the record is logged from.
+                origin (Any): Kept with the site if the record is suppressed, and
+                    returned by `takesummaries`.
+
+            Returns:
+                int | None: None if the record is suppressed, otherwise the number
+                    of suppressed records to report in a summary first (often 0).
+        """
+        state = self.__states.get(key)
+        if state is None:
+            state = self.__states.setdefault(key, LogSamplerState(self._initialtokens(), time.monotonic()))
+        if not self.admit(state):
+            next(state.suppressed)
+            state.origin = origin
+            state.quiet = False
+            return None
+        return self.takesuppressed(state)
+
+    def takesuppressed(self, state: LogSamplerState, force: bool = False) -> int:
+        """
+            Returns the records suppressed since the last summary if a summary is
+            due, or `force` is set, and starts a new summary interval if there
+            are any. Returns 0 otherwise.
+        """
+        now = time.monotonic()
+        if now < state.nextsummary and not force:
+            return 0
+        # drawing a number counts every suppressed record before it, plus the draws of earlier summaries
+        drawn = next(state.suppressed)
+        suppressed = drawn - state.reportedthrough
+        state.reportedthrough = drawn + 1
+        if suppressed <= 0:
+            return 0
+        state.nextsummary = now + self.__summaryinterval
+        return suppressed
+
+    def takesummaries(self, force: bool = False) -> list[tuple[Any, int]]:
+        """
+            Takes the summaries of the sites that suppressed no record since the
+            previous call, if they are due, so a site that stopped logging still
+            reports the records it suppressed last. With `force`, every site
+            reports the records it suppressed, e.g. before the application exits.
+
+            Returns:
+                list[tuple[Any, int]]: The origin of the last suppressed record and
+                    the number of suppressed records, for every site to report.
+        """
+        summaries = []
+        for state in list(self.__states.values()):
+            if state.quiet or force:
+                suppressed = self.takesuppressed(state, force)
+                if suppressed:
+                    summaries.append((state.origin, suppressed))
+            state.quiet = True
+        return summaries
+
+    @abstractmethod
+    def admit(self, state: LogSamplerState) -> bool:
+        """
+            Returns True if the record offered to the site of `state` is written.
+        """
+
+    def _initialtokens(self) -> float:
+        """
+            Returns the tokens a new site starts with, only used by token buckets.
+        """
+        return 0.0
+
+class EveryNLogSampler(LogSampler):
+    """
+        Writes the first record of a site and then one in every `n`.
+
+        Attributes:
+            __n (int): One record in `n` is written.
+    """
+    def __init__(self, n: int, percallsite: bool = False, summaryintervalms: float = 10_000) -> None:
+        super().__init__(percallsite, summaryintervalms)
+        self.__n : int = max(1, n)
+
+    @override
+    def admit(self, state: LogSamplerState) -> bool:
+        return next(state.calls) % self.__n == 0
+
+class ProbabilisticLogSampler(LogSampler):
+    """
+        Writes every record with the probability `rate`.
+
+        Attributes:
+            __rate (float): Probability of a record being written, between 0 and 1.
+            __random (Callable[[], float]): Source of random numbers.
+    """
+    def __init__(self, rate: float, percallsite: bool = False, summaryintervalms: float = 10_000) -> None:
+        super().__init__(percallsite, summaryintervalms)
+        self.__rate : float = min(1.0, max(0.0, rate))
+        self.__random = random.random
+
+    @override
+    def admit(self, state: LogSamplerState) -> bool:
+        return self.__random() < self.__rate
+
+class RateLimitLogSampler(LogSampler):
+    """
+        Token bucket writing at most `burst` records at once and `ratepersecond`
+        records per second on average for every site.
+
+        The bucket is refilled without a lock. Threads racing on the same site
+        may let a record more through now and then, but never wait.
+
+        Attributes:
+            __rate (float): Tokens added per second.
+            __burst (float): Capacity of the bucket.
+    """
+    def __init__(self, ratepersecond: float, burst: int|None = None, percallsite: bool = False,
+                 summaryintervalms: float = 10_000) -> None:
+        super().__init__(percallsite, summaryintervalms)
+        self.__rate : float = max(0.0, ratepersecond)
+        self.__burst : float = float(max(1, burst if burst is not None else int(ratepersecond) or 1))
+
+    @override
+    def _initialtokens(self) -> float:
+        return self.__burst
+
+    @override
+    def admit(self, state: LogSamplerState) -> bool:
+        now = time.monotonic()
+        tokens = min(self.__burst, state.tokens + (now - state.lastrefill) * self.__rate)
+        state.lastrefill = now
+        if tokens < 1:
+            state.tokens = tokens
+            return False
+        state.tokens = tokens - 1
+        return True
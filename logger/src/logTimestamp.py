@@ -0,0 +1,74 @@
+from datetime import datetime, timezone, tzinfo
+import time
+
+from .timestampFormatEnum import TimestampFormatEnum
+
+class LogTimestampFormatter:
+    """
+        Turns `time.time_ns()` values into formatted timestamps.
+
+        Building a timezone aware `datetime` and rendering it costs as much as the
+        rest of a log call. Every record logged within the same second shares the
+        date, the time up to the seconds and the UTC offset, so the formatter
+        renders them once per second and caches them. Only the sub-second part is
+        rendered for every record.
+
+        The cache is a single tuple that is replaced as a whole, so threads can
+        format concurrently without a lock: at worst two threads render the same
+        second twice.
+
+        Attributes:
+            __localtimezone (tzinfo): Timezone the timestamps are rendered in.
+            __timestampformat (TimestampFormatEnum): Format of the timestamps.
+            __separator (str): Text between the date and the time.
+            __cache (tuple[int, str, str]): Epoch second, rendered text before the
+                sub-second part and rendered text after it.
+    """
+    def __init__(self, localtimezone: tzinfo = timezone.utc,
+                 timestampformat: TimestampFormatEnum = TimestampFormatEnum.DEFAULT) -> None:
+        self.__localtimezone : tzinfo = localtimezone
+        self.__timestampformat : TimestampFormatEnum = timestampformat
+        self.__separator : str = ' ' if timestampformat is TimestampFormatEnum.DEFAULT else 'T'
+        self.__cache : tuple[int, str, str] = (-1, '', '')
+
+    def format(self, timestampns: int) -> str:
+        """
+            Formats a timestamp given in nanoseconds since the Unix epoch.
+
+            Args:
+                timestampns (int): Value returned by `time.time_ns()`.
+
+            Returns:
+                str: The timestamp rendered in the configured format.
+        """
+        timestampformat = self.__timestampformat
+        if timestampformat is TimestampFormatEnum.EPOCH_NS:
+            return str(timestampns)
+
+        second, nanoseconds = divmod(timestampns, 1_000_000_000)
+        cache = self.__cache
+        if cache[0] != second:
+            cache = self.__rendersecond(second)
+            self.__cache = cache
+
+        microseconds = nanoseconds // 1000
+        if microseconds == 0 and timestampformat is TimestampFormatEnum.DEFAULT:
+            return cache[1] + cache[2]
+        return f"{cache[1]}.{microseconds:06d}{cache[2]}"
+
+    def now(self) -> str:
+        """
+            Formats the current time, as returned by `time.time_ns()`.
+        """
+        return self.format(time.time_ns())
+
+    def __rendersecond(self, second: int) -> tuple[int, str, str]:
+        """
+            Renders the parts of the timestamp shared by every record of `second`.
+        """
+        rendered = datetime.fromtimestamp(second, self.__localtimezone).isoformat(self.__separator)
+        # without microseconds the offset starts right after 'YYYY-MM-DDTHH:MM:SS'
+        prefix, offset = rendered[:19], rendered[19:]
+        if self.__timestampformat is TimestampFormatEnum.RFC3339 and offset == '+00:00':
+            offset = 'Z'
+        return (second, prefix, offset)
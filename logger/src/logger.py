@@ -1,168 +1,500 @@
-from __future__ import annotations
-from typing_extensions import Self
-from typing import cast
-import threading
-
-#logger imports
-from .loggerMessageDecorators import LoggerMessageDecorator, SimpleLogger
-from .writeLogMessage import WriteLogMessage
-from .logLevelEnum import LoglevelEnum
-from .logConstants import LogConstants
-from .loggerException import LoggerException, LoggerExceptionMessageConstant
-
-class Logger:
-    """
-    Thread-safe Singleton Logger that serves as the central entry point for
-    application-wide logging.
-
-    This logger supports configurable log levels, global and function-level
-    enable/disable flags, and optional inclusion of function names and log
-    levels in log messages.
-
-    The logger uses the Strategy pattern to determine where logs are written
-    (e.g., console, file, external service) and the Decorator pattern to
-    control which metadata is included in each log message.
-
-    Attributes:
-        _instance (Logger | None):
-            Private singleton instance of the Logger.
-
-        __lock (threading.Lock):
-            Lock used to ensure thread-safe singleton initialization.
-
-        __loggerMessageDecorator (LoggerMessageDecorator):
-            Determines which parameters (such as timestamp, function name,
-            and log level) are included when constructing log messages.
-
-        __writeLoggerStrategy (WriteLogMessage):
-            Strategy responsible for writing log messages and determining
-            their destination.
-
-        _isfunctionlevel_enable (dict):
-            Controls whether logging is enabled for the current function or
-            execution context.
-
-        _isGlobalLoggerEnabled (bool):
-            Controls whether logging is enabled globally across the application.
-
-        _thread_functionname (dict):
-            current function thread id and attached functionname with it.
-
-        __includeFunctionName (bool):
-            Global flag indicating whether function names should be included
-            in log messages.
-
-        __includeLogLevel (bool):
-            Global flag indicating whether log levels should be included
-            in log messages.
-    """
-
-    # singleton instance
-    _instance : Logger|None = None
-
-    # thread safe lock
-    __lock : threading.Lock = threading.Lock()
-
-    # logger decorator
-    __loggerMessageDecorator : LoggerMessageDecorator|None = SimpleLogger()
-
-    # write logs strategy
-    __writeLoggerStrategy : WriteLogMessage|None = None
-
-    # thread-level-function-name
-    _thread_functionname : dict = {} # threadid : functionid
-
-    # function-level logger
-    _isfunctionlevel_enable : dict = {} # function_entry : enable_disable
-
-    # logger enable globally
-    _isgloballoggerenable : bool = True
-
-    # include log level and function parameter
-    __includefunctionname = True
-    __includeloglevel = True
-
-    # get logger instance
-    def __new__(cls, writeLoggerStrategy :WriteLogMessage, loggerDecorator: LoggerMessageDecorator = SimpleLogger(), 
-                includefunctionname : bool = True, 
-                includeloglevel : bool = True, isgloballoggerenable: bool = True) -> Self:
-        if cls._instance==None:
-            with cls.__lock:
-                if cls._instance==None:
-                    cls._instance = super().__new__(cls)
-                    cls.__loggerMessageDecorator = loggerDecorator
-                    cls.__includefunctionname = includefunctionname
-                    cls.__includeloglevel = includeloglevel
-                    cls.__writeLoggerStrategy = writeLoggerStrategy
-                    cls._isgloballoggerenable = isgloballoggerenable
-        return cast(Self, cls._instance)     
-
-    @classmethod
-    def log(cls, msg: str, level: LoglevelEnum | None = None):
-        """
-            Logs a message with the specified log level.
-
-            This method evaluates the current logging configuration (global and
-            function-level settings) to determine:
-            - Whether the log should be written or ignored
-            - Which metadata should be included in the log message
-            - Where the log should be written based on the configured write strategy
-
-            Args:
-                msg (str):
-                    The log message provided by the caller.
-
-                level (LogLevelEnum):
-                    The severity level of the log message.
-        """
-        loggerinstance = cls._instance
-        
-        thread_id = threading.get_ident()
-        # check if it is none if yes then raise Exception
-        if loggerinstance==None:
-            raise LoggerException(LoggerExceptionMessageConstant.LOGGER_INSTANTIATION_EXCEPTION)
-        
-        # see if logger decorator is passed or not if instance is intialized then it is passed for sure
-        if cls.__loggerMessageDecorator:
-
-            # check if global logger enabled or not
-            if cls._isgloballoggerenable:
-            
-                # get the function id
-                if thread_id not in cls._thread_functionname:
-                    raise LoggerException(LoggerExceptionMessageConstant.LOGGER_DECORATOR_REQUIRED)
-                functionid = cls._thread_functionname[thread_id]
-                
-                # checking if function id is present to tell the function level logger enabled or not
-                if functionid not in cls._isfunctionlevel_enable:
-                    raise LoggerException(LoggerExceptionMessageConstant.LOGGER_FUNCTION_ID_IS_MISSING)
-                
-                # checking if function level log is enabled or not
-                if cls._isfunctionlevel_enable[functionid]:    
-                    # create a json object for getting logging details
-                    loggerjson : dict[str, str] = {}
-                    loggerjson[LogConstants.LOG_MESSAGE] = msg
-                    
-                    # include the loglevel in the log
-                    if cls.__includeloglevel:
-                        if level==None:
-                            raise LoggerException(LoggerExceptionMessageConstant.LOGGER_INCLUDE_LOG_LEVEL_EXCEPTION)
-                        loggerjson[LogConstants.LOG_LEVEL] = level.value
-                    
-                    # include the function name in the log
-                    if cls.__includefunctionname:
-                        if thread_id not in cls._thread_functionname:
-                            raise LoggerException(LoggerExceptionMessageConstant.LOGGER_INCLUDE_LOG_FUNCTION_NAME_EXCEPTION)
-                        loggerjson[LogConstants.LOG_FUNCTION_NAME] = functionid
-                    
-                    # send it logger decorator
-                    loggerjson = cls.__loggerMessageDecorator.getLog(loggerjson=loggerjson)
-                    
-                    #write the log
-                    if cls.__writeLoggerStrategy==None:
-                        raise LoggerException(LoggerExceptionMessageConstant.WRITING_LOG_STRATEGY_NOT_PROVIDED_EXCEPTION)
-                    
-                    cls.__writeLoggerStrategy.writelog(loggerjson)
-
-# test it
+from __future__ import annotations
+from typing_extensions import Self
+from typing import Any, Callable, cast
+from contextvars import ContextVar
+import threading
+import time
+import sys
+
+#logger imports
+from .loggerMessageDecorators import LoggerMessageDecorator, SimpleLogger, compileloggerdecorator
+from .writeLogMessage import WriteLogMessage
+from .logLevelEnum import LoglevelEnum
+from .logConstants import LogConstants
+from .logMessage import LazyLogMessage
+from .logRecord import LogRecord
+from .logDurability import LogAck
+from .logLifecycle import LogLifecycleHooks
+from .logSampling import LogSampler
+from .logMetrics import LogSinkMetrics
+from .loggerException import LoggerException, LoggerExceptionMessageConstant
+
+class ThreadFunctionStack(threading.local):
+    """
+        Thread-local stack of the decorated functions currently running on a thread.
+
+        `gaurav_logger` pushes a function id when a decorated function starts and
+        pops it when the function returns or raises, so the caller's function is
+        restored after a nested decorated call. Every thread sees its own `stack`,
+        so pushing and popping never touches shared state.
+
+        Attributes:
+            stack (list[str]): Function ids, the innermost running function last.
+    """
+    def __init__(self) -> None:
+        self.stack : list[str] = []
+
+class Logger:
+    """
+    Thread-safe Singleton Logger that serves as the central entry point for
+    application-wide logging.
+
+    This logger supports configurable log levels, global and function-level
+    enable/disable flags, and optional inclusion of function names and log
+    levels in log messages.
+
+    The logger uses the Strategy pattern to determine where logs are written
+    (e.g., console, file, external service) and the Decorator pattern to
+    control which metadata is included in each log message.
+
+    Attributes:
+        _instance (Logger | None):
+            Private singleton instance of the Logger.
+
+        __lock (threading.Lock):
+            Lock used to ensure thread-safe singleton initialization.
+
+        __loggerMessageDecorator (LoggerMessageDecorator):
+            Determines which parameters (such as timestamp, function name,
+            and log level) are included when constructing log messages.
+            The chain given at construction is compiled into a single
+            `CompiledLoggerDecorator`.
+
+        __writeLoggerStrategy (WriteLogMessage):
+            Strategy responsible for writing log messages and determining
+            their destination.
+
+        _isfunctionlevel_enable (dict):
+            Controls whether logging is enabled for the current function or
+            execution context.
+
+        _isGlobalLoggerEnabled (bool):
+            Controls whether logging is enabled globally across the application.
+
+        _minlogseverity (int):
+            Severity of the minimum log level. Logs below it are discarded before
+            any log message is built.
+
+        _functionminlogseverity (dict):
+            Per-function minimum log severity, set through `gaurav_logger(minloglevel=...)`.
+
+        _functionsampler (dict):
+            Per-function `LogSampler`, set through `gaurav_logger(sampler=...)`.
+
+        _metrics (LogSinkMetrics | None):
+            Counts the logs handed to the write strategy and the logs discarded
+            by the level, enable and sampling checks, see `LogMetricsRegistry`.
+
+        _thread_functionstack (ThreadFunctionStack):
+            Per-thread stack of the decorated functions running on the thread.
+
+        _task_functionname (ContextVar):
+            Decorated coroutine running in the current asyncio task, stored as
+            (functionid, depth of the thread function stack when it started).
+
+        __includeFunctionName (bool):
+            Global flag indicating whether function names should be included
+            in log messages.
+
+        __includeLogLevel (bool):
+            Global flag indicating whether log levels should be included
+            in log messages.
+
+        __summarythread (threading.Thread | None):
+            Daemon thread writing the summaries of sampled sites that stopped
+            logging, started when the first log is suppressed.
+    """
+
+    # how often (seconds) sampled sites that stopped logging are checked for summaries
+    SUMMARY_CHECK_INTERVAL : float = 1.0
+
+    # singleton instance
+    _instance : Logger|None = None
+
+    # thread safe lock
+    __lock : threading.Lock = threading.Lock()
+
+    # logger decorator
+    __loggerMessageDecorator : LoggerMessageDecorator|None = SimpleLogger()
+
+    # write logs strategy
+    __writeLoggerStrategy : WriteLogMessage|None = None
+
+    # thread-level-function-name, every thread has its own stack
+    _thread_functionstack : ThreadFunctionStack = ThreadFunctionStack()
+
+    # task-level-function-name, every asyncio task has its own value
+    _task_functionname : ContextVar[tuple[str, int]|None] = ContextVar("gaurav_logger_task_function", default=None)
+
+    # function-level logger
+    _isfunctionlevel_enable : dict = {} # function_entry : enable_disable
+
+    # logger enable globally
+    _isgloballoggerenable : bool = True
+
+    # minimum log level globally and per function
+    _minlogseverity : int = 0
+    _functionminlogseverity : dict = {} # function_entry : severity
+
+    # sampling of high-frequency functions
+    _functionsampler : dict[str, LogSampler] = {} # function_entry : sampler
+
+    # counts accepted and filtered logs when given
+    _metrics : LogSinkMetrics|None = None
+
+    # include log level and function parameter
+    __includefunctionname = True
+    __includeloglevel = True
+
+    # writes the summaries of sampled sites that stopped logging
+    __summarythread : threading.Thread|None = None
+
+    # get logger instance
+    def __new__(cls, writeLoggerStrategy :WriteLogMessage, loggerDecorator: LoggerMessageDecorator = SimpleLogger(), 
+                includefunctionname : bool = True, 
+                includeloglevel : bool = True, isgloballoggerenable: bool = True,
+                minloglevel: LoglevelEnum|None = None, metrics: LogSinkMetrics|None = None) -> Self:
+        if cls._instance==None:
+            with cls.__lock:
+                if cls._instance==None:
+                    cls._instance = super().__new__(cls)
+                    # walk the decorator chain once here instead of on every log
+                    cls.__loggerMessageDecorator = compileloggerdecorator(loggerDecorator) if loggerDecorator else loggerDecorator
+                    cls.__includefunctionname = includefunctionname
+                    cls.__includeloglevel = includeloglevel
+                    cls.__writeLoggerStrategy = writeLoggerStrategy
+                    cls._isgloballoggerenable = isgloballoggerenable
+                    cls._minlogseverity = minloglevel.severity if minloglevel is not None else 0
+                    cls._metrics = metrics
+        return cast(Self, cls._instance)     
+
+    @classmethod
+    def setloglevel(cls, minloglevel: LoglevelEnum|None) -> None:
+        """
+            Changes the global minimum log level at runtime.
+
+            Args:
+                minloglevel (LoglevelEnum | None):
+                    Logs less severe than this level are discarded. None logs every level.
+        """
+        cls._minlogseverity = minloglevel.severity if minloglevel is not None else 0
+
+    @classmethod
+    def log(cls, msg: str|Callable[[], Any], level: LoglevelEnum | None = None, *args: Any, **kwargs: Any):
+        """
+            Logs a message with the specified log level.
+
+            Logs below the global minimum log level are discarded first, before
+            any other check is made or any log message is built.
+
+            The message can be a `str.format` template followed by its arguments,
+            e.g. `Logger.log("user {} took {ms}ms", LoglevelEnum.INFO, user, ms=12)`,
+            or a zero-argument callable returning the message. Either is only
+            formatted once every check has passed, and writers such as
+            `AsyncFileWriterLog` format it on their background thread.
+
+            This method evaluates the current logging configuration (global and
+            function-level settings) to determine:
+            - Whether the log should be written or ignored
+            - Which metadata should be included in the log message
+            - Where the log should be written based on the configured write strategy
+
+            Args:
+                msg (str | Callable[[], Any]):
+                    The log message or message template provided by the caller,
+                    or a callable returning the message.
+
+                level (LogLevelEnum):
+                    The severity level of the log message.
+
+                *args, **kwargs:
+                    Arguments formatted into the message template.
+        """
+        # fast path: discard logs below the minimum level before doing anything else
+        if level is not None and level.severity < cls._minlogseverity:
+            if cls._metrics is not None:
+                cls._metrics.addfiltered()
+            return
+
+        summary, loggerjson = cls.__buildlog(msg, level, args, kwargs)
+        if summary is not None:
+            cls.__writeLoggerStrategy.writelog(summary) # type: ignore[union-attr]
+        if loggerjson is not None:
+            cls.__writeLoggerStrategy.writelog(loggerjson) # type: ignore[union-attr]
+        if cls._metrics is not None:
+            cls.__countlog(loggerjson)
+
+    @classmethod
+    async def alog(cls, msg: str|Callable[[], Any], level: LoglevelEnum | None = None, *args: Any, **kwargs: Any):
+        """
+            Awaitable variant of `log` for asyncio code.
+
+            The log is built exactly like in `log`. If the write strategy provides an
+            `awritelog` coroutine (e.g. `AsyncFileWriterLog`), it is awaited so that
+            a full log queue suspends the calling task instead of blocking the event
+            loop. Otherwise the strategy's `writelog` is called directly.
+
+            Args:
+                msg (str | Callable[[], Any]):
+                    The log message or message template provided by the caller,
+                    or a callable returning the message.
+
+                level (LogLevelEnum):
+                    The severity level of the log message.
+
+                *args, **kwargs:
+                    Arguments formatted into the message template.
+        """
+        if level is not None and level.severity < cls._minlogseverity:
+            if cls._metrics is not None:
+                cls._metrics.addfiltered()
+            return
+
+        summary, loggerjson = cls.__buildlog(msg, level, args, kwargs)
+        if cls._metrics is not None:
+            cls.__countlog(loggerjson)
+        if loggerjson is None:
+            return
+
+        awritelog = getattr(cls.__writeLoggerStrategy, "awritelog", None)
+        if awritelog is not None:
+            if summary is not None:
+                await awritelog(summary)
+            await awritelog(loggerjson)
+        else:
+            if summary is not None:
+                cls.__writeLoggerStrategy.writelog(summary) # type: ignore[union-attr]
+            cls.__writeLoggerStrategy.writelog(loggerjson) # type: ignore[union-attr]
+
+    @classmethod
+    def logwithack(cls, msg: str|Callable[[], Any], level: LoglevelEnum | None = None,
+                   *args: Any, **kwargs: Any) -> LogAck|None:
+        """
+            Variant of `log` for records that must not be lost, e.g. audit logs.
+
+            The log is built exactly like in `log` and handed to the write strategy's
+            `writelogwithack` (see `AsyncFileWriterLog` and `FileWriterLog`). Wait on
+            the returned acknowledgement to know the record reached the file, and
+            log it again if it did not complete in time.
+
+            Returns:
+                LogAck | None: Acknowledgement of the record, None if the log was
+                    discarded by the log level or enable checks. Strategies without
+                    `writelogwithack` return an acknowledgement that is complete as
+                    soon as `writelog` returned.
+        """
+        if level is not None and level.severity < cls._minlogseverity:
+            if cls._metrics is not None:
+                cls._metrics.addfiltered()
+            return None
+
+        summary, loggerjson = cls.__buildlog(msg, level, args, kwargs)
+        if cls._metrics is not None:
+            cls.__countlog(loggerjson)
+        if loggerjson is None:
+            return None
+        if summary is not None:
+            cls.__writeLoggerStrategy.writelog(summary) # type: ignore[union-attr]
+
+        writelogwithack = getattr(cls.__writeLoggerStrategy, "writelogwithack", None)
+        if writelogwithack is not None:
+            return writelogwithack(loggerjson)
+        cls.__writeLoggerStrategy.writelog(loggerjson) # type: ignore[union-attr]
+        ack = LogAck()
+        ack.complete()
+        return ack
+
+    @classmethod
+    def flushsuppressed(cls) -> None:
+        """
+            Writes a "suppressed N similar messages" record for every sampled site
+            with suppressed logs not reported yet, whether its summary is due or
+            not. Runs when the interpreter exits once a log was suppressed.
+        """
+        cls.__writesummaries(force=True)
+
+    @classmethod
+    def __writesummaries(cls, force: bool) -> None:
+        """
+            Writes the summaries returned by `LogSampler.takesummaries` of every sampler.
+        """
+        if cls._instance is None or cls.__writeLoggerStrategy is None:
+            return
+        # a sampler can be shared by several functions
+        samplers = {id(sampler): sampler for sampler in cls._functionsampler.values()}
+        for sampler in samplers.values():
+            for (functionid, level), suppressed in sampler.takesummaries(force):
+                summary = cls.__makerecord(f"suppressed {suppressed} similar messages", level, functionid)
+                cls.__writeLoggerStrategy.writelog(summary)
+
+    @classmethod
+    def __startsummarythread(cls) -> None:
+        with cls.__lock:
+            if cls.__summarythread is None:
+                LogLifecycleHooks.registeratexit(cls.flushsuppressed)
+                LogLifecycleHooks.registerafterfork(cls.__restartsummarythread)
+                cls.__restartsummarythread()
+
+    @classmethod
+    def __restartsummarythread(cls) -> None:
+        # also runs in forked children, the thread of the parent does not survive the fork
+        cls.__summarythread = threading.Thread(target=cls.__writesummariesperiodically, daemon=True)
+        cls.__summarythread.start()
+
+    @classmethod
+    def __writesummariesperiodically(cls) -> None:
+        """
+            Writes the summaries of sampled sites that stopped logging, which no
+            admitted log of theirs will ever write.
+        """
+        while True:
+            time.sleep(cls.SUMMARY_CHECK_INTERVAL)
+            try:
+                cls.__writesummaries(force=False)
+            except Exception as e:
+                print(f"[Logger] Failed to write suppressed log summaries: {e}")
+
+    @classmethod
+    def __countlog(cls, loggerjson: dict[str, str]|None) -> None:
+        """
+            Counts a log as accepted if it was handed to the write strategy,
+            as filtered if it was discarded.
+        """
+        if loggerjson is None:
+            cls._metrics.addfiltered() # type: ignore[union-attr]
+        else:
+            cls._metrics.addaccepted() # type: ignore[union-attr]
+
+    @classmethod
+    def _currentfunctionid(cls) -> str|None:
+        """
+            Returns the id of the decorated function the current log call belongs to.
+
+            Synchronous decorated functions are pushed on the thread function stack,
+            decorated coroutines are attached to their asyncio task through
+            `_task_functionname`. Sync functions pushed after the coroutine started
+            (i.e. called by it) win over the coroutine, otherwise the coroutine wins,
+            because other tasks on the same thread never see its context.
+
+            Returns:
+                str | None: The function id, or None if no decorated function is running.
+        """
+        stack = cls._thread_functionstack.stack
+        taskfunction = cls._task_functionname.get()
+        if taskfunction is not None and len(stack) <= taskfunction[1]:
+            return taskfunction[0]
+        return stack[-1] if stack else None
+
+    @classmethod
+    def __buildlog(cls, msg: str|Callable[[], Any], level: LoglevelEnum | None,
+                   args: tuple, kwargs: dict[str, Any]) -> tuple[dict[str, str]|None, dict[str, str]|None]:
+        """
+            Builds the log message for `log`, `alog` and `logwithack`.
+
+            A message template with arguments, or a callable message, is wrapped in a
+            `LazyLogMessage` only after every enable check passed. It is rendered
+            right away unless the write strategy formats messages itself.
+
+            The log is built as a `LogRecord`. Strategies that do not set
+            `acceptslogrecord` receive it converted to a plain dictionary.
+
+            Returns:
+                tuple[dict[str, str] | None, dict[str, str] | None]: The summary of
+                    the logs suppressed by the sampler of the site, to write first,
+                    or None, and the decorated logger json, or None if the log is
+                    disabled for the current function or globally.
+        """
+        loggerinstance = cls._instance
+        
+        # check if it is none if yes then raise Exception
+        if loggerinstance==None:
+            raise LoggerException(LoggerExceptionMessageConstant.LOGGER_INSTANTIATION_EXCEPTION)
+        
+        # see if logger decorator is passed or not if instance is intialized then it is passed for sure
+        if not cls.__loggerMessageDecorator:
+            return None, None
+
+        # check if global logger enabled or not
+        if not cls._isgloballoggerenable:
+            return None, None
+            
+        # get the function id
+        functionid = cls._currentfunctionid()
+        if functionid is None:
+            raise LoggerException(LoggerExceptionMessageConstant.LOGGER_DECORATOR_REQUIRED)
+        
+        # checking if function id is present to tell the function level logger enabled or not
+        if functionid not in cls._isfunctionlevel_enable:
+            raise LoggerException(LoggerExceptionMessageConstant.LOGGER_FUNCTION_ID_IS_MISSING)
+        
+        # checking if function level log is enabled or not
+        if not cls._isfunctionlevel_enable[functionid]:
+            return None, None
+
+        # discard logs below the minimum level of this function
+        if level is not None and level.severity < cls._functionminlogseverity.get(functionid, 0):
+            return None, None
+
+        # sample high-frequency functions and call sites before anything is built
+        sampler = cls._functionsampler.get(functionid) if cls._functionsampler else None
+        summary = None
+        if sampler is not None:
+            key : Any = functionid
+            if sampler.percallsite:
+                # __buildlog is called by log, alog or logwithack, the call site is their caller
+                caller = sys._getframe(2)
+                key = (caller.f_code, caller.f_lineno)
+            suppressed = sampler.sample(key, (functionid, level))
+            if suppressed is None:
+                if cls.__summarythread is None:
+                    cls.__startsummarythread()
+                return None, None
+            if suppressed:
+                # written by the caller, through the same path as the log
+                summary = cls.__makerecord(f"suppressed {suppressed} similar messages", level, functionid)
+
+        # defer formatting of templates and callables, logs suppressed above never pay for it
+        if args or kwargs or not isinstance(msg, str):
+            lazymessage = LazyLogMessage(msg, args, kwargs)
+            if getattr(cls.__writeLoggerStrategy, "defersmessageformatting", False) is True:
+                msg = lazymessage # type: ignore[assignment]
+            else:
+                msg = lazymessage.render()
+
+        return summary, cls.__makerecord(msg, level, functionid)
+
+    @classmethod
+    def __makerecord(cls, msg: Any, level: LoglevelEnum | None, functionid: str) -> dict[str, str]:
+        """
+            Builds and decorates the record of a log that passed every check.
+
+            Returns:
+                dict[str, str]: The decorated logger json.
+        """
+        # create a compact log record for getting logging details
+        loggerjson = LogRecord(msg, None, None, time.time_ns())
+        
+        # include the loglevel in the log
+        if cls.__includeloglevel:
+            if level==None:
+                raise LoggerException(LoggerExceptionMessageConstant.LOGGER_INCLUDE_LOG_LEVEL_EXCEPTION)
+            loggerjson.level = level.value
+        
+        # include the function name in the log
+        if cls.__includefunctionname:
+            loggerjson.functionname = functionid
+        
+        # send it logger decorator
+        loggerjson = cls.__loggerMessageDecorator.getLog(loggerjson=loggerjson) # type: ignore[arg-type]
+        
+        #write the log
+        if cls.__writeLoggerStrategy==None:
+            raise LoggerException(LoggerExceptionMessageConstant.WRITING_LOG_STRATEGY_NOT_PROVIDED_EXCEPTION)
+
+        # strategies that do not know the record type get the plain logger json
+        if type(loggerjson) is LogRecord and getattr(cls.__writeLoggerStrategy, "acceptslogrecord", False) is not True:
+            return loggerjson.todict()
+        return loggerjson # type: ignore[return-value]
+
+# test it
 # implement docker strategy
\ No newline at end of file
@@ -1,74 +1,131 @@
-from typing import Callable, Any
-import inspect
-import threading
-
-# logger import
-from .logger import Logger
-from .loggerException import LoggerException, LoggerExceptionMessageConstant
-
-def function_uid(func):
-    func = inspect.unwrap(func)
-    if hasattr(func, "__func__"):  # bound method
-        func = func.__func__
-    return f"{func.__module__}.{func.__qualname__}"
-
-def gaurav_logger(enable: bool = True) -> Callable:  
-    """
-        Decorator to enable or disable logging for a specific function.
-
-        Args:
-            enable (bool, optional): Flag to enable or disable logging for the
-                decorated function. Defaults to True.
-
-        Returns:
-            Callable: The decorator that applies logging behavior to the function.
-    """ 
-    def decorator(function: Callable[..., Any])-> Callable:
-        """
-            Inner decorator that wraps the target function.
-
-            Args:
-                function (Callable[..., Any]): The function to be decorated.
-
-            Returns:
-                Callable: The wrapped function with logging behavior.
-        """
-        def wrapper(*args, **kwargs) -> Any:
-            """
-                Wrapper function that executes the target function and controls logging.
-
-                Before executing the function, it sets logger flags based on the
-                decorator arguments and global logger settings.
-
-                Args:
-                    *args: Positional arguments for the target function.
-                    **kwargs: Keyword arguments for the target function.
-
-                Returns:
-                    Any: The result of executing the target function.
-            """
-
-            # check logger is even initialized or not
-            if Logger._instance==None:
-                raise LoggerException(LoggerExceptionMessageConstant.LOGGER_INSTANTIATION_EXCEPTION)
-            
-            thread_id = threading.get_ident()
-            functionid = function_uid(function)
-            if Logger._isgloballoggerenable:
-                # adding threadid and attaching this function
-                Logger._thread_functionname[thread_id] = functionid
-
-                # attaching if function level is enabled for logging or not
-                if functionid not in Logger._isfunctionlevel_enable:
-                    Logger._isfunctionlevel_enable[functionid] = enable
-                                
-            result = function(*args, **kwargs)
-            
-            # cleanup tasks
-            if Logger._isgloballoggerenable:
-                # removing threadid by which this function is attached
-                Logger._thread_functionname.pop(thread_id)
-
-            return result
-        return wrapper            
+from typing import Callable, Any
+import inspect
+
+# logger import
+from .logger import Logger
+from .logLevelEnum import LoglevelEnum
+from .logSampling import LogSampler
+from .loggerException import LoggerException, LoggerExceptionMessageConstant
+
+def function_uid(func):
+    func = inspect.unwrap(func)
+    if hasattr(func, "__func__"):  # bound method
+        func = func.__func__
+    return f"{func.__module__}.{func.__qualname__}"
+
+def gaurav_logger(enable: bool = True, minloglevel: LoglevelEnum|None = None, sampler: LogSampler|None = None) -> Callable:  
+    """
+        Decorator to enable or disable logging for a specific function.
+
+        Both regular functions and `async def` coroutine functions can be decorated.
+        A decorated coroutine is attached to the asyncio task running it, so
+        concurrent tasks on the same event loop thread keep their own function.
+
+        Args:
+            enable (bool, optional): Flag to enable or disable logging for the
+                decorated function. Defaults to True.
+            minloglevel (LoglevelEnum | None, optional): Minimum log level for the
+                decorated function, logs below it are discarded. Defaults to None,
+                which only applies the global minimum log level.
+            sampler (LogSampler | None, optional): Samples or rate limits the logs
+                of the decorated function, see `LogSampler`. Defaults to None,
+                which writes every log.
+
+        Returns:
+            Callable: The decorator that applies logging behavior to the function.
+    """ 
+    def decorator(function: Callable[..., Any])-> Callable:
+        """
+            Inner decorator that wraps the target function.
+
+            Args:
+                function (Callable[..., Any]): The function to be decorated.
+
+            Returns:
+                Callable: The wrapped function with logging behavior.
+        """
+        # the function identity never changes, compute it once instead of on every call
+        functionid = function_uid(function)
+
+        def registerfunction() -> None:
+            """
+                Attaches whether the function is enabled for logging, its minimum level and its sampler.
+            """
+            if minloglevel is not None:
+                Logger._functionminlogseverity[functionid] = minloglevel.severity
+            if sampler is not None:
+                Logger._functionsampler[functionid] = sampler
+            Logger._isfunctionlevel_enable[functionid] = enable
+
+        if inspect.iscoroutinefunction(function):
+            async def asyncwrapper(*args, **kwargs) -> Any:
+                """
+                    Coroutine wrapper that awaits the target coroutine and controls logging.
+
+                    The function is attached to the current asyncio task through a
+                    context variable, which is restored when the coroutine finishes.
+
+                    Args:
+                        *args: Positional arguments for the target coroutine.
+                        **kwargs: Keyword arguments for the target coroutine.
+
+                    Returns:
+                        Any: The result of awaiting the target coroutine.
+                """
+                if Logger._instance==None:
+                    raise LoggerException(LoggerExceptionMessageConstant.LOGGER_INSTANTIATION_EXCEPTION)
+
+                if not Logger._isgloballoggerenable:
+                    return await function(*args, **kwargs)
+
+                if functionid not in Logger._isfunctionlevel_enable:
+                    registerfunction()
+
+                # remember the thread stack depth, functions pushed later are called by this coroutine
+                depth = len(Logger._thread_functionstack.stack)
+                token = Logger._task_functionname.set((functionid, depth))
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    Logger._task_functionname.reset(token)
+            return asyncwrapper
+
+        def wrapper(*args, **kwargs) -> Any:
+            """
+                Wrapper function that executes the target function and controls logging.
+
+                Before executing the function, it sets logger flags based on the
+                decorator arguments and global logger settings, and pushes the
+                function on the thread function stack until it returns or raises.
+                When logging is globally disabled, the function is called directly
+                without any thread bookkeeping.
+
+                Args:
+                    *args: Positional arguments for the target function.
+                    **kwargs: Keyword arguments for the target function.
+
+                Returns:
+                    Any: The result of executing the target function.
+            """
+
+            # check logger is even initialized or not
+            if Logger._instance==None:
+                raise LoggerException(LoggerExceptionMessageConstant.LOGGER_INSTANTIATION_EXCEPTION)
+
+            # fast path: nothing to track when logging is disabled globally
+            if not Logger._isgloballoggerenable:
+                return function(*args, **kwargs)
+
+            # attaching if function level is enabled for logging or not
+            if functionid not in Logger._isfunctionlevel_enable:
+                registerfunction()
+
+            # pushing this function on the thread stack, the caller's function is restored on exit
+            stack = Logger._thread_functionstack.stack
+            stack.append(functionid)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stack.pop()
+        return wrapper            
     return decorator
\ No newline at end of file
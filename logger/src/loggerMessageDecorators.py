@@ -1,152 +1,308 @@
-from typing import Protocol
-from datetime import datetime, timezone, tzinfo
-from typing import override
-
-from .logConstants import LogConstants
-
-class LoggerMessageDecorator(Protocol):
-    """
-        Interface responsible for processing a JSON object.
-
-        This interface accepts a dic structure, enriches it by adding
-        the required parameters, and returns the updated dic.
-    """
-    def getLog(self, loggerjson: dict[str, str]) -> dict[str, str]:
-        """
-            Abstract method for processing a log message dictionary.
-
-            Subclasses must implement this method to enrich the provided dictionary
-            with the required log parameters and return the updated log message.
-
-            Args:
-                loggerjson (dict[str, str]):
-                    Dictionary representing the log message to be processed.
-
-            Returns:
-                str: Updated logger dictionary containing the required log parameters.
-        """
-        ...
-
-class SimpleLogger(LoggerMessageDecorator):
-    """
-        Concrete implementation of the LoggerMessageDecorator interface.
-
-        This implementation returns the provided logger JSON as-is and serves as
-        the base decorator in the logging system. Its primary purpose is to act
-        as a foundation for extending log message construction by allowing
-        additional decorators to add more parameters to the log message.
-
-        Attributes:
-            __additionalLogger (LoggerMessageDecorator):
-                Reference to another LoggerMessageDecorator instance, enabling
-                chaining of decorators to incrementally add parameters to the
-                logger JSON.
-    """
-
-    def __init__(self, additionallogger: LoggerMessageDecorator|None = None) -> None:
-        super().__init__()
-        self.__additionallogger : LoggerMessageDecorator|None = additionallogger
-
-    @override
-    def getLog(self, loggerjson: dict[str, str]) -> dict[str, str]:
-        """
-            Implements the `get_log` method, optionally passing the logger dictionary
-            to the next decorator to add more parameters. If no further decorator is
-            provided, it simply returns the current logger dictionary.
-
-            Args:
-                loggerjson (dict[str, str]):
-                    Dictionary representing the log message to be processed.
-
-            Returns:
-                dict[str, str]: Updated logger dictionary containing the required log parameters.
-        """
-        if self.__additionallogger is None:
-            return loggerjson
-        return self.__additionallogger.getLog(loggerjson)
-
-class LoggerWithTimeStamp(LoggerMessageDecorator):
-    """
-        Concrete implementation of the LoggerMessageDecorator interface.
-
-        This class implements the `get_log` method by adding a timestamp parameter
-        to the logger JSON and passing it to the next decorator, if provided, to
-        add additional parameters.
-
-        Attributes:
-            __additionalLogger (LoggerMessageDecorator):
-                Reference to another LoggerMessageDecorator instance, enabling
-                chaining of decorators to incrementally add parameters to the
-                logger JSON.
-
-            __localTimezone (timezone):
-                Timezone used for the timestamp in the logger JSON, representing
-                the user's desired local time.
-    """
-
-    def __init__(self, localtimezone : tzinfo = timezone.utc, additionallogger: LoggerMessageDecorator|None = None) -> None:
-        super().__init__()
-        self.__additionallogger : LoggerMessageDecorator|None = additionallogger
-        self.__localtimezone = localtimezone
-    
-    @override
-    def getLog(self, loggerjson: dict[str, str]) -> dict[str, str]:
-        """
-            Implements the `get_log` method by adding a timestamp to the logger dictionary
-            and optionally passing it to the next decorator to include additional parameters.
-            If no further decorator is provided, the current logger dictionary is returned as-is.
-
-            Args:
-                loggerjson (dict[str, str]):
-                    Dictionary representing the log message to be processed.
-
-            Returns:
-                dict[str, str]: Updated logger dictionary containing the required log parameters.
-        """
-        loggerjson[LogConstants.LOG_TIMESTAMP] = str(datetime.now(self.__localtimezone))
-        if self.__additionallogger is None:
-            return loggerjson
-        return self.__additionallogger.getLog(loggerjson)
-    
-class LoggerWithServiceName(LoggerMessageDecorator):
-    """
-        Concrete implementation of the LoggerMessageDecorator interface.
-
-        This class implements the `get_log` method by adding a `serviceName` parameter
-        to the logger JSON and passing it to the next decorator, if provided, to
-        add additional parameters.
-
-        Attributes:
-            __additionalLogger (LoggerMessageDecorator):
-                Reference to another LoggerMessageDecorator instance, enabling
-                chaining of decorators to incrementally add parameters to the
-                logger JSON.
-
-            __serviceName (str):
-                Name of the service provided by the caller, used to identify
-                which service is generating the log.
-    """
-    def __init__(self, serviceName : str, additionallogger: LoggerMessageDecorator|None = None) -> None:
-        super().__init__()
-        self.__additionallogger : LoggerMessageDecorator|None = additionallogger
-        self.__serviceName : str = serviceName
-    
-    @override
-    def getLog(self, loggerjson: dict[str, str]) -> dict[str, str]:
-        """
-            Implements the `get_log` method by adding the servicename to the logger dictionary
-            and optionally passing it to the next decorator to include additional parameters.
-            If no further decorator is provided, the current logger dictionary is returned as-is.
-
-            Args:
-                loggerjson (dict[str, str]):
-                    Dictionary representing the log message to be processed.
-
-            Returns:
-                dict[str, str]: Updated logger dictionary containing the required log parameters.
-        """
-        loggerjson[LogConstants.LOG_SERVICE_NAME] = self.__serviceName
-        if self.__additionallogger is None:
-            return loggerjson
-        return self.__additionallogger.getLog(loggerjson)
-    
+from typing import Protocol, Callable
+from datetime import timezone, tzinfo
+from typing import override
+
+from .logConstants import LogConstants
+from .logRecord import LogRecord, LOG_RECORD_SLOTS
+from .logTimestamp import LogTimestampFormatter
+from .timestampFormatEnum import TimestampFormatEnum
+
+class LoggerMessageDecorator(Protocol):
+    """
+        Interface responsible for processing a JSON object.
+
+        This interface accepts a dic structure, enriches it by adding
+        the required parameters, and returns the updated dic.
+    """
+    def getLog(self, loggerjson: dict[str, str]) -> dict[str, str]:
+        """
+            Abstract method for processing a log message dictionary.
+
+            Subclasses must implement this method to enrich the provided dictionary
+            with the required log parameters and return the updated log message.
+
+            Args:
+                loggerjson (dict[str, str]):
+                    Dictionary representing the log message to be processed.
+
+            Returns:
+                str: Updated logger dictionary containing the required log parameters.
+        """
+        ...
+
+# static fields, dynamic fields and the next decorator of one link of a decorator chain
+CompileStep = tuple[dict[str, str], dict[str, Callable[[dict[str, str]], str]], LoggerMessageDecorator|None]
+
+class SimpleLogger(LoggerMessageDecorator):
+    """
+        Concrete implementation of the LoggerMessageDecorator interface.
+
+        This implementation returns the provided logger JSON as-is and serves as
+        the base decorator in the logging system. Its primary purpose is to act
+        as a foundation for extending log message construction by allowing
+        additional decorators to add more parameters to the log message.
+
+        Attributes:
+            __additionalLogger (LoggerMessageDecorator):
+                Reference to another LoggerMessageDecorator instance, enabling
+                chaining of decorators to incrementally add parameters to the
+                logger JSON.
+    """
+
+    def __init__(self, additionallogger: LoggerMessageDecorator|None = None) -> None:
+        super().__init__()
+        self.__additionallogger : LoggerMessageDecorator|None = additionallogger
+
+    def _compilestep(self) -> CompileStep:
+        """
+            Describes this decorator for `compileloggerdecorator`: it adds no field.
+        """
+        return {}, {}, self.__additionallogger
+
+    @override
+    def getLog(self, loggerjson: dict[str, str]) -> dict[str, str]:
+        """
+            Implements the `get_log` method, optionally passing the logger dictionary
+            to the next decorator to add more parameters. If no further decorator is
+            provided, it simply returns the current logger dictionary.
+
+            Args:
+                loggerjson (dict[str, str]):
+                    Dictionary representing the log message to be processed.
+
+            Returns:
+                dict[str, str]: Updated logger dictionary containing the required log parameters.
+        """
+        if self.__additionallogger is None:
+            return loggerjson
+        return self.__additionallogger.getLog(loggerjson)
+
+class LoggerWithTimeStamp(LoggerMessageDecorator):
+    """
+        Concrete implementation of the LoggerMessageDecorator interface.
+
+        This class implements the `get_log` method by adding a timestamp parameter
+        to the logger JSON and passing it to the next decorator, if provided, to
+        add additional parameters.
+
+        Attributes:
+            __additionalLogger (LoggerMessageDecorator):
+                Reference to another LoggerMessageDecorator instance, enabling
+                chaining of decorators to incrementally add parameters to the
+                logger JSON.
+
+            __localTimezone (timezone):
+                Timezone used for the timestamp in the logger JSON, representing
+                the user's desired local time.
+
+            __timestampformatter (LogTimestampFormatter):
+                Renders the timestamp in the requested `TimestampFormatEnum` format,
+                caching the part that only changes once per second.
+    """
+
+    def __init__(self, localtimezone : tzinfo = timezone.utc, additionallogger: LoggerMessageDecorator|None = None,
+                 timestampformat: TimestampFormatEnum = TimestampFormatEnum.DEFAULT) -> None:
+        super().__init__()
+        self.__additionallogger : LoggerMessageDecorator|None = additionallogger
+        self.__localtimezone = localtimezone
+        self.__timestampformatter : LogTimestampFormatter = LogTimestampFormatter(localtimezone, timestampformat)
+
+    def _compilestep(self) -> CompileStep:
+        """
+            Describes this decorator for `compileloggerdecorator`: the timestamp is
+            computed for every log.
+        """
+        return {}, {LogConstants.LOG_TIMESTAMP: self.__timestamp}, self.__additionallogger
+
+    def __timestamp(self, loggerjson: dict[str, str]) -> str:
+        """
+            Formats the creation time of a `LogRecord`, without reading the clock
+            again, or the current time for any other logger json.
+        """
+        if type(loggerjson) is LogRecord and loggerjson.timestampns:
+            return self.__timestampformatter.format(loggerjson.timestampns)
+        return self.__timestampformatter.now()
+    
+    @override
+    def getLog(self, loggerjson: dict[str, str]) -> dict[str, str]:
+        """
+            Implements the `get_log` method by adding a timestamp to the logger dictionary
+            and optionally passing it to the next decorator to include additional parameters.
+            If no further decorator is provided, the current logger dictionary is returned as-is.
+
+            Args:
+                loggerjson (dict[str, str]):
+                    Dictionary representing the log message to be processed.
+
+            Returns:
+                dict[str, str]: Updated logger dictionary containing the required log parameters.
+        """
+        loggerjson[LogConstants.LOG_TIMESTAMP] = self.__timestamp(loggerjson)
+        if self.__additionallogger is None:
+            return loggerjson
+        return self.__additionallogger.getLog(loggerjson)
+    
+class LoggerWithServiceName(LoggerMessageDecorator):
+    """
+        Concrete implementation of the LoggerMessageDecorator interface.
+
+        This class implements the `get_log` method by adding a `serviceName` parameter
+        to the logger JSON and passing it to the next decorator, if provided, to
+        add additional parameters.
+
+        Attributes:
+            __additionalLogger (LoggerMessageDecorator):
+                Reference to another LoggerMessageDecorator instance, enabling
+                chaining of decorators to incrementally add parameters to the
+                logger JSON.
+
+            __serviceName (str):
+                Name of the service provided by the caller, used to identify
+                which service is generating the log.
+    """
+    def __init__(self, serviceName : str, additionallogger: LoggerMessageDecorator|None = None) -> None:
+        super().__init__()
+        self.__additionallogger : LoggerMessageDecorator|None = additionallogger
+        self.__serviceName : str = serviceName
+
+    def _compilestep(self) -> CompileStep:
+        """
+            Describes this decorator for `compileloggerdecorator`: the service name
+            is the same for every log.
+        """
+        return {LogConstants.LOG_SERVICE_NAME: self.__serviceName}, {}, self.__additionallogger
+    
+    @override
+    def getLog(self, loggerjson: dict[str, str]) -> dict[str, str]:
+        """
+            Implements the `get_log` method by adding the servicename to the logger dictionary
+            and optionally passing it to the next decorator to include additional parameters.
+            If no further decorator is provided, the current logger dictionary is returned as-is.
+
+            Args:
+                loggerjson (dict[str, str]):
+                    Dictionary representing the log message to be processed.
+
+            Returns:
+                dict[str, str]: Updated logger dictionary containing the required log parameters.
+        """
+        loggerjson[LogConstants.LOG_SERVICE_NAME] = self.__serviceName
+        if self.__additionallogger is None:
+            return loggerjson
+        return self.__additionallogger.getLog(loggerjson)
+
+class CompiledLoggerDecorator(LoggerMessageDecorator):
+    """
+        Concrete implementation of the LoggerMessageDecorator interface produced by
+        `compileloggerdecorator`.
+
+        Walking a decorator chain costs one `getLog` call per link for every log,
+        although most links add fields that never change. A compiled decorator
+        adds the same fields in one step: the static fields with a single
+        `dict.update`, then every dynamic field (e.g. the timestamp) from its
+        callable. Decorators that can not be compiled, such as custom
+        implementations, are called through their `getLog` afterwards.
+
+        Attributes:
+            __staticfields (dict[str, str]): Fields that are the same for every log.
+            __dynamicfields (tuple[tuple[str, Callable[[dict[str, str]], str]], ...]):
+                Fields computed for every log, with the callable computing them
+                from the logger json.
+            __fallbacklogger (LoggerMessageDecorator | None): Rest of the chain
+                that could not be compiled.
+            __slotted (bool): Every field has a `LogRecord` slot, so the fields of
+                a `LogRecord` are assigned to its slots directly.
+            __staticslots (tuple[tuple[str, str], ...]): Static fields by slot.
+            __dynamicslots (tuple[tuple[str, Callable[[dict[str, str]], str]], ...]):
+                Dynamic fields by slot.
+    """
+    def __init__(self, staticfields: dict[str, str], dynamicfields: dict[str, Callable[[dict[str, str]], str]],
+                 fallbacklogger: LoggerMessageDecorator|None = None) -> None:
+        super().__init__()
+        self.__staticfields : dict[str, str] = dict(staticfields)
+        self.__dynamicfields : tuple[tuple[str, Callable[[dict[str, str]], str]], ...] = tuple(dynamicfields.items())
+        self.__fallbacklogger : LoggerMessageDecorator|None = fallbacklogger
+
+        # a LogRecord gets its fields assigned to its slots directly, if they all have one
+        fields = (*self.__staticfields, *dynamicfields)
+        self.__slotted : bool = all(key in LOG_RECORD_SLOTS for key in fields)
+        self.__staticslots : tuple[tuple[str, str], ...] = tuple(
+            (LOG_RECORD_SLOTS[key], value) for key, value in self.__staticfields.items() if self.__slotted)
+        self.__dynamicslots : tuple[tuple[str, Callable[[dict[str, str]], str]], ...] = tuple(
+            (LOG_RECORD_SLOTS[key], computefield) for key, computefield in self.__dynamicfields if self.__slotted)
+
+    def _compilestep(self) -> CompileStep:
+        """
+            Describes this decorator for `compileloggerdecorator`, so compiling twice is harmless.
+        """
+        return self.__staticfields, dict(self.__dynamicfields), self.__fallbacklogger
+
+    @override
+    def getLog(self, loggerjson: dict[str, str]) -> dict[str, str]:
+        """
+            Adds the static and dynamic fields of the compiled chain, then passes the
+            logger dictionary to the part of the chain that could not be compiled.
+
+            Args:
+                loggerjson (dict[str, str]):
+                    Dictionary representing the log message to be processed.
+
+            Returns:
+                dict[str, str]: Updated logger dictionary containing the required log parameters.
+        """
+        if self.__slotted and type(loggerjson) is LogRecord:
+            for slot, value in self.__staticslots:
+                setattr(loggerjson, slot, value)
+            for slot, computefield in self.__dynamicslots:
+                setattr(loggerjson, slot, computefield(loggerjson))
+        else:
+            loggerjson |= self.__staticfields
+            for key, computefield in self.__dynamicfields:
+                loggerjson[key] = computefield(loggerjson)
+        if self.__fallbacklogger is None:
+            return loggerjson
+        return self.__fallbacklogger.getLog(loggerjson)
+
+def compileloggerdecorator(loggerdecorator: LoggerMessageDecorator) -> CompiledLoggerDecorator:
+    """
+        Compiles a decorator chain into a single `CompiledLoggerDecorator`.
+
+        The chain is walked once, collecting the fields of every decorator that
+        describes itself through `_compilestep`. When a field is set by several
+        decorators, the one further down the chain wins, as it would when the
+        chain is walked. The first decorator without `_compilestep`, or whose
+        `getLog` is overridden by a subclass that kept the inherited
+        `_compilestep`, ends the walk and is kept, with the rest of its chain,
+        as fallback.
+
+        Args:
+            loggerdecorator (LoggerMessageDecorator): First decorator of the chain.
+
+        Returns:
+            CompiledLoggerDecorator: Decorator adding the same fields as the chain.
+    """
+    staticfields : dict[str, str] = {}
+    dynamicfields : dict[str, Callable[[dict[str, str]], str]] = {}
+    current : LoggerMessageDecorator|None = loggerdecorator
+    while current is not None:
+        compilestep = getattr(current, "_compilestep", None)
+        if compilestep is None or not describesgetlog(type(current)):
+            break
+        stepstatic, stepdynamic, current = compilestep()
+        for key, value in stepstatic.items():
+            dynamicfields.pop(key, None)
+            staticfields[key] = value
+        for key, computefield in stepdynamic.items():
+            staticfields.pop(key, None)
+            dynamicfields[key] = computefield
+    return CompiledLoggerDecorator(staticfields, dynamicfields, current)
+
+def describesgetlog(decoratortype: type) -> bool:
+    """
+        Returns True if the `_compilestep` of `decoratortype` describes its
+        `getLog`, i.e. both are defined by the same class.
+    """
+    for cls in decoratortype.__mro__:
+        if "_compilestep" in cls.__dict__:
+            return cls.__dict__.get("getLog") is decoratortype.getLog
+    return False
@@ -0,0 +1,19 @@
+from enum import Enum
+
+# queue overflow enum
+class OverflowPolicyEnum(Enum):
+    """
+        Defines what a bounded log queue does with a new log record when it is full.
+
+        Attributes:
+            BLOCK: Block the caller until there is room or the block timeout
+                expires, then drop the new record.
+            DROP_NEWEST: Drop the new record immediately.
+            DROP_OLDEST: Drop the oldest queued record to make room for the new one.
+            DROP_BELOW_LEVEL: Drop the new record if its severity is below the
+                configured level, otherwise block like `BLOCK`.
+    """
+    BLOCK = 'BLOCK'
+    DROP_NEWEST = 'DROP_NEWEST'
+    DROP_OLDEST = 'DROP_OLDEST'
+    DROP_BELOW_LEVEL = 'DROP_BELOW_LEVEL'
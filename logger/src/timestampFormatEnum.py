@@ -0,0 +1,19 @@
+from enum import Enum
+
+# timestamp format enum
+class TimestampFormatEnum(Enum):
+    """
+        Defines how `LoggerWithTimeStamp` renders the time a log was created.
+
+        Attributes:
+            DEFAULT: `str(datetime)` format, e.g. `2026-01-29 12:02:41.641322+00:00`.
+                Microseconds are left out when they are zero.
+            ISO8601: ISO-8601 with microseconds, e.g. `2026-01-29T12:02:41.641322+00:00`.
+            RFC3339: RFC 3339 with microseconds, using `Z` for UTC,
+                e.g. `2026-01-29T12:02:41.641322Z`.
+            EPOCH_NS: Nanoseconds since the Unix epoch, e.g. `1769688161641322000`.
+    """
+    DEFAULT = 'DEFAULT'
+    ISO8601 = 'ISO8601'
+    RFC3339 = 'RFC3339'
+    EPOCH_NS = 'EPOCH_NS'
@@ -1,254 +1,1528 @@
-from typing import Protocol, override
-from collections import deque
-import threading
-
-from .logConstants import LogConstants
-import atexit
-
-class WriteLogMessage(Protocol):
-    """
-        Defines an interface for writing logs to a storage backend.
-
-        Implementations of this interface are responsible for persisting log
-        records to a specific storage mechanism (e.g., file system, database,
-        or remote logging service).
-    """
-    def writelog(self, loggerjson: dict[str, str]) -> None:
-        """
-            Persists a log record to the underlying storage.
-
-            The implementation of this method is responsible for writing the
-            provided log data to the configured storage backend.
-
-            Args:
-                logger_json (dict[str, str]): Dictionary containing log metadata
-                    and the actual log message.
-        """
-        ...
-
-class FileWriterLog(WriteLogMessage):
-    """
-        Synchronous file-based implementation of the log writer interface.
-
-        This implementation persists log records directly to the file system
-        in a synchronous manner. While it provides reliable log storage, it may
-        negatively impact application performance due to blocking I/O.
-
-        This implementation is best suited for applications with low log volume
-        or scenarios where log reliability is more important than performance.
-
-        Attributes:
-            __logfilepath (str): File path provided by the user where logs should be stored.
-            __logconstant (list[str]): Sequence of log fields defining the order in which
-                log data is written to the file.
-            __lock (threading.Lock): Lock to ensure thread-safe writing when multiple
-                threads attempt to write to the same file simultaneously.
-    """
-    def __init__(self, logfilepath: str) -> None:
-        super().__init__()
-        self.__logfilepath : str = logfilepath
-        self.__logsequence : list[str] = [LogConstants.LOG_SERVICE_NAME, LogConstants.LOG_FUNCTION_NAME, LogConstants.LOG_TIMESTAMP, LogConstants.LOG_LEVEL, LogConstants.LOG_MESSAGE]
-        self.__lock = threading.Lock()
-    
-    @override
-    def writelog(self, loggerjson: dict[str, str])-> None:
-        """
-            Persist a log record to the file storage at the configured file path.
-
-            This method formats the provided `logger_json` using the internal
-            log sequence and attempts to write it to the file specified by `__logfilepath`.
-            Thread safety is ensured using an internal lock to prevent concurrent
-            write conflicts when multiple threads attempt to log simultaneously.
-
-            If an I/O error occurs during writing, it is caught and printed
-            to standard output instead of raising an exception, allowing
-            the application to continue running.
-
-            Args:
-                logger_json (dict[str, str]): Dictionary containing log metadata
-                    and the actual log message.
-        """
-        message = self.__preparemsg(loggerjson)
-        with self.__lock:
-            try:
-                with open(self.__logfilepath, "a") as logfile: 
-                    logfile.write(message)
-            except Exception as e:
-                print(f"[FileWriterLog] Failed to write log: {e}")
-
-    
-    def __preparemsg(self, loggerjson: dict[str, str]) -> str:
-        """
-            Prepare a formatted log string from the provided log dictionary.
-
-            This method uses `logger_json` and the internal `__logsequence` to
-            construct the log string in the correct order for writing to the file.
-
-            Args:
-                logger_json (dict[str, str]): Dictionary containing log metadata
-                    and the actual log message.
-
-            Returns:
-                str: Formatted log string ready to be written to the log file.
-        """
-        parts = [loggerjson[key] for key in self.__logsequence if key in loggerjson]
-        message = ' || '.join(parts) + '\n'
-        return message
-
-# give logs in a queue to user to use themself any why they want
-class WriteLogsInQueue(WriteLogMessage):
-    """
-        Synchronous implementation of the log writer interface using a user-provided queue.
-
-        This implementation writes log records into a queue supplied by the user.
-        The user can then consume the queue to transfer logs into any storage
-        mechanism according to their own implementation.
-
-        Attributes:
-            __logqueue (deque[dict[str, str]]): User-provided queue to store log records.
-            __lock (threading.Lock): Lock to ensure thread-safe writing when multiple
-                threads attempt to write to the same queue simultaneously.
-
-        Note:
-            Be mindful of memory constraints, as the queue stores logs in memory
-            before they are processed.
-    """
-    def __init__(self, logqueue : deque[dict[str, str]]) -> None:
-        super().__init__()
-        self.__logqueue : deque[dict[str, str]] = logqueue
-        self.__lock = threading.Lock()
-    
-    @override
-    def writelog(self, loggerjson: dict[str, str]) -> None:
-        with self.__lock:
-            self.__logqueue.append(loggerjson)
-
-
-class AsyncFileWriterLog(WriteLogMessage):
-    """
-        Asynchronous file-based implementation of the log writer interface.
-
-        This implementation persists log records to the file system asynchronously
-        using an internal queue. Log entries are added to the queue and processed
-        by a background daemon thread, allowing the application to continue
-        without blocking on I/O operations. 
-        
-        While this improves performance,users should be aware of memory constraints 
-        since the queue temporarily stores logs before writing them to disk.
-
-        Attributes:
-            __logfilepath (str): File path provided by the user where logs should be stored.
-            __logconstant (list[str]): Sequence of log fields defining the order in which
-                log data is written to the file.
-            __logdeque (deque[dict[str, str]]): Internal queue storing logs before they
-                are written to the file.
-            _stop_daemon_work (bool): Flag indicating that the daemon thread should
-                stop processing logs (used during flushing at exit).
-            __condition (threading.Condition): Condition variable used for locking
-                and waiting when the queue is empty to reduce resource usage.
-            __process_log_thread (threading.Thread): Daemon thread that continuously
-                processes logs from the queue as they arrive.
-    """
-    def __init__(self, logfilepath: str) -> None:
-        super().__init__()
-        self.__logfilepath : str = logfilepath
-        self.__logsequence : list[str] = [LogConstants.LOG_SERVICE_NAME, LogConstants.LOG_FUNCTION_NAME, LogConstants.LOG_TIMESTAMP, LogConstants.LOG_LEVEL, LogConstants.LOG_MESSAGE]
-        self.__logdeque = deque()
-
-        self.__stop_daemon_work : bool = False
-        atexit.register(self.__flush_and_exit)
-
-        self.__condition = threading.Condition()
-        self.__process_log_thread = threading.Thread(target=self.__processlog, daemon=True)
-        self.__process_log_thread.start()
-        
-    @override
-    def writelog(self, loggerjson: dict[str, str])-> None:
-        """
-            Writes the logs in the queue and notify the deamon thread to process the incoming logs.
-            
-            Args:
-                logger_json (dict[str, str]): Dictionary containing log metadata and the actual log message.
-        """
-        with self.__condition:
-            self.__logdeque.append(loggerjson)
-            self.__condition.notify()  # wake up the thread
-
-    def __processlog(self) -> None:
-        """
-            Waits for notification using the internal condition variable and writes
-            queued log records to the file.
-
-            This method is typically run by a background thread that continuously
-            processes logs from the internal queue as they become available.
-        """
-        while True:
-            with self.__condition:
-                while not self.__logdeque and not self.__stop_daemon_work:
-                    self.__condition.wait(timeout=5)  # wait until a log is added
-                if self.__stop_daemon_work:
-                    return
-            self.__writeloginactualfile()
-            
-    def __writeloginactualfile(self) -> None:
-        """
-            Collects logs from the internal queue and uses the `prepare_log_string`
-            method to format them before writing to the file.
-
-            This method ensures that all queued log records are processed in order
-            and written to the file according to the defined log sequence.
-        """
-        logs_to_write = []
-        with self.__condition:
-            while self.__logdeque:
-                log_json = self.__logdeque.popleft()
-                logs_to_write.append(log_json)
-        
-        messages : list[str] = [self.__preparemsg(log_json) for log_json in logs_to_write]
-        self.__write_to_file(messages)
-
-    def __write_to_file(self, messages: list[str]) -> None:
-        """
-            Writes log records to the file and prints an error message if an I/O error occurs.
-
-            This method attempts to persist the log entry to the configured file path.
-            If an IOError or file access error occurs, it is caught and printed to
-            the standard output to prevent the application from crashing.
-        """
-        try:
-            with open(self.__logfilepath, "a") as logfile:
-                logfile.writelines(messages)
-        except Exception as e:
-            print(f"[AsyncFileWriterLog] Failed to write log: {e}")
-
-    def __flush_and_exit(self):
-        """
-            Flushes any remaining log records from the queue to the file upon application exit.
-
-            This method ensures that all logs stored in the internal queue are written
-            to the file before the application terminates, preventing data loss.
-        """
-        with self.__condition:
-            self.__stop_daemon_work = True
-            self.__condition.notify_all()
-
-        while self.__logdeque:
-            self.__writeloginactualfile()
-
-    def __preparemsg(self, loggerjson: dict[str, str]) -> str:
-        """
-            Prepare a formatted log string from the provided log dictionary.
-
-            This method uses `logger_json` and the internal `__logsequence` to
-            construct the log string in the correct order for writing to the file.
-
-            Args:
-                logger_json (dict[str, str]): Dictionary containing log metadata
-                    and the actual log message.
-
-            Returns:
-                str: Formatted log string ready to be written to the log file.
-        """
-        parts = [loggerjson[key] for key in self.__logsequence if key in loggerjson]
-        message = ' || '.join(parts) + '\n'
-        return message
\ No newline at end of file
+from typing import Protocol, Callable, Iterable, override
+from collections import deque
+from types import TracebackType
+import itertools
+import threading
+import traceback
+import sys
+import mmap
+import errno
+import asyncio
+import time
+import os
+
+from .logConstants import LogConstants
+from .logLevelEnum import LoglevelEnum, LOGLEVEL_SEVERITY
+from .logFileHandle import LogFileHandle
+from .logLifecycle import LogLifecycleHooks
+from .logFormatter import LogFormatter, PipeLogFormatter
+from .logRotation import LogRotationPolicy
+from .overflowPolicyEnum import OverflowPolicyEnum
+from .logMessage import renderlogmessage
+from .logRecord import LogRecord
+from .logMetrics import LogSinkMetrics
+from .fsyncPolicyEnum import FsyncPolicyEnum
+from .logDurability import LogAck, PendingLogRecord, WriteAheadLog, WAL_COMPACT_SIZE
+from .logCoalescing import LogCoalescer, CoalescedLogRecord
+from .binaryLogFormat import binarylogdatalength
+from .loggerException import LoggerException, LoggerExceptionMessageConstant
+
+class WriteLogMessage(Protocol):
+    """
+        Defines an interface for writing logs to a storage backend.
+
+        Implementations of this interface are responsible for persisting log
+        records to a specific storage mechanism (e.g., file system, database,
+        or remote logging service).
+
+        An implementation that sets the class attribute `defersmessageformatting`
+        to True receives lazily formatted messages as `LazyLogMessage` and must
+        render them (see `renderlogmessage`) before writing. Every other
+        implementation only ever receives strings.
+
+        An implementation that sets the class attribute `acceptslogrecord` to True
+        receives the compact `LogRecord` mapping built by the logger, others
+        receive a plain dictionary.
+    """
+    def writelog(self, loggerjson: dict[str, str]) -> None:
+        """
+            Persists a log record to the underlying storage.
+
+            The implementation of this method is responsible for writing the
+            provided log data to the configured storage backend.
+
+            Args:
+                logger_json (dict[str, str]): Dictionary containing log metadata
+                    and the actual log message.
+        """
+        ...
+
+class FileWriterLog(WriteLogMessage):
+    """
+        Synchronous file-based implementation of the log writer interface.
+
+        This implementation persists log records directly to the file system
+        in a synchronous manner. While it provides reliable log storage, it may
+        negatively impact application performance due to blocking I/O.
+
+        This implementation is best suited for applications with low log volume
+        or scenarios where log reliability is more important than performance.
+
+        By default the file is opened and closed for every record. Passing
+        `keepfileopen=True` keeps one buffered file open instead, which is flushed
+        every `flusheveryrecords` records and/or every `flusheveryms` milliseconds.
+        Call `flush()` or `close()` to push buffered records to disk explicitly.
+
+        Passing a `LogRotationPolicy` as `rotation` rolls the file over by size
+        and/or time interval and keeps the configured number of backups.
+
+        Records are written as ` || ` separated fields by default. Pass a
+        `LogFormatter` such as `JsonLinesLogFormatter` as `formatter` to change it.
+
+        Set `processsafe=True` when several processes (e.g. gunicorn or
+        multiprocessing workers) write to the same file: every record, or every
+        flushed buffer when the file is kept open, is appended atomically.
+
+        `fsyncpolicy` decides when written records are forced to the disk, see
+        `FsyncPolicyEnum`. `writelogwithack` writes a record and fsyncs it right
+        away unless the policy is `FsyncPolicyEnum.NEVER`.
+
+        `formatter` and `writeformatted` let a `RoutingWriterLog` format a record
+        once for every writer sharing the same format.
+
+        Passing a `LogSinkMetrics` as `metrics` counts the accepted, written and
+        failed records and the write latency, see `LogMetricsRegistry`.
+
+        Attributes:
+            __logfilepath (str): File path provided by the user where logs should be stored.
+            __formatter (LogFormatter): Serializes every log record into the line written
+                to the file, `PipeLogFormatter` by default.
+            __fsyncpolicy (FsyncPolicyEnum): When written records are fsynced.
+            __metrics (LogSinkMetrics | None): Metrics of the writer, if any.
+            __logfile (LogFileHandle): Handle owning the file descriptor and its flush
+                policy. It serializes writes, so multiple threads can log safely.
+    """
+
+    # records are formatted straight from the compact LogRecord
+    acceptslogrecord : bool = True
+
+    def __init__(self, logfilepath: str, keepfileopen: bool = False, buffersize: int = -1,
+                 flusheveryrecords: int = 1, flusheveryms: float|None = None,
+                 rotation: LogRotationPolicy|None = None, processsafe: bool = False,
+                 formatter: LogFormatter|None = None, fsyncpolicy: FsyncPolicyEnum = FsyncPolicyEnum.NEVER,
+                 fsynceveryrecords: int = 100, fsynceveryms: float = 1000,
+                 metrics: LogSinkMetrics|None = None) -> None:
+        super().__init__()
+        self.__logfilepath : str = logfilepath
+        self.__formatter : LogFormatter = formatter if formatter is not None else PipeLogFormatter()
+        self.__fsyncpolicy : FsyncPolicyEnum = fsyncpolicy
+        self.__metrics : LogSinkMetrics|None = metrics
+        self.__logfile : LogFileHandle = LogFileHandle(logfilepath, keepfileopen=keepfileopen, buffersize=buffersize,
+                                                       flusheveryrecords=flusheveryrecords, flusheveryms=flusheveryms,
+                                                       rotation=rotation, processsafe=processsafe,
+                                                       fsyncpolicy=fsyncpolicy, fsynceveryrecords=fsynceveryrecords,
+                                                       fsynceveryms=fsynceveryms)
+    
+    @override
+    def writelog(self, loggerjson: dict[str, str])-> None:
+        """
+            Persist a log record to the file storage at the configured file path.
+
+            This method formats the provided `logger_json` using the internal
+            log sequence and attempts to write it to the file specified by `__logfilepath`.
+            Thread safety is ensured by the file handle lock to prevent concurrent
+            write conflicts when multiple threads attempt to log simultaneously.
+
+            If an I/O error occurs during writing, it is caught and printed
+            to standard output instead of raising an exception, allowing
+            the application to continue running.
+
+            Args:
+                logger_json (dict[str, str]): Dictionary containing log metadata
+                    and the actual log message.
+        """
+        message = self.__preparemsg(loggerjson)
+        if self.__metrics is not None:
+            self.__writemeasured(message, 1)
+            return
+        try:
+            self.__logfile.write(message)
+        except Exception as e:
+            print(f"[FileWriterLog] Failed to write log: {e}")
+
+    @property
+    def formatter(self) -> LogFormatter:
+        """
+            Formatter serializing the records written to the file.
+        """
+        return self.__formatter
+
+    def writeformatted(self, message: str|bytes, records: int = 1) -> None:
+        """
+            Writes records already serialized by `formatter`.
+
+            Args:
+                message (str | bytes): One or more formatted records.
+                records (int): Number of records in `message`.
+        """
+        if self.__metrics is not None:
+            self.__writemeasured(message, records)
+            return
+        try:
+            self.__logfile.write(message, records)
+        except Exception as e:
+            print(f"[FileWriterLog] Failed to write log: {e}")
+
+    def __writemeasured(self, message: str|bytes, records: int) -> None:
+        """
+            Writes formatted records and reports them to the metrics.
+        """
+        metrics : LogSinkMetrics = self.__metrics # type: ignore[assignment]
+        metrics.addaccepted(records)
+        started = time.perf_counter()
+        try:
+            self.__logfile.write(message, records)
+        except Exception as e:
+            metrics.observewrite(records, time.perf_counter() - started, failed=True)
+            print(f"[FileWriterLog] Failed to write log: {e}")
+            return
+        metrics.observewrite(records, time.perf_counter() - started)
+
+    def writelogwithack(self, loggerjson: dict[str, str]) -> LogAck:
+        """
+            Writes a log record and returns its acknowledgement, which is already
+            complete unless the write or the fsync failed.
+        """
+        ack = LogAck()
+        metrics = self.__metrics
+        if metrics is not None:
+            metrics.addaccepted()
+        started = time.perf_counter()
+        try:
+            # a file opened per write is closed again before sync() could reach it
+            self.__logfile.write(self.__preparemsg(loggerjson), sync=self.__fsyncpolicy is not FsyncPolicyEnum.NEVER)
+            self.__logfile.flush()
+        except Exception as e:
+            if metrics is not None:
+                metrics.observewrite(1, time.perf_counter() - started, failed=True)
+            print(f"[FileWriterLog] Failed to write log: {e}")
+            return ack
+        if metrics is not None:
+            metrics.observewrite(1, time.perf_counter() - started)
+        ack.complete()
+        return ack
+
+    def flush(self) -> None:
+        """
+            Flushes records buffered by a kept-open log file to the operating system.
+        """
+        try:
+            self.__logfile.flush()
+        except Exception as e:
+            print(f"[FileWriterLog] Failed to flush log: {e}")
+
+    def close(self) -> None:
+        """
+            Flushes and closes a kept-open log file. Logging afterwards reopens it.
+        """
+        try:
+            self.__logfile.close()
+        except Exception as e:
+            print(f"[FileWriterLog] Failed to close log: {e}")
+
+    def __enter__(self) -> 'FileWriterLog':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __preparemsg(self, loggerjson: dict[str, str]) -> str:
+        """
+            Prepare a formatted log string from the provided log dictionary.
+
+            This method uses `logger_json` and the configured `__formatter` to
+            construct the log string in the correct order for writing to the file.
+
+            Args:
+                logger_json (dict[str, str]): Dictionary containing log metadata
+                    and the actual log message.
+
+            Returns:
+                str: Formatted log string ready to be written to the log file.
+        """
+        return self.__formatter.format(loggerjson)
+
+# give logs in a queue to user to use themself any why they want
+class WriteLogsInQueue(WriteLogMessage):
+    """
+        Synchronous implementation of the log writer interface using a user-provided queue.
+
+        This implementation writes log records into a queue supplied by the user.
+        The user can then consume the queue to transfer logs into any storage
+        mechanism according to their own implementation.
+
+        Attributes:
+            __logqueue (deque[dict[str, str]]): User-provided queue to store log records.
+            __lock (threading.Lock): Lock to ensure thread-safe writing when multiple
+                threads attempt to write to the same queue simultaneously.
+
+        Note:
+            Be mindful of memory constraints, as the queue stores logs in memory
+            before they are processed.
+    """
+    def __init__(self, logqueue : deque[dict[str, str]]) -> None:
+        super().__init__()
+        self.__logqueue : deque[dict[str, str]] = logqueue
+        self.__lock = threading.Lock()
+    
+    @override
+    def writelog(self, loggerjson: dict[str, str]) -> None:
+        with self.__lock:
+            self.__logqueue.append(loggerjson)
+
+
+class AsyncFileWriterLog(WriteLogMessage):
+    """
+        Asynchronous file-based implementation of the log writer interface.
+
+        This implementation persists log records to the file system asynchronously
+        using an internal queue. Log entries are added to the queue and processed
+        by a background daemon thread, allowing the application to continue
+        without blocking on I/O operations. 
+        
+        While this improves performance,users should be aware of memory constraints 
+        since the queue temporarily stores logs before writing them to disk.
+
+        Passing a `LogRotationPolicy` as `rotation` rolls the file over by size
+        and/or time interval. Rollovers happen on the daemon thread between batches.
+
+        Records are written as ` || ` separated fields by default. Pass a
+        `LogFormatter` such as `JsonLinesLogFormatter` as `formatter` to change it.
+
+        Set `processsafe=True` when several processes write to the same file: every
+        batch drained by the daemon thread is appended atomically as a whole. A
+        forked child process restarts the daemon thread with an empty queue.
+
+        Setting `maxqueuesize` bounds the queue. When it is full, `overflowpolicy`
+        decides whether the caller blocks for up to `blocktimeout` seconds, or
+        whether the newest, the oldest or records below `droplevel` are dropped.
+        The number of dropped records is available through `droppedcount`.
+
+        Asyncio code can use `awritelog` (or `Logger.alog`), which never blocks the
+        event loop: when the caller would have to wait for room in the queue, the
+        calling task is suspended instead.
+
+        Messages logged with a template and arguments, or as a callable, are
+        queued unformatted and rendered on the daemon thread.
+
+        Producers of an unbounded queue never take a lock: `deque.append` is
+        atomic, so appending a record is the whole hot path. The daemon thread is
+        only woken once `wakeupthreshold` records are waiting, otherwise it drains
+        the queue every `maxlatencyms` milliseconds, so a record waits at most that
+        long before it is written. All producers append to the same deque, which
+        keeps records in the order they were logged.
+
+        The daemon thread group-commits the queue: the file stays open, and every
+        batch of up to `maxbatchrecords` records or `maxbatchbytes` characters is
+        formatted into one buffer and written with a single write. Under load the
+        daemon lingers for up to `lingerms` milliseconds to let a batch fill up.
+        The batch it waits for follows the observed arrival rate (the records
+        expected to arrive within `lingerms`), so light traffic is written right
+        away while bursts are coalesced into few large writes.
+
+        `fsyncpolicy` decides when written batches are forced to the disk, see
+        `FsyncPolicyEnum`; a batch is always fsynced as a whole (group fsync).
+
+        Setting `coalescewindow` collapses identical records (same service name,
+        function id, level and message) drained in the same batch into the first
+        of them, written with the repeat count and the timestamps of the first
+        and the last copy, see `LogCoalescer`. The window remembers that many
+        distinct records and forgets the least recently seen one first. Under a
+        flood of identical errors this writes one line per batch instead of
+        thousands.
+
+        Passing `walpath` makes queued records survive the process being killed
+        (SIGKILL, OOM kill), where `atexit` never runs: every record is formatted on
+        the caller's thread and appended to the write-ahead log before it is queued,
+        see `WriteAheadLog`. Records left in the write-ahead log by a killed process
+        are written to the log file when the next writer with the same `walpath`
+        starts. Producers then take the queue lock, so this mode trades some
+        throughput for durability.
+
+        `writelogwithack` queues a record and returns a `LogAck`, completed once
+        the batch holding the record is written and, unless the fsync policy is
+        `FsyncPolicyEnum.NEVER`, fsynced. One fsync acknowledges the whole batch.
+
+        Passing a `LogSinkMetrics` as `metrics` counts the accepted, dropped,
+        written and failed records, the queue depth and its high-water mark, the
+        batch sizes, the write latency and the drain lag, see `LogMetricsRegistry`.
+
+        `flush(timeout)` blocks until every record queued before the call is
+        written, and `close(timeout)` drains the queue, stops the daemon thread and
+        closes the file; the writer can also be used as a context manager. Only
+        one thread ever drains the queue at a time. If the timeout expires first,
+        `close` reports how many records were left undrained; with a write-ahead
+        log they are replayed on the next start. Records logged after `close` are
+        written by the exit handler.
+
+        Attributes:
+            __logfilepath (str): File path provided by the user where logs should be stored.
+            __logfile (LogFileHandle): Handle writing the batches and rotating the file.
+            __formatter (LogFormatter): Serializes every log record into the line written
+                to the file, `PipeLogFormatter` by default.
+            __formatbatch (Callable | None): `formatbatch` of a formatter encoding whole
+                batches at once, such as `BinaryLogFormatter`.
+            __joiner (str | bytes): Joins the formatted records of a batch, bytes for a
+                binary formatter.
+            __logdeque (deque[dict[str, str]]): Internal queue storing logs before they
+                are written to the file.
+            _stop_daemon_work (bool): Flag telling the daemon thread to drain the queue
+                one last time and stop (used by `close` and at exit).
+            __drainlock (threading.Lock): Held by the thread draining the queue, so the
+                daemon thread and `close` never drain it concurrently.
+            __condition (threading.Condition): Lock making the capacity check and the
+                append atomic for a bounded queue.
+            __notfull (threading.Condition): Condition sharing the queue lock, used by
+                producers waiting for room in a bounded queue.
+            __wakeup (threading.Event): Set by a producer when `__wakeupthreshold`
+                records are waiting, to wake the daemon thread before its deadline.
+            __wakeupthreshold (int): Number of queued records waking the daemon thread.
+            __maxlatency (float): Seconds the daemon thread sleeps before draining
+                records that did not reach the threshold.
+            __wakeupat (int): Queue length at which producers wake the daemon thread,
+                lowered to the expected batch size while the daemon lingers.
+            __maxbatchrecords (int): Maximum number of records written at once.
+            __maxbatchbytes (int): Maximum size of one write, in characters.
+            __linger (float): Seconds the daemon waits for a batch to fill up.
+            __arrivalrate (float): Moving average of the records queued per second.
+            __lastdrain (float): Monotonic time of the last drain.
+            __maxqueuesize (int): Maximum number of queued records, 0 means unbounded.
+            __overflowpolicy (OverflowPolicyEnum): What to do when the queue is full.
+            __blocktimeout (float | None): Seconds a producer may block on a full queue,
+                None blocks until there is room.
+            __dropseverity (int): Severity below which records are dropped by
+                `OverflowPolicyEnum.DROP_BELOW_LEVEL`.
+            __droppedcount (int): Number of records dropped because the queue was full.
+            __failedwrites (int): Number of batches whose write or fsync failed.
+            __fsyncpolicy (FsyncPolicyEnum): When written batches are fsynced.
+            __coalescer (LogCoalescer | None): Collapses identical records of a batch,
+                None unless `coalescewindow` is set.
+            __metrics (LogSinkMetrics | None): Metrics of the writer, if any.
+            __wal (WriteAheadLog | None): Write-ahead log records are spilled to, if any.
+            __lastsequence (int): Sequence number of the last acknowledged or spilled
+                record, guarded by the queue lock.
+            __process_log_thread (threading.Thread): Daemon thread that continuously
+                processes logs from the queue as they arrive.
+    """
+
+    # lazy messages are rendered on the daemon thread instead of the caller's thread
+    defersmessageformatting : bool = True
+
+    # queued records are kept as compact LogRecord objects
+    acceptslogrecord : bool = True
+
+    def __init__(self, logfilepath: str, rotation: LogRotationPolicy|None = None, maxqueuesize: int = 0,
+                 overflowpolicy: OverflowPolicyEnum = OverflowPolicyEnum.BLOCK, blocktimeout: float|None = 1.0,
+                 droplevel: LoglevelEnum = LoglevelEnum.WARNING, processsafe: bool = False,
+                 formatter: LogFormatter|None = None, wakeupthreshold: int = 512,
+                 maxlatencyms: float = 50, maxbatchrecords: int = 4096,
+                 maxbatchbytes: int = 1024 * 1024, lingerms: float = 2,
+                 fsyncpolicy: FsyncPolicyEnum = FsyncPolicyEnum.NEVER, fsynceveryrecords: int = 100,
+                 fsynceveryms: float = 1000, walpath: str|None = None, coalescewindow: int = 0,
+                 metrics: LogSinkMetrics|None = None) -> None:
+        super().__init__()
+        if walpath is not None and processsafe:
+            raise LoggerException(LoggerExceptionMessageConstant.PROCESS_SAFE_WAL_EXCEPTION)
+        self.__logfilepath : str = logfilepath
+        self.__formatter : LogFormatter = formatter if formatter is not None else PipeLogFormatter()
+        self.__formatbatch : Callable[[list[dict[str, str]]], bytes]|None = getattr(self.__formatter, "formatbatch", None)
+        self.__joiner : str|bytes = b'' if getattr(self.__formatter, "binary", False) is True else ''
+        self.__fsyncpolicy : FsyncPolicyEnum = fsyncpolicy
+        self.__coalescer : LogCoalescer|None = LogCoalescer(coalescewindow) if coalescewindow > 0 else None
+        self.__metrics : LogSinkMetrics|None = metrics
+        # the file stays open and is flushed once per batch, every batch is a single write
+        self.__logfile : LogFileHandle = LogFileHandle(logfilepath, keepfileopen=True, rotation=rotation,
+                                                       processsafe=processsafe, fsyncpolicy=fsyncpolicy,
+                                                       fsynceveryrecords=fsynceveryrecords, fsynceveryms=fsynceveryms)
+        self.__logdeque = deque()
+        if metrics is not None:
+            metrics.setqueuedepth(lambda: len(self.__logdeque))
+        self.__lastsequence : int = 0
+        self.__wal : WriteAheadLog|None = None
+        if walpath is not None:
+            self.__wal = WriteAheadLog(walpath)
+            self.__replaywal(self.__wal)
+
+        self.__maxqueuesize : int = maxqueuesize
+        self.__overflowpolicy : OverflowPolicyEnum = overflowpolicy
+        self.__blocktimeout : float|None = blocktimeout
+        self.__dropseverity : int = droplevel.severity
+        self.__droppedcount : int = 0
+        self.__failedwrites : int = 0
+        self.__wakeupthreshold : int = max(1, wakeupthreshold)
+        self.__maxlatency : float = maxlatencyms / 1000
+        self.__maxbatchrecords : int = max(1, maxbatchrecords)
+        self.__maxbatchbytes : int = max(1, maxbatchbytes)
+        self.__linger : float = lingerms / 1000
+
+        self.__stop_daemon_work : bool = False
+        LogLifecycleHooks.registeratexit(self.__flush_and_exit)
+
+        self.__startdaemon()
+        LogLifecycleHooks.registerafterfork(self.__restartafterfork)
+        
+    @override
+    def writelog(self, loggerjson: dict[str, str])-> None:
+        """
+            Writes the logs in the queue and notify the deamon thread to process the incoming logs.
+            
+            Args:
+                logger_json (dict[str, str]): Dictionary containing log metadata and the actual log message.
+        """
+        if self.__metrics is not None:
+            self.__metrics.addaccepted()
+        if self.__wal is not None:
+            self.__enqueuepending(loggerjson, None)
+            return
+
+        logdeque = self.__logdeque
+        if not self.__maxqueuesize:
+            # lock free: deque.append is atomic, the daemon is only woken for a full batch
+            logdeque.append(loggerjson)
+            if len(logdeque) >= self.__wakeupat and not self.__wakeup.is_set():
+                self.__wakeup.set()
+            return
+
+        with self.__condition:
+            if len(logdeque) >= self.__maxqueuesize:
+                if not self.__makeroom(loggerjson):
+                    self.__countdropped()
+                    return
+            logdeque.append(loggerjson)
+        if len(logdeque) >= self.__wakeupat and not self.__wakeup.is_set():
+            self.__wakeup.set()
+
+    def writelogwithack(self, loggerjson: dict[str, str]) -> LogAck:
+        """
+            Queues a log record and returns its acknowledgement.
+
+            The acknowledgement completes once the record is written (and fsynced,
+            see the fsync policy). It never completes if the record was dropped
+            because the bounded queue was full, or if writing it failed.
+
+            Args:
+                logger_json (dict[str, str]): Dictionary containing log metadata and the actual log message.
+
+            Returns:
+                LogAck: Acknowledgement to wait on.
+        """
+        if self.__metrics is not None:
+            self.__metrics.addaccepted()
+        ack = LogAck()
+        self.__enqueuepending(loggerjson, ack)
+        return ack
+
+    def __enqueuepending(self, loggerjson: dict[str, str], ack: LogAck|None) -> None:
+        """
+            Queues a record with a sequence number, spilling it to the write-ahead log
+            first if there is one. Numbering, spilling and appending happen under the
+            queue lock, so the queue and the write-ahead log keep the same order.
+        """
+        wal = self.__wal
+        message = self.__preparemsg(loggerjson) if wal is not None else None
+        logdeque = self.__logdeque
+        with self.__condition:
+            if self.__maxqueuesize and len(logdeque) >= self.__maxqueuesize:
+                if not self.__makeroom(loggerjson):
+                    self.__countdropped()
+                    return
+            self.__lastsequence += 1
+            sequence = self.__lastsequence
+            if wal is not None:
+                try:
+                    wal.append(sequence, message) # type: ignore[arg-type]
+                except Exception as e:
+                    print(f"[AsyncFileWriterLog] Failed to spill log: {e}")
+            if ack is not None:
+                ack.sequence = sequence
+            logdeque.append(PendingLogRecord(sequence, loggerjson if message is None else None, message, ack))
+        if len(logdeque) >= self.__wakeupat and not self.__wakeup.is_set():
+            self.__wakeup.set()
+
+    def __replaywal(self, wal: WriteAheadLog) -> None:
+        """
+            Writes the records a killed process left in the write-ahead log to the
+            log file, then empties the write-ahead log.
+        """
+        pending, self.__lastsequence = wal.recover()
+        try:
+            if pending:
+                if self.__joiner == '':
+                    self.__logfile.write(b''.join(pending).decode('utf-8', errors='replace'), len(pending))
+                else:
+                    self.__logfile.write(b''.join(pending), len(pending))
+                self.__logfile.sync()
+            wal.checkpoint(self.__lastsequence)
+            wal.reset()
+        except Exception as e:
+            print(f"[AsyncFileWriterLog] Failed to replay write-ahead log: {e}")
+
+    @property
+    def droppedcount(self) -> int:
+        """
+            Number of log records dropped because the bounded queue was full.
+        """
+        return self.__droppedcount
+
+    def __countdropped(self) -> None:
+        """
+            Counts a record dropped because the queue was full.
+        """
+        self.__droppedcount += 1
+        if self.__metrics is not None:
+            self.__metrics.adddropped()
+
+    def __makeroom(self, loggerjson: dict[str, str]) -> bool:
+        """
+            Applies the overflow policy to a full queue. Must be called holding the queue lock.
+
+            Returns:
+                bool: True if `loggerjson` can be queued, False if it must be dropped.
+        """
+        if self.__overflowpolicy is OverflowPolicyEnum.DROP_OLDEST:
+            self.__dropoldest()
+            return True
+        if not self.__blocksfor(loggerjson):
+            return False
+        # a blocked producer must not wait for the latency deadline
+        self.__wakeup.set()
+        return self.__notfull.wait_for(lambda: len(self.__logdeque) < self.__maxqueuesize, timeout=self.__blocktimeout)
+
+    def __dropoldest(self) -> None:
+        """
+            Drops the oldest queued record. `flush` markers ahead of it are put back
+            at the head of the queue, they are not records and must complete.
+        """
+        logdeque = self.__logdeque
+        markers = []
+        try:
+            while type(logdeque[0]) is LogAck:
+                markers.append(logdeque.popleft())
+            logdeque.popleft()
+            self.__countdropped()
+        except IndexError:  # the daemon thread drained the queue meanwhile, or only markers are queued
+            pass
+        if markers:
+            logdeque.extendleft(reversed(markers))
+            self.__wakeup.set()  # the drain may have missed them while they were out of the queue
+
+    def __blocksfor(self, loggerjson: dict[str, str]) -> bool:
+        """
+            Returns True if the overflow policy waits for room instead of dropping `loggerjson`.
+        """
+        policy = self.__overflowpolicy
+        if policy is OverflowPolicyEnum.BLOCK:
+            return True
+        if policy is OverflowPolicyEnum.DROP_BELOW_LEVEL:
+            return LOGLEVEL_SEVERITY.get(loggerjson.get(LogConstants.LOG_LEVEL, ''), 0) >= self.__dropseverity
+        return False
+
+    async def awritelog(self, loggerjson: dict[str, str]) -> None:
+        """
+            Awaitable variant of `writelog` that never blocks the event loop.
+
+            Appending to the queue only takes the queue lock briefly. If the queue is
+            full and the overflow policy would block, the calling task sleeps and
+            retries until there is room or `blocktimeout` has expired.
+
+            Args:
+                logger_json (dict[str, str]): Dictionary containing log metadata and the actual log message.
+        """
+        # a spilled record must go through the write-ahead log, which may block briefly
+        if not self.__maxqueuesize or self.__wal is not None or not self.__blocksfor(loggerjson):
+            self.writelog(loggerjson)
+            return
+        if self.__metrics is not None:
+            self.__metrics.addaccepted()
+
+        loop = asyncio.get_running_loop()
+        deadline = None if self.__blocktimeout is None else loop.time() + self.__blocktimeout
+        delay = 0.0005
+        while True:
+            with self.__condition:
+                if len(self.__logdeque) < self.__maxqueuesize:
+                    self.__logdeque.append(loggerjson)
+                    return
+                if deadline is not None and loop.time() >= deadline:
+                    self.__countdropped()
+                    return
+            self.__wakeup.set()  # the queue is full, drain it now
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+
+    def __startdaemon(self) -> None:
+        """
+            Creates the queue conditions and starts the daemon thread processing the queue.
+        """
+        lock = threading.Lock()
+        self.__condition = threading.Condition(lock)
+        self.__notfull = threading.Condition(lock)
+        self.__wakeup = threading.Event()
+        self.__drainlock = threading.Lock()
+        self.__wakeupat : int = self.__wakeupthreshold
+        self.__arrivalrate : float = 0.0
+        self.__lastdrain : float = time.monotonic()
+        self.__process_log_thread = threading.Thread(target=self.__processlog, daemon=True)
+        self.__process_log_thread.start()
+
+    def __restartafterfork(self) -> None:
+        """
+            Runs in a forked child process, where the daemon thread no longer exists.
+            Records queued by the parent are left to the parent to write.
+        """
+        if self.__stop_daemon_work:
+            return
+        self.__logdeque.clear()
+        # the write-ahead log belongs to the parent, which replays it after a crash
+        self.__wal = None
+        self.__startdaemon()
+
+    def __processlog(self) -> None:
+        """
+            Waits until a batch is ready or the latency deadline passed and writes
+            queued log records to the file.
+
+            This method is typically run by a background thread that continuously
+            processes logs from the internal queue as they become available.
+        """
+        wakeup = self.__wakeup
+        while True:
+            # woken early by a producer once a batch is waiting, otherwise at the deadline
+            wakeup.wait(timeout=self.__maxlatency)
+            wakeup.clear()
+            if self.__stop_daemon_work:
+                # drain what is left, so close() only has to wait for this thread
+                with self.__drainlock:
+                    while self.__logdeque:
+                        self.__writeloginactualfile()
+                return
+            if self.__logdeque:
+                self.__lingerforbatch()
+                with self.__drainlock:
+                    self.__writeloginactualfile()
+
+    def __lingerforbatch(self) -> None:
+        """
+            Waits up to `__linger` seconds until the batch expected at the current
+            arrival rate is queued, and updates the arrival rate.
+        """
+        now = time.monotonic()
+        elapsed = now - self.__lastdrain
+        if elapsed > 0:
+            self.__arrivalrate = 0.7 * self.__arrivalrate + 0.3 * (len(self.__logdeque) / elapsed)
+
+        expected = min(int(self.__arrivalrate * self.__linger), self.__maxbatchrecords, self.__wakeupthreshold)
+        if self.__linger > 0 and len(self.__logdeque) < expected:
+            self.__wakeupat = expected
+            deadline = now + self.__linger
+            while len(self.__logdeque) < expected and not self.__stop_daemon_work:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.__wakeup.wait(timeout=remaining)
+                self.__wakeup.clear()
+            self.__wakeupat = self.__wakeupthreshold
+        self.__lastdrain = time.monotonic()
+            
+    def __writeloginactualfile(self) -> None:
+        """
+            Collects logs from the internal queue and uses the `prepare_log_string`
+            method to format them before writing to the file.
+
+            This method ensures that all queued log records are processed in order
+            and written to the file according to the defined log sequence. The
+            records queued when it starts are written in batches of at most
+            `__maxbatchrecords` records and `__maxbatchbytes` characters, each with
+            a single write. A formatter with `formatbatch` encodes the records of a
+            batch together; records it formatted one by one earlier, for the
+            write-ahead log, keep their place in between. Until the group is
+            encoded, its size is estimated from the length of the fields. With a
+            coalescer, a record is formatted again once the batch is complete if
+            later copies were collapsed into it.
+        """
+        # popleft is atomic, producers keep appending while the snapshot is taken
+        logdeque = self.__logdeque
+        formatbatch = self.__formatbatch
+        coalescer = self.__coalescer
+        metrics = self.__metrics
+        pending = len(logdeque)
+        if metrics is not None:
+            metrics.observequeue(pending)
+        while pending > 0:
+            if metrics is not None:
+                self.__observedrainlag(metrics)
+            messages : list = []
+            group : list = []
+            coalesced : list[tuple[int, CoalescedLogRecord]] = []
+            acks : list[LogAck] = []
+            lastsequence = 0
+            batchbytes = 0
+            groupbytes = 0
+            popped = 0
+            records = 0
+            if coalescer is not None:
+                coalescer.reset()
+            while popped < pending and records < self.__maxbatchrecords:
+                try:
+                    record = logdeque.popleft()
+                except IndexError:  # DROP_OLDEST producers popped the rest
+                    pending = popped
+                    break
+                popped += 1
+                message = None
+                if type(record) is PendingLogRecord:
+                    lastsequence = record.sequence
+                    if record.ack is not None:
+                        acks.append(record.ack)
+                    message, record = record.message, record.record
+                elif type(record) is LogAck:
+                    acks.append(record)  # flush() marker, every record before it is in this batch
+                    continue
+                records += 1
+                if message is None:
+                    if coalescer is not None:
+                        entry = coalescer.add(renderlogmessage(record))
+                        if entry is None:
+                            continue  # collapsed into an earlier record of this batch
+                        record = entry
+                    if formatbatch is not None:
+                        record = renderlogmessage(record) if coalescer is None else record
+                        group.append(record)
+                        # the block is only encoded once the group is complete, its size is estimated until then
+                        groupbytes += self.__fieldsize(record if coalescer is None else record.record)
+                        if batchbytes + groupbytes >= self.__maxbatchbytes:
+                            break
+                        continue
+                    if coalescer is not None:
+                        coalesced.append((len(messages), record))  # formatted again if copies are collapsed into it
+                        record = record.record
+                    message = self.__preparemsg(record)
+                elif group:
+                    block = self.__formatgroup(group)
+                    messages.append(block)
+                    batchbytes += len(block)
+                    group = []
+                    groupbytes = 0
+                    if coalescer is not None:
+                        coalescer.reset()  # the group is formatted, nothing can be collapsed into it anymore
+                messages.append(message)
+                batchbytes += len(message)
+                if batchbytes >= self.__maxbatchbytes:
+                    break
+            if group:
+                messages.append(self.__formatgroup(group))
+            for index, entry in coalesced:
+                if entry.count > 1:
+                    messages[index] = self.__preparemsg(entry.torecord())
+            pending -= popped
+            if self.__maxqueuesize:
+                with self.__condition:
+                    self.__notfull.notify_all()  # wake up producers waiting for room
+            if records and not self.__write_to_file(messages, records):
+                self.__failedwrites += 1
+                for ack in acks:
+                    ack.fail()  # never written, wake up flush() and writelogwithack callers
+            elif acks or lastsequence:
+                self.__commit(lastsequence, acks)
+
+    @staticmethod
+    def __fieldsize(record: dict[str, str]) -> int:
+        """
+            Estimates the encoded size of a record from the length of its fields.
+        """
+        return sum(len(str(value)) for value in record.values() if value is not None)
+
+    def __formatgroup(self, group: list) -> bytes:
+        """
+            Encodes records, or coalesced records, with the formatter's `formatbatch`.
+        """
+        if self.__coalescer is not None:
+            group = [entry.torecord() for entry in group]
+        return self.__formatbatch(group) # type: ignore[misc]
+
+    def __write_to_file(self, messages: list, records: int) -> bool:
+        """
+            Writes log records to the file and prints an error message if an I/O error occurs.
+
+            This method attempts to persist the log entry to the configured file path.
+            If an IOError or file access error occurs, it is caught and printed to
+            the standard output to prevent the application from crashing.
+
+            Returns:
+                bool: True if the records were written.
+        """
+        metrics = self.__metrics
+        started = time.perf_counter() if metrics is not None else 0.0
+        try:
+            self.__logfile.write(self.__joiner.join(messages), records)
+        except Exception as e:
+            if metrics is not None:
+                metrics.observewrite(records, time.perf_counter() - started, failed=True)
+            print(f"[AsyncFileWriterLog] Failed to write log: {e}")
+            return False
+        if metrics is not None:
+            metrics.observewrite(records, time.perf_counter() - started)
+        return True
+
+    def __observedrainlag(self, metrics: LogSinkMetrics) -> None:
+        """
+            Reports the age of the oldest queued record, if it is a `LogRecord`.
+        """
+        try:
+            record = self.__logdeque[0]
+        except IndexError:
+            return
+        if type(record) is PendingLogRecord:
+            record = record.record
+        if type(record) is LogRecord and record.timestampns:
+            metrics.observedrainlag(max(0, time.time_ns() - record.timestampns) / 1e9)
+
+    def __commit(self, lastsequence: int, acks: list[LogAck]) -> None:
+        """
+            Runs after a batch holding numbered records or flush markers was written:
+            fsyncs it once for all of its acknowledgements, checkpoints the
+            write-ahead log and completes the acknowledgements.
+        """
+        try:
+            # EVERY_RECORD already fsynced the batch when it was written
+            if acks and self.__fsyncpolicy is not FsyncPolicyEnum.NEVER and \
+                    self.__fsyncpolicy is not FsyncPolicyEnum.EVERY_RECORD:
+                self.__logfile.sync()
+            wal = self.__wal
+            if wal is not None and lastsequence:
+                wal.checkpoint(lastsequence)
+                with self.__condition:
+                    # nothing was spilled after this batch, start the write-ahead log over
+                    if self.__lastsequence == lastsequence:
+                        wal.reset()
+                    # under steady load something is always spilled, drop what is written
+                    elif wal.size >= WAL_COMPACT_SIZE:
+                        wal.compact(lastsequence)
+        except Exception as e:
+            print(f"[AsyncFileWriterLog] Failed to commit log: {e}")
+            self.__failedwrites += 1
+            for ack in acks:
+                ack.fail()
+            return
+        for ack in acks:
+            ack.complete()
+
+    def flush(self, timeout: float|None = None) -> bool:
+        """
+            Blocks until every record queued before the call is written to the file,
+            and fsynced unless the fsync policy is `FsyncPolicyEnum.NEVER`.
+
+            Args:
+                timeout (float | None): Seconds to wait at most, None waits until done.
+
+            Returns:
+                bool: True if the records were written, False if the timeout expired
+                    or writing some of them failed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        failedwrites = self.__failedwrites
+        marker = LogAck()
+        self.__logdeque.append(marker)
+        self.__wakeup.set()
+        thread = self.__process_log_thread
+        while thread.is_alive():
+            wait = 0.05 if deadline is None else min(0.05, deadline - time.monotonic())
+            if wait <= 0 or marker.wait(wait) or marker.failed:
+                return marker.done and self.__failedwrites == failedwrites
+        # the daemon thread is gone (closed or stopped), drain on this thread
+        self.__drainsynchronously(deadline)
+        return marker.done and self.__failedwrites == failedwrites
+
+    def close(self, timeout: float|None = None) -> int:
+        """
+            Writes the queued records, stops the daemon thread and closes the file.
+
+            Records left in the queue when `timeout` expires are reported, the daemon
+            thread keeps writing them in the background until the process exits.
+            Calling `close` again writes records logged after the first call.
+
+            Args:
+                timeout (float | None): Seconds to wait at most, None waits until done.
+
+            Returns:
+                int: Number of records that were not written before the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self.__stop_daemon_work = True
+        self.__wakeup.set()
+        thread = self.__process_log_thread
+        if thread is not threading.current_thread():
+            thread.join(timeout)
+        if not thread.is_alive() and self.__drainsynchronously(deadline):
+            try:
+                self.__logfile.close()
+                if self.__wal is not None:
+                    self.__wal.close()
+                    self.__wal = None
+            except Exception as e:
+                print(f"[AsyncFileWriterLog] Failed to close log: {e}")
+
+        undrained = sum(1 for record in list(self.__logdeque) if type(record) is not LogAck)
+        if undrained:
+            print(f"[AsyncFileWriterLog] {undrained} log records were not written before close")
+        return undrained
+
+    def __enter__(self) -> 'AsyncFileWriterLog':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __drainsynchronously(self, deadline: float|None) -> bool:
+        """
+            Drains the queue on the calling thread once the daemon thread stopped.
+
+            Returns:
+                bool: True if the queue was drained, False if another thread kept
+                    draining it past the deadline.
+        """
+        remaining = -1 if deadline is None else max(0.0, deadline - time.monotonic())
+        if not self.__drainlock.acquire(timeout=remaining):
+            return False
+        try:
+            while self.__logdeque:
+                self.__writeloginactualfile()
+        finally:
+            self.__drainlock.release()
+        return True
+
+    def __flush_and_exit(self):
+        """
+            Flushes any remaining log records from the queue to the file upon application exit.
+
+            This method ensures that all logs stored in the internal queue are written
+            to the file before the application terminates, preventing data loss.
+        """
+        self.close()
+
+    def __preparemsg(self, loggerjson: dict[str, str]) -> str:
+        """
+            Prepare a formatted log string from the provided log dictionary.
+
+            This method uses `logger_json` and the configured `__formatter` to
+            construct the log string in the correct order for writing to the file.
+
+            Args:
+                logger_json (dict[str, str]): Dictionary containing log metadata
+                    and the actual log message.
+
+            Returns:
+                str: Formatted log string ready to be written to the log file.
+        """
+        return self.__formatter.format(renderlogmessage(loggerjson))
+
+class MmapFileWriterLog(WriteLogMessage):
+    """
+        Memory-mapped file implementation of the log writer interface, for
+        services where even a buffered `write()` adds too much tail latency.
+
+        The file is mapped in segments of `segmentsize` bytes. Logging a record
+        reserves its offset and copies the encoded line into the mapping under a
+        small lock, which is a memcpy without any system call; the operating
+        system writes the pages to the file on its own. Once half of a segment is
+        used, a background thread grows the file and maps the next segment, so the
+        logging thread only switches mappings when the current one is full. A
+        record crossing the end of a segment is split across both segments, the
+        file stays contiguous.
+
+        The mapped but unused tail of the file holds zero bytes until `close`
+        truncates the file to the length actually written. A file left padded by
+        a crash is trimmed when the next writer opens it: text logs at the last
+        byte that is not zero, binary logs, whose blocks may end in zero bytes,
+        after the last complete block. Call `flush` to force the
+        mapped pages to the disk.
+
+        Rotation and several processes sharing the file are not supported: a
+        forked child process must create its own writer for another file, records
+        it logs through the parent's writer are dropped.
+
+        `formatter` and `writeformatted` let a `RoutingWriterLog` format a record
+        once for every writer sharing the same format.
+
+        Attributes:
+            __logfilepath (str): File path provided by the user where logs should be stored.
+            __formatter (LogFormatter): Serializes every log record into the line written
+                to the file, `PipeLogFormatter` by default.
+            __encoding (str): Encoding of the lines written to the mapping.
+            __segmentsize (int): Bytes mapped at once, a multiple of `mmap.ALLOCATIONGRANULARITY`.
+            __lock (threading.Lock): Lock guarding the reservation, the copy and the
+                current segment.
+            __fd (int | None): Descriptor of the open file, None while closed.
+            __mapping (mmap.mmap | None): Segment records are currently copied into.
+            __segmentbase (int): File offset of the current segment.
+            __segmentend (int): File offset where the current segment ends.
+            __position (int): File offset of the next record, i.e. the length written.
+            __nextsegment (mmap.mmap | None): Following segment, mapped in advance by
+                the background thread.
+            __retired (list[mmap.mmap]): Full segments waiting to be unmapped by the
+                background thread.
+            __prefetchat (int): File offset at which the next segment is prepared.
+            __prefetch (threading.Event): Wakes the background thread.
+            __closing (bool): Set by `close` to stop the background thread.
+            __preparethread (threading.Thread): Background thread preparing segments.
+            __pid (int): Process that opened the file.
+    """
+
+    # records are formatted straight from the compact LogRecord
+    acceptslogrecord : bool = True
+
+    def __init__(self, logfilepath: str, segmentsize: int = 64 * 1024 * 1024,
+                 formatter: LogFormatter|None = None, encoding: str = "utf-8") -> None:
+        super().__init__()
+        self.__logfilepath : str = logfilepath
+        self.__formatter : LogFormatter = formatter if formatter is not None else PipeLogFormatter()
+        self.__encoding : str = encoding
+        granularity = mmap.ALLOCATIONGRANULARITY
+        self.__segmentsize : int = max(granularity, -(-segmentsize // granularity) * granularity)
+        self.__lock = threading.Lock()
+        self.__fd : int|None = None
+        self.__mapping : mmap.mmap|None = None
+        self.__segmentbase : int = 0
+        self.__segmentend : int = 0
+        self.__position : int = 0
+        self.__nextsegment : mmap.mmap|None = None
+        self.__retired : list[mmap.mmap] = []
+        self.__prefetchat : int = 0
+        self.__prefetch = threading.Event()
+        self.__closing : bool = False
+        self.__pid : int = os.getpid()
+        with self.__lock:
+            self.__open()
+        LogLifecycleHooks.registeratexit(self.close)
+        LogLifecycleHooks.registerafterfork(self.__detachafterfork)
+
+    @override
+    def writelog(self, loggerjson: dict[str, str]) -> None:
+        """
+            Copies the formatted log record into the mapped file.
+
+            Args:
+                logger_json (dict[str, str]): Dictionary containing log metadata
+                    and the actual log message.
+        """
+        self.writeformatted(self.__formatter.format(loggerjson))
+
+    @property
+    def formatter(self) -> LogFormatter:
+        """
+            Formatter serializing the records written to the file.
+        """
+        return self.__formatter
+
+    def writeformatted(self, message: str|bytes, records: int = 1) -> None:
+        """
+            Copies records already serialized by `formatter` into the mapped file.
+
+            Args:
+                message (str | bytes): One or more formatted records.
+                records (int): Number of records in `message`.
+        """
+        data = message.encode(self.__encoding) if type(message) is str else message
+        try:
+            with self.__lock:
+                if self.__mapping is None and not self.__open():
+                    return
+                position = self.__position
+                end = position + len(data)
+                if end <= self.__segmentend:
+                    offset = position - self.__segmentbase
+                    self.__mapping[offset:offset + len(data)] = data # type: ignore[index]
+                    self.__position = end
+                    if end >= self.__prefetchat and not self.__prefetch.is_set():
+                        self.__prefetch.set()
+                    return
+                self.__writeacross(data)
+        except Exception as e:
+            print(f"[MmapFileWriterLog] Failed to write log: {e}")
+
+    def flush(self) -> None:
+        """
+            Forces the mapped pages written so far to the disk.
+        """
+        try:
+            with self.__lock:
+                if self.__mapping is not None:
+                    self.__mapping.flush()
+        except Exception as e:
+            print(f"[MmapFileWriterLog] Failed to flush log: {e}")
+
+    def close(self) -> None:
+        """
+            Unmaps the file and truncates it to the length written. Logging
+            afterwards opens it again and appends.
+        """
+        try:
+            with self.__lock:
+                if self.__fd is None:
+                    return
+                self.__closing = True
+                self.__prefetch.set()
+                preparethread = self.__preparethread
+            # wait for a segment being mapped, records logged meanwhile are still kept
+            if preparethread is not threading.current_thread():
+                preparethread.join()
+            with self.__lock:
+                fd = self.__fd
+                if fd is None:
+                    return
+                segments = [self.__mapping, self.__nextsegment, *self.__retired]
+                self.__mapping = self.__nextsegment = None
+                self.__retired = []
+                self.__fd = None
+                for segment in segments:
+                    if segment is not None:
+                        segment.flush()
+                        segment.close()
+                os.ftruncate(fd, self.__position)
+                os.close(fd)
+        except Exception as e:
+            print(f"[MmapFileWriterLog] Failed to close log: {e}")
+
+    def __enter__(self) -> 'MmapFileWriterLog':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __open(self) -> bool:
+        """
+            Opens and maps the file after the data already in it, and starts the
+            background thread. Must be called holding `__lock`.
+
+            Returns:
+                bool: False if the writer belongs to the parent of a forked process.
+        """
+        if self.__pid != os.getpid():
+            return False
+        fd = os.open(self.__logfilepath, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            self.__position = self.__datalength(fd)
+            self.__segmentbase = self.__position - self.__position % mmap.ALLOCATIONGRANULARITY
+            self.__mapping = self.__mapsegment(fd, self.__segmentbase)
+        except Exception:
+            os.close(fd)
+            raise
+        self.__fd = fd
+        self.__segmentend = self.__segmentbase + self.__segmentsize
+        self.__prefetchat = self.__segmentbase + self.__segmentsize // 2
+        self.__prefetch.clear()
+        self.__closing = False
+        self.__preparethread = threading.Thread(target=self.__preparesegments, args=(fd,), daemon=True)
+        self.__preparethread.start()
+        return True
+
+    def __datalength(self, fd: int) -> int:
+        """
+            Returns the length of the data in the file, without the zero padding a
+            writer that was not closed left at its end. A binary log is walked block
+            by block, as its last block may legitimately end in zero bytes.
+        """
+        end = os.fstat(fd).st_size
+        if end == 0 or os.pread(fd, 1, end - 1) != b"\0":
+            return end  # closed cleanly, nothing to trim
+        if getattr(self.__formatter, "binary", False) is True:
+            with mmap.mmap(fd, end, access=mmap.ACCESS_READ) as data:
+                return binarylogdatalength(data)
+        while end > 0:
+            start = max(0, end - 1024 * 1024)
+            chunk = os.pread(fd, end - start, start).rstrip(b"\0")
+            if chunk:
+                return start + len(chunk)
+            end = start
+        return 0
+
+    def __mapsegment(self, fd: int, base: int) -> mmap.mmap:
+        """
+            Allocates the disk space of the segment starting at `base` and maps it.
+
+            A sparse segment would turn a full disk into a SIGBUS killing the
+            process while a record is copied into the mapping. Allocating it with
+            `posix_fallocate` raises an `OSError` (ENOSPC) here instead. Where the
+            file system or platform can not allocate, the file is only grown.
+
+            Raises:
+                OSError: If the disk space can not be allocated.
+        """
+        end = base + self.__segmentsize
+        allocated = False
+        if hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(fd, base, self.__segmentsize)
+                allocated = True
+            except OSError as e:
+                if e.errno not in (errno.EOPNOTSUPP, errno.EINVAL, errno.ENOSYS):
+                    raise
+        if not allocated and os.fstat(fd).st_size < end:
+            os.ftruncate(fd, end)
+        return mmap.mmap(fd, self.__segmentsize, offset=base, access=mmap.ACCESS_WRITE)
+
+    def __writeacross(self, data: bytes) -> None:
+        """
+            Copies a record that does not fit into the current segment, switching to
+            the next segment at the end. Must be called holding `__lock`.
+        """
+        if self.__nextsegment is None:
+            # fails on a full disk before any part of the record is copied
+            self.__nextsegment = self.__mapsegment(self.__fd, self.__segmentend) # type: ignore[arg-type]
+        view = memoryview(data)
+        while view:
+            offset = self.__position - self.__segmentbase
+            room = self.__segmentend - self.__position
+            if room == 0:
+                self.__rollsegment()
+                continue
+            chunk = view[:room]
+            self.__mapping[offset:offset + len(chunk)] = chunk # type: ignore[index]
+            self.__position += len(chunk)
+            view = view[len(chunk):]
+
+    def __rollsegment(self) -> None:
+        """
+            Switches to the next segment, mapping it right away if the background
+            thread has not prepared it yet. Must be called holding `__lock`.
+        """
+        nextsegment = self.__nextsegment
+        if nextsegment is None:
+            nextsegment = self.__mapsegment(self.__fd, self.__segmentend) # type: ignore[arg-type]
+        self.__nextsegment = None
+        self.__retired.append(self.__mapping) # type: ignore[arg-type]
+        self.__mapping = nextsegment
+        self.__segmentbase = self.__segmentend
+        self.__segmentend += self.__segmentsize
+        self.__prefetchat = self.__segmentbase + self.__segmentsize // 2
+        self.__prefetch.set()
+
+    def __preparesegments(self, fd: int) -> None:
+        """
+            Runs on the background thread: maps the next segment ahead of time and
+            unmaps full segments, keeping system calls off the logging threads.
+        """
+        while True:
+            self.__prefetch.wait()
+            self.__prefetch.clear()
+            with self.__lock:
+                if self.__fd != fd or self.__closing:
+                    return
+                retired, self.__retired = self.__retired, []
+                base = self.__segmentend if self.__nextsegment is None and self.__position >= self.__prefetchat else None
+            try:
+                for segment in retired:
+                    segment.close()
+                if base is None:
+                    continue
+                segment = self.__mapsegment(fd, base)
+                with self.__lock:
+                    if self.__fd == fd and not self.__closing and self.__nextsegment is None and self.__segmentend == base:
+                        self.__nextsegment = segment
+                        continue
+                segment.close()
+            except Exception as e:
+                print(f"[MmapFileWriterLog] Failed to map log segment: {e}")
+
+    def __detachafterfork(self) -> None:
+        """
+            Runs in a forked child process, which must not write into the parent's
+            mapping. The mappings are dropped without truncating the parent's file.
+        """
+        self.__lock = threading.Lock()
+        self.__prefetch = threading.Event()
+        self.__mapping = self.__nextsegment = None
+        self.__retired = []
+        self.__fd = None
+
+class RingBufferWriterLog(WriteLogMessage):
+    """
+        In-memory writer keeping the last `capacity` log records, which are only
+        written to `dumpwriter` when something goes wrong.
+
+        The buffer is preallocated and written without a lock: a record takes
+        the next sequence number from an atomic counter and is stored in its
+        slot, overwriting the oldest record. Messages are kept unformatted, so a
+        buffered DEBUG record that is never dumped costs next to nothing. Routing
+        every level here and only INFO and above to a file, e.g. with
+        `RoutingWriterLog`, keeps DEBUG logging "on" without paying for it.
+
+        A record of `dumplevel` or above dumps the records buffered since the
+        previous dump, oldest first and ending with that record, to `dumpwriter`
+        and flushes it. With `dumponexception`, an unhandled exception in any
+        thread is recorded as a CRITICAL record and dumps the buffer before the
+        previous exception hook runs. `dump` can also be called directly, and
+        `close` restores the exception hooks.
+
+        A producer may have drawn its sequence number but not stored its record
+        yet when a dump runs. The dump waits up to `UNFINISHED_WAIT` seconds for
+        such records, and leaves the ones still missing to the next dump.
+
+        Attributes:
+            __capacity (int): Number of records kept.
+            __buffer (list[tuple[int, dict[str, str]] | None]): Preallocated slots
+                holding the sequence number and the record stored in them.
+            __sequence (itertools.count): Hands out sequence numbers.
+            __dumpwriter (WriteLogMessage): Writer the buffered records are dumped to.
+            __dumpseverity (int): Severity of the records triggering a dump.
+            __dumpedthrough (int): Sequence number up to which records were dumped,
+                except the unfinished ones.
+            __unfinished (list[int]): Sequence numbers drawn before the previous dump
+                whose records were not stored yet, dumped once they are.
+            __dumplock (threading.Lock): Serializes dumps, so none is written twice.
+            __previousexcepthook (Callable | None): `sys.excepthook` replaced by this writer.
+            __previousthreadexcepthook (Callable | None): `threading.excepthook`
+                replaced by this writer.
+    """
+
+    # messages of buffered records are only rendered if they are dumped
+    defersmessageformatting : bool = True
+
+    # buffered records are kept as compact LogRecord objects
+    acceptslogrecord : bool = True
+
+    # how long (seconds) a dump waits for records drawn but not stored yet
+    UNFINISHED_WAIT : float = 0.001
+
+    def __init__(self, capacity: int, dumpwriter: WriteLogMessage, dumplevel: LoglevelEnum = LoglevelEnum.ERROR,
+                 dumponexception: bool = True) -> None:
+        super().__init__()
+        self.__capacity : int = max(1, capacity)
+        self.__buffer : list[tuple[int, dict[str, str]]|None] = [None] * self.__capacity
+        self.__sequence : itertools.count = itertools.count()
+        self.__dumpwriter : WriteLogMessage = dumpwriter
+        self.__dumpseverity : int = dumplevel.severity
+        self.__dumpedthrough : int = -1
+        self.__unfinished : list[int] = []
+        self.__dumplock = threading.Lock()
+        self.__previousexcepthook : Callable|None = None
+        self.__previousthreadexcepthook : Callable|None = None
+        if dumponexception:
+            self.__previousexcepthook, sys.excepthook = sys.excepthook, self.__excepthook
+            self.__previousthreadexcepthook, threading.excepthook = threading.excepthook, self.__threadexcepthook
+
+    @override
+    def writelog(self, loggerjson: dict[str, str]) -> None:
+        """
+            Stores the record in the buffer and dumps the buffer if the record is
+            of the dump level or above.
+
+            Args:
+                logger_json (dict[str, str]): Dictionary containing log metadata
+                    and the actual log message.
+        """
+        sequence = next(self.__sequence)
+        self.__buffer[sequence % self.__capacity] = (sequence, loggerjson)
+        level = loggerjson.level if type(loggerjson) is LogRecord else loggerjson.get(LogConstants.LOG_LEVEL)
+        if level is not None and LOGLEVEL_SEVERITY.get(level, 0) >= self.__dumpseverity:
+            self.dump()
+
+    def snapshot(self) -> list[dict[str, str]]:
+        """
+            Returns the buffered records, oldest first, without dumping them.
+        """
+        end = next(self.__sequence)
+        collected, _ = self.__collect(range(max(0, end - self.__capacity), end), end)
+        return [record for _, record in collected]
+
+    def dump(self) -> int:
+        """
+            Writes the records buffered since the previous dump to the dump writer
+            and flushes it.
+
+            Returns:
+                int: Number of records dumped.
+        """
+        with self.__dumplock:
+            # the number drawn marks the end of the dump, its slot simply stays unused
+            end = next(self.__sequence)
+            sequences = self.__unfinished + list(range(max(self.__dumpedthrough + 1, end - self.__capacity), end))
+            collected, unfinished = self.__collect(sequences, end)
+            deadline = time.monotonic() + self.UNFINISHED_WAIT
+            while unfinished and time.monotonic() < deadline:
+                time.sleep(0)  # let the producers store them
+                stored, unfinished = self.__collect(unfinished, end)
+                collected += stored
+            collected.sort(key=lambda entry: entry[0])
+            records = [record for _, record in collected]
+            self.__dumpedthrough = end
+            self.__unfinished = unfinished
+            try:
+                writer = self.__dumpwriter
+                plain = getattr(writer, "acceptslogrecord", False) is not True
+                for record in records:
+                    record = renderlogmessage(record)
+                    writer.writelog(record.todict() if plain and type(record) is LogRecord else record)
+                flush = getattr(writer, "flush", None)
+                if flush is not None:
+                    flush()
+            except Exception as e:
+                print(f"[RingBufferWriterLog] Failed to dump logs: {e}")
+        return len(records)
+
+    def close(self) -> None:
+        """
+            Restores the exception hooks replaced by this writer.
+        """
+        if self.__previousexcepthook is not None and sys.excepthook == self.__excepthook:
+            sys.excepthook = self.__previousexcepthook
+        if self.__previousthreadexcepthook is not None and threading.excepthook == self.__threadexcepthook:
+            threading.excepthook = self.__previousthreadexcepthook
+        self.__previousexcepthook = self.__previousthreadexcepthook = None
+
+    def __enter__(self) -> 'RingBufferWriterLog':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __collect(self, sequences: Iterable[int], end: int) -> tuple[list[tuple[int, dict[str, str]]], list[int]]:
+        """
+            Returns the buffered records numbered `sequences` with their numbers,
+            and the numbers whose records are not stored yet. Records older than
+            the last `capacity` numbers before `end` were overwritten and are skipped.
+        """
+        collected = []
+        unfinished = []
+        buffer = self.__buffer
+        capacity = self.__capacity
+        for sequence in sequences:
+            if sequence < end - capacity:
+                continue
+            entry = buffer[sequence % capacity]
+            if entry is None or entry[0] < sequence:
+                unfinished.append(sequence)
+            elif entry[0] == sequence:
+                collected.append(entry)
+        return collected, unfinished
+
+    def __dumpexception(self, exctype: type[BaseException], value: BaseException|None, tb: TracebackType|None) -> None:
+        """
+            Records an unhandled exception as a CRITICAL record and dumps the buffer.
+        """
+        if issubclass(exctype, KeyboardInterrupt):
+            return
+        message = "Unhandled exception\n" + "".join(traceback.format_exception(exctype, value, tb)).rstrip()
+        sequence = next(self.__sequence)
+        self.__buffer[sequence % self.__capacity] = (sequence, {LogConstants.LOG_LEVEL: LoglevelEnum.CRITICAL.value,
+                                                                LogConstants.LOG_MESSAGE: message})
+        self.dump()
+
+    def __excepthook(self, exctype: type[BaseException], value: BaseException, tb: TracebackType|None) -> None:
+        self.__dumpexception(exctype, value, tb)
+        (self.__previousexcepthook or sys.__excepthook__)(exctype, value, tb)
+
+    def __threadexcepthook(self, args: threading.ExceptHookArgs) -> None:
+        if args.exc_type is not SystemExit:
+            self.__dumpexception(args.exc_type, args.exc_value, args.exc_traceback)
+        (self.__previousthreadexcepthook or threading.__excepthook__)(args)
@@ -0,0 +1,126 @@
+import os
+import pytest
+
+from logger.src.binaryLogFormat import BinaryLogFormatter, decodebinarylog, appendvarint, readvarint, binarylogdatalength
+from logger.src.logConstants import LogConstants
+from logger.src.logRecord import LogRecord
+from logger.src.logTimestamp import LogTimestampFormatter
+from logger.src.timestampFormatEnum import TimestampFormatEnum
+from logger.src.loggerException import LoggerException, LoggerExceptionMessageConstant
+from logger.src.writeLogMessage import AsyncFileWriterLog, MmapFileWriterLog
+
+def create_record(message, timestampns):
+    record = LogRecord(message, "INFO", "module.handle_request", timestampns)
+    record.servicename = "Service1"
+    record.timestamp = "rendered by LoggerWithTimeStamp"
+    return record
+
+class TestBinaryLogFormatter:
+
+    def setup_method(self):
+        self.formatter = BinaryLogFormatter()
+        self.timestampformatter = LogTimestampFormatter(timestampformat=TimestampFormatEnum.EPOCH_NS)
+
+    def test_varint_round_trip(self):
+        buffer = bytearray()
+        for value in (0, 127, 128, 300, 2 ** 63):
+            appendvarint(buffer, value)
+
+        offset, values = 0, []
+        while offset < len(buffer):
+            value, offset = readvarint(buffer, offset)
+            values.append(value)
+        assert values == [0, 127, 128, 300, 2 ** 63]
+
+    def test_batch_round_trip_with_timestamp_deltas(self):
+        timestamps = [1_700_000_000_000_000_000, 1_700_000_000_000_001_500, 1_700_000_000_000_000_900]
+        records = [create_record(f"message {index}", timestamp) for index, timestamp in enumerate(timestamps)]
+
+        decoded = list(decodebinarylog(self.formatter.formatbatch(records), self.timestampformatter))
+
+        assert decoded == [{ LogConstants.LOG_SERVICE_NAME: "Service1",
+                             LogConstants.LOG_FUNCTION_NAME: "module.handle_request",
+                             LogConstants.LOG_TIMESTAMP: str(timestamp),
+                             LogConstants.LOG_LEVEL: "INFO",
+                             LogConstants.LOG_MESSAGE: f"message {index}" } for index, timestamp in enumerate(timestamps)]
+
+    def test_dictionary_keeps_its_timestamp_text(self):
+        loggerjson = { LogConstants.LOG_TIMESTAMP: "2026-01-29 12:02:41", LogConstants.LOG_MESSAGE: "found ||\n" }
+
+        assert list(decodebinarylog(self.formatter.format(loggerjson))) == [loggerjson]
+
+    def test_repeated_strings_are_stored_once_per_batch(self):
+        records = [create_record("x", 1_700_000_000_000_000_000 + index) for index in range(100)]
+
+        batch = self.formatter.formatbatch(records)
+
+        assert batch.count(b"module.handle_request") == 1
+        assert len(batch) * 3 < sum(len(self.formatter.format(record)) for record in records)
+
+    def test_block_cut_short_at_the_end_is_ignored(self):
+        first = self.formatter.format({ LogConstants.LOG_MESSAGE: "one" })
+        second = self.formatter.format({ LogConstants.LOG_MESSAGE: "two" })
+
+        assert list(decodebinarylog(first + second[:-2])) == [{ LogConstants.LOG_MESSAGE: "one" }]
+
+    def test_data_length_ends_after_the_last_complete_block(self):
+        blocks = self.formatter.format({ LogConstants.LOG_MESSAGE: "" }) + self.formatter.format({ LogConstants.LOG_MESSAGE: "two" })
+
+        assert binarylogdatalength(blocks + b"\0" * 100) == len(blocks)
+        assert binarylogdatalength(blocks[:-1]) == len(self.formatter.format({ LogConstants.LOG_MESSAGE: "" }))
+
+    def test_text_log_is_rejected(self):
+        with pytest.raises(LoggerException) as logException:
+            list(decodebinarylog(b"Service1 || INFO || message\n"))
+
+        assert LoggerExceptionMessageConstant.BINARY_LOG_CORRUPTED_EXCEPTION in str(logException.value)
+
+class TestBinaryLogFormatterWithAsyncFileWriterLog:
+
+    def setup_method(self):
+        self.file_path = 'file.txt'
+
+    def test_drained_batches_decode_in_order(self):
+        writer = AsyncFileWriterLog(self.file_path, formatter=BinaryLogFormatter(), maxlatencyms=60_000)
+        for index in range(50):
+            writer.writelog(create_record(f"message {index}", 1_700_000_000_000_000_000 + index))
+        writer.close()
+
+        with open(self.file_path, 'rb') as f:
+            decoded = list(decodebinarylog(f.read()))
+        assert [loggerjson[LogConstants.LOG_MESSAGE] for loggerjson in decoded] == [f"message {index}" for index in range(50)]
+
+    def teardown_method(self):
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+class TestBinaryLogFormatterWithMmapFileWriterLog:
+
+    def setup_method(self):
+        self.file_path = 'file.txt'
+
+    def read_messages(self):
+        with open(self.file_path, 'rb') as f:
+            return [loggerjson[LogConstants.LOG_MESSAGE] for loggerjson in decodebinarylog(f.read())]
+
+    def test_block_ending_in_zero_is_kept_on_reopen(self):
+        with MmapFileWriterLog(self.file_path, formatter=BinaryLogFormatter()) as writer:
+            writer.writelog({ LogConstants.LOG_MESSAGE: "" })
+        with MmapFileWriterLog(self.file_path, formatter=BinaryLogFormatter()) as writer:
+            writer.writelog({ LogConstants.LOG_MESSAGE: "two" })
+
+        assert self.read_messages() == ["", "two"]
+
+    def test_zero_padding_of_unclosed_file_is_trimmed_on_open(self):
+        block = BinaryLogFormatter().format({ LogConstants.LOG_MESSAGE: "" })
+        with open(self.file_path, 'wb') as f:
+            f.write(block + b"\0" * 10000)
+
+        with MmapFileWriterLog(self.file_path, formatter=BinaryLogFormatter(), segmentsize=1) as writer:
+            writer.writelog({ LogConstants.LOG_MESSAGE: "two" })
+
+        assert self.read_messages() == ["", "two"]
+
+    def teardown_method(self):
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
@@ -0,0 +1,35 @@
+import json
+import shutil
+import tempfile
+
+from logger.src.binaryLogFormat import BinaryLogFormatter
+from logger.src.logConstants import LogConstants
+from logger.logcat.logCat import main
+
+class TestLogCat:
+
+    def setup_method(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_path = f"{self.directory}/file.log"
+        with open(self.file_path, 'wb') as f:
+            f.write(BinaryLogFormatter().format({ LogConstants.LOG_LEVEL: "INFO", LogConstants.LOG_MESSAGE: "found" }))
+
+    def test_binary_log_is_printed_as_text(self, capsys):
+        assert main([self.file_path]) == 0
+
+        assert capsys.readouterr().out == "INFO || found\n"
+
+    def test_binary_log_is_printed_as_json_lines(self, capsys):
+        assert main([self.file_path, "--output", "json"]) == 0
+
+        assert json.loads(capsys.readouterr().out) == { LogConstants.LOG_LEVEL: "INFO", LogConstants.LOG_MESSAGE: "found" }
+
+    def test_text_log_fails(self, capsys):
+        with open(self.file_path, 'w') as f:
+            f.write("INFO || found\n")
+
+        assert main([self.file_path]) == 1
+        assert "[LogCat] Failed to decode" in capsys.readouterr().err
+
+    def teardown_method(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,54 @@
+from logger.src.logCoalescing import LogCoalescer
+from logger.src.logConstants import LogConstants
+from logger.src.logLevelEnum import LoglevelEnum
+from logger.src.logRecord import LogRecord
+
+class TestLogCoalescer:
+
+    def setup_method(self):
+        self.coalescer = LogCoalescer(2)
+
+    def make_record(self, message, timestamp):
+        record = LogRecord(message, LoglevelEnum.ERROR.value, "module.function")
+        record.timestamp = timestamp
+        return record
+
+    def test_identical_records_are_collapsed_into_first(self):
+        first = self.make_record("failed", "t1")
+        entry = self.coalescer.add(first)
+
+        assert self.coalescer.add(self.make_record("failed", "t2")) is None
+        assert self.coalescer.add(self.make_record("failed", "t3")) is None
+        record = entry.torecord()
+
+        assert entry.count == 3
+        assert record[LogConstants.LOG_MESSAGE] == "failed [repeated 3 times, first t1, last t3]"
+        assert record[LogConstants.LOG_TIMESTAMP] == "t1"
+        assert first[LogConstants.LOG_MESSAGE] == "failed"
+
+    def test_single_record_is_written_unchanged(self):
+        record = self.make_record("failed", "t1")
+
+        assert self.coalescer.add(record).torecord() is record
+
+    def test_records_differing_in_level_are_not_collapsed(self):
+        self.coalescer.add(self.make_record("failed", "t1"))
+        other = self.make_record("failed", "t2")
+        other.level = LoglevelEnum.WARNING.value
+
+        assert self.coalescer.add(other) is not None
+
+    def test_least_recently_seen_record_is_evicted(self):
+        self.coalescer.add(self.make_record("one", "t1"))
+        self.coalescer.add(self.make_record("two", "t2"))
+        self.coalescer.add(self.make_record("one", "t3"))
+        self.coalescer.add(self.make_record("three", "t4"))
+
+        assert self.coalescer.add(self.make_record("one", "t5")) is None
+        assert self.coalescer.add(self.make_record("two", "t6")) is not None
+
+    def test_reset_forgets_every_record(self):
+        self.coalescer.add(self.make_record("failed", "t1"))
+        self.coalescer.reset()
+
+        assert self.coalescer.add(self.make_record("failed", "t2")) is not None
@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+import threading
+
+from logger.src.logDurability import LogAck, WriteAheadLog, WAL_ENTRY_HEADER
+
+class TestLogAck:
+
+    def test_wait_returns_once_completed(self):
+        ack = LogAck(1)
+        assert ack.wait(timeout=0.01) is False
+
+        threading.Timer(0.05, ack.complete).start()
+
+        assert ack.wait(timeout=5) is True
+        assert ack.done
+
+    def test_failed_ack_wakes_up_waiters_without_acknowledging(self):
+        ack = LogAck(1)
+        threading.Timer(0.05, ack.fail).start()
+
+        assert ack.wait(timeout=5) is False
+        assert ack.failed and not ack.done
+
+class TestWriteAheadLog:
+
+    def setup_method(self):
+        self.directory = tempfile.mkdtemp()
+        self.wal_path = os.path.join(self.directory, 'file.wal')
+
+    def test_entries_after_the_checkpoint_are_recovered(self):
+        wal = WriteAheadLog(self.wal_path)
+        assert wal.recover() == ([], 0)
+        wal.append(1, "one\n")
+        wal.append(2, "two\n")
+        wal.append(3, "three\n")
+        wal.checkpoint(1)
+        wal.close()
+
+        assert WriteAheadLog(self.wal_path).recover() == ([b"two\n", b"three\n"], 3)
+
+    def test_torn_entry_at_the_end_is_ignored(self):
+        wal = WriteAheadLog(self.wal_path)
+        wal.recover()
+        wal.append(1, "one\n")
+        wal.close()
+        with open(self.wal_path, 'ab') as f:
+            f.write(WAL_ENTRY_HEADER.pack(2, 100) + b"tw")
+
+        assert WriteAheadLog(self.wal_path).recover() == ([b"one\n"], 1)
+
+    def test_reset_keeps_the_sequence_in_the_checkpoint(self):
+        wal = WriteAheadLog(self.wal_path)
+        wal.recover()
+        wal.append(1, "one\n")
+        wal.checkpoint(1)
+        wal.reset()
+        wal.close()
+
+        assert os.path.getsize(self.wal_path) == 0
+        assert WriteAheadLog(self.wal_path).recover() == ([], 1)
+
+    def test_compact_keeps_entries_after_the_sequence(self):
+        wal = WriteAheadLog(self.wal_path)
+        wal.recover()
+        for sequence in range(1, 6):
+            wal.append(sequence, f"record-{sequence}\n")
+        wal.checkpoint(3)
+        wal.compact(3)
+        wal.append(6, "record-6\n")
+        wal.close()
+
+        assert wal.size == os.path.getsize(self.wal_path)
+        assert WriteAheadLog(self.wal_path).recover() == ([b"record-4\n", b"record-5\n", b"record-6\n"], 6)
+
+    def teardown_method(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,217 @@
+import os
+import time
+import pytest
+import multiprocessing
+
+from logger.src.logFileHandle import LogFileHandle
+from logger.src.logRotation import LogRotationPolicy
+from logger.src.fsyncPolicyEnum import FsyncPolicyEnum
+from logger.src.loggerException import LoggerException, LoggerExceptionMessageConstant
+from logger.src.writeLogMessage import AsyncFileWriterLog
+
+from unittest.mock import patch
+
+class TestLogFileHandleOpenPerWrite:
+
+    def setup_method(self):
+        self.file_path = 'file.txt'
+        self.logfile = LogFileHandle(self.file_path)
+
+    def test_write_appends_message_to_file(self):
+        self.logfile.write("first\n")
+        self.logfile.write("second\n")
+
+        with open(self.file_path, 'r') as f:
+            assert f.read() == "first\nsecond\n"
+
+    def teardown_method(self):
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+class TestLogFileHandleKeepFileOpen:
+
+    def setup_method(self):
+        self.file_path = 'file.txt'
+
+    def test_records_are_buffered_until_flush_every_records_is_reached(self):
+        self.logfile = LogFileHandle(self.file_path, keepfileopen=True, flusheveryrecords=3)
+        self.logfile.write("one\n")
+        self.logfile.write("two\n")
+
+        with open(self.file_path, 'r') as f:
+            assert f.read() == ""
+
+        self.logfile.write("three\n")
+        with open(self.file_path, 'r') as f:
+            assert f.read() == "one\ntwo\nthree\n"
+
+    def test_flush_writes_buffered_records(self):
+        self.logfile = LogFileHandle(self.file_path, keepfileopen=True, flusheveryrecords=0)
+        self.logfile.write("one\n")
+        self.logfile.flush()
+
+        with open(self.file_path, 'r') as f:
+            assert f.read() == "one\n"
+
+    def test_flush_every_ms_flushes_in_background(self):
+        self.logfile = LogFileHandle(self.file_path, keepfileopen=True, flusheveryrecords=0, flusheveryms=10)
+        self.logfile.write("one\n")
+        time.sleep(0.2)
+
+        with open(self.file_path, 'r') as f:
+            assert f.read() == "one\n"
+
+    def test_flush_every_ms_keeps_flushing_after_writing_past_close(self):
+        self.logfile = LogFileHandle(self.file_path, keepfileopen=True, flusheveryrecords=0, flusheveryms=10)
+        self.logfile.write("one\n")
+        self.logfile.close()
+        self.logfile.write("two\n")
+        time.sleep(0.2)
+
+        with open(self.file_path, 'r') as f:
+            assert f.read() == "one\ntwo\n"
+
+    def test_file_is_reopened_when_path_is_removed(self):
+        self.logfile = LogFileHandle(self.file_path, keepfileopen=True)
+        self.logfile.write("one\n")
+        os.remove(self.file_path)
+
+        with patch.object(LogFileHandle, 'PATH_CHECK_INTERVAL', 0):
+            self.logfile.write("two\n")
+
+        with open(self.file_path, 'r') as f:
+            assert f.read() == "two\n"
+
+    def teardown_method(self):
+        self.logfile.close()
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+class TestLogFileHandleFsync:
+
+    def setup_method(self):
+        self.file_path = 'file.txt'
+
+    def test_every_record_fsyncs_every_write(self):
+        self.logfile = LogFileHandle(self.file_path, keepfileopen=True, fsyncpolicy=FsyncPolicyEnum.EVERY_RECORD)
+        with patch('logger.src.logFileHandle.os.fsync') as fsync:
+            self.logfile.write("one\n")
+            self.logfile.write("two\nthree\n", 2)
+
+        assert fsync.call_count == 2
+
+    def test_every_n_records_fsyncs_once_n_records_were_written(self):
+        self.logfile = LogFileHandle(self.file_path, fsyncpolicy=FsyncPolicyEnum.EVERY_N_RECORDS, fsynceveryrecords=3)
+        with patch('logger.src.logFileHandle.os.fsync') as fsync:
+            for index in range(7):
+                self.logfile.write(f"{index}\n")
+
+        assert fsync.call_count == 2
+
+    def test_interval_fsyncs_idle_records_in_background(self):
+        self.logfile = LogFileHandle(self.file_path, keepfileopen=True, flusheveryrecords=0,
+                                     fsyncpolicy=FsyncPolicyEnum.INTERVAL, fsynceveryms=20)
+        with patch('logger.src.logFileHandle.os.fsync') as fsync:
+            self.logfile.write("one\n")
+            time.sleep(0.2)
+
+        assert fsync.call_count == 1
+        with open(self.file_path, 'r') as f:
+            assert f.read() == "one\n"
+
+    def test_unsynced_records_are_fsynced_on_close(self):
+        self.logfile = LogFileHandle(self.file_path, keepfileopen=True, fsyncpolicy=FsyncPolicyEnum.EVERY_N_RECORDS,
+                                     fsynceveryrecords=100)
+        with patch('logger.src.logFileHandle.os.fsync') as fsync:
+            self.logfile.write("one\n")
+            self.logfile.close()
+
+        assert fsync.call_count == 1
+
+    def test_open_per_write_records_are_fsynced_on_close(self):
+        self.logfile = LogFileHandle(self.file_path, fsyncpolicy=FsyncPolicyEnum.EVERY_N_RECORDS, fsynceveryrecords=100)
+        with patch('logger.src.logFileHandle.os.fsync') as fsync:
+            self.logfile.write("one\n")
+            self.logfile.close()
+
+        assert fsync.call_count == 1
+
+    def test_write_with_sync_fsyncs_whatever_the_policy(self):
+        self.logfile = LogFileHandle(self.file_path, fsyncpolicy=FsyncPolicyEnum.INTERVAL, fsynceveryms=60_000)
+        with patch('logger.src.logFileHandle.os.fsync') as fsync:
+            self.logfile.write("one\n", sync=True)
+            self.logfile.close()
+
+        assert fsync.call_count == 1
+
+    def teardown_method(self):
+        self.logfile.close()
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+def write_records_from_worker(file_path, worker):
+    logfile = LogFileHandle(file_path, keepfileopen=True, flusheveryrecords=50, processsafe=True)
+    for index in range(500):
+        logfile.write(f"worker-{worker} record-{index:04d} " + "x" * 100 + "\n")
+    logfile.close()
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+class TestLogFileHandleProcessSafe:
+
+    def setup_method(self):
+        self.file_path = 'file.txt'
+
+    def test_processes_writing_the_same_file_do_not_interleave_lines(self):
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=write_records_from_worker, args=(self.file_path, worker)) for worker in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        with open(self.file_path, 'r') as f:
+            lines = f.read().splitlines()
+
+        assert len(lines) == 2000
+        assert all(line.startswith("worker-") and line.endswith("x" * 100) and len(line) == 121 for line in lines)
+        for worker in range(4):
+            records = [line for line in lines if line.startswith(f"worker-{worker} ")]
+            assert records == sorted(records)
+
+    def test_forked_child_does_not_write_parent_buffer(self):
+        logfile = LogFileHandle(self.file_path, keepfileopen=True, flusheveryrecords=0, processsafe=True)
+        logfile.write("parent\n")
+
+        pid = os.fork()
+        if pid == 0:
+            logfile.write("child\n")
+            logfile.close()
+            os._exit(0)
+        os.waitpid(pid, 0)
+        logfile.close()
+
+        with open(self.file_path, 'r') as f:
+            assert f.read() == "child\nparent\n"
+
+    def test_async_writer_keeps_draining_in_forked_child(self):
+        writer = AsyncFileWriterLog(self.file_path, processsafe=True)
+
+        pid = os.fork()
+        if pid == 0:
+            writer.writelog({"message": "child"})
+            time.sleep(0.2)
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+        with open(self.file_path, 'r') as f:
+            assert f.read() == "child\n"
+
+    def test_rotation_is_rejected(self):
+        with pytest.raises(LoggerException) as logException:
+            LogFileHandle(self.file_path, processsafe=True, rotation=LogRotationPolicy(maxbytes=10))
+
+        assert LoggerExceptionMessageConstant.PROCESS_SAFE_ROTATION_EXCEPTION in str(logException.value)
+
+    def teardown_method(self):
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
@@ -0,0 +1,63 @@
+import os
+import json
+
+from logger.src.logFormatter import PipeLogFormatter, JsonLinesLogFormatter
+from logger.src.writeLogMessage import FileWriterLog
+from logger.src.logRecord import LogRecord
+
+class TestPipeLogFormatter:
+
+    def setup_method(self):
+        self.loggerjson = {"message": "hello", "level": "DEBUG", "servicename": "Service1"}
+
+    def test_fields_are_written_in_log_sequence(self):
+        assert PipeLogFormatter().format(self.loggerjson) == "Service1 || DEBUG || hello\n"
+
+    def test_custom_separator(self):
+        assert PipeLogFormatter(separator=" | ").format(self.loggerjson) == "Service1 | DEBUG | hello\n"
+
+class TestJsonLinesLogFormatter:
+
+    def setup_method(self):
+        self.loggerjson = {"message": "a || b\nc \"quoted\" é", "level": "DEBUG", "servicename": "Service1"}
+
+    def test_record_is_one_json_object_per_line(self):
+        line = JsonLinesLogFormatter(useorjson=False).format(self.loggerjson)
+
+        assert line.endswith("\n") and line.count("\n") == 1
+        assert list(json.loads(line).items()) == [("servicename", "Service1"), ("level", "DEBUG"), ("message", "a || b\nc \"quoted\" é")]
+
+    def test_orjson_backend_writes_the_same_record(self):
+        line = JsonLinesLogFormatter().format(self.loggerjson)
+
+        assert json.loads(line) == json.loads(JsonLinesLogFormatter(useorjson=False).format(self.loggerjson))
+
+class TestFormattersForLogRecord:
+
+    def setup_method(self):
+        self.record = LogRecord("a || b\n\"quoted\"", "DEBUG", "module.function")
+        self.record.servicename = "Service1"
+
+    def test_record_is_formatted_like_its_dictionary(self):
+        for formatter in (PipeLogFormatter(), JsonLinesLogFormatter(useorjson=False), JsonLinesLogFormatter()):
+            assert formatter.format(self.record) == formatter.format(self.record.todict())
+
+    def test_field_without_slot_is_read_through_mapping(self):
+        self.record["requestid"] = "request-1"
+
+        assert PipeLogFormatter(logsequence=("requestid", "message")).format(self.record) == "request-1 || a || b\n\"quoted\"\n"
+
+class TestFileWriterWithFormatter:
+
+    def setup_method(self):
+        self.file_path = 'file.txt'
+
+    def test_writer_uses_given_formatter(self):
+        FileWriterLog(self.file_path, formatter=JsonLinesLogFormatter(useorjson=False)).writelog({"message": "hello"})
+
+        with open(self.file_path, 'r') as f:
+            assert json.loads(f.read()) == {"message": "hello"}
+
+    def teardown_method(self):
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
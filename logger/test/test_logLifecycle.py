@@ -0,0 +1,83 @@
+import os
+import gc
+import weakref
+
+from logger.src.logLifecycle import LogLifecycleHooks
+from logger.src.logFileHandle import LogFileHandle
+from logger.src.writeLogMessage import AsyncFileWriterLog, FileWriterLog, MmapFileWriterLog
+from logger.src.logRouter import LogRoute, RoutingWriterLog
+from logger.src.logConstants import LogConstants
+
+from unittest.mock import patch
+
+class RecordingWriter:
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+
+    def close(self):
+        self.calls.append(self.name)
+
+class TestLogLifecycleHooks:
+
+    def setup_method(self):
+        self.file_path = 'file.txt'
+        self.atexit = patch.object(LogLifecycleHooks, '_LogLifecycleHooks__atexit', weakref.WeakKeyDictionary())
+        self.atexit.start()
+
+    def test_exit_hooks_run_newest_first_and_skip_collected_writers(self):
+        calls = []
+        writers = [RecordingWriter(name, calls) for name in ("first", "second", "third")]
+        for writer in writers:
+            LogLifecycleHooks.registeratexit(writer.close)
+        del writers[1]
+        gc.collect()
+
+        LogLifecycleHooks._LogLifecycleHooks__runatexit()
+
+        assert calls == ["third", "first"]
+
+    def test_closed_file_handle_is_not_kept_alive(self):
+        logfile = LogFileHandle(self.file_path, keepfileopen=True)
+        logfile.write("one\n")
+        logfile.close()
+        reference = weakref.ref(logfile)
+        del logfile
+        gc.collect()
+
+        assert reference() is None
+
+    def test_closed_async_writer_is_not_kept_alive(self):
+        writer = AsyncFileWriterLog(self.file_path)
+        writer.writelog({LogConstants.LOG_MESSAGE: "one"})
+        writer.close()
+        reference = weakref.ref(writer)
+        del writer
+        gc.collect()
+
+        assert reference() is None
+
+    def test_closed_router_and_routes_are_not_kept_alive(self):
+        router = RoutingWriterLog([LogRoute(FileWriterLog(self.file_path))])
+        router.writelog({LogConstants.LOG_MESSAGE: "one"})
+        router.close()
+        references = [weakref.ref(router), weakref.ref(router.routes[0])]
+        del router
+        gc.collect()
+
+        assert [reference() for reference in references] == [None, None]
+
+    def test_closed_mmap_writer_is_not_kept_alive(self):
+        writer = MmapFileWriterLog(self.file_path, segmentsize=1)
+        writer.writelog({LogConstants.LOG_MESSAGE: "one"})
+        writer.close()
+        reference = weakref.ref(writer)
+        del writer
+        gc.collect()
+
+        assert reference() is None
+
+    def teardown_method(self):
+        self.atexit.stop()
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
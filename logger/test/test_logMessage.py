@@ -0,0 +1,32 @@
+from logger.src.logMessage import LazyLogMessage, renderlogmessage
+from logger.src.logConstants import LogConstants
+
+class TestLazyLogMessage:
+
+    def test_template_is_formatted_with_args_and_kwargs(self):
+        assert LazyLogMessage("{} took {ms}ms", ("request",), {"ms": 5}).render() == "request took 5ms"
+
+    def test_callable_is_called_on_render(self):
+        assert LazyLogMessage(lambda: "built lazily").render() == "built lazily"
+
+    def test_template_not_matching_args_does_not_raise(self):
+        message = LazyLogMessage("{} and {}", ("one",)).render()
+
+        assert message.startswith("{} and {} [failed to format log message:")
+
+    def test_failing_callable_does_not_raise(self):
+        message = LazyLogMessage(lambda: 1 / 0).render()
+
+        assert "ZeroDivisionError" in message
+
+class TestRenderLogMessage:
+
+    def test_lazy_message_is_replaced_by_its_text(self):
+        loggerjson = {LogConstants.LOG_MESSAGE: LazyLogMessage("value {}", (1,))}
+
+        assert renderlogmessage(loggerjson) == {LogConstants.LOG_MESSAGE: "value 1"}
+
+    def test_plain_message_is_left_unchanged(self):
+        loggerjson = {LogConstants.LOG_MESSAGE: "value {}"}
+
+        assert renderlogmessage(loggerjson) == {LogConstants.LOG_MESSAGE: "value {}"}
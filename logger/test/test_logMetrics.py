@@ -0,0 +1,87 @@
+import os
+import threading
+import urllib.request
+
+from logger.src.logMetrics import LogMetricsRegistry, PROMETHEUS_CONTENT_TYPE
+
+class TestLogMetrics:
+
+    def setup_method(self):
+        self.file_path = 'metrics.prom'
+        self.registry = LogMetricsRegistry()
+        self.metrics = self.registry.sink("file")
+
+    def test_counters_of_every_thread_are_added_up_on_read(self):
+        def worker():
+            for _ in range(1000):
+                self.metrics.addaccepted()
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.metrics.addaccepted()
+
+        assert self.metrics.snapshot()["accepted"] == 8001
+        assert self.metrics.snapshot()["accepted"] == 8001
+
+    def test_writes_fill_cumulative_histograms(self):
+        self.metrics.observewrite(1, 0.00005)
+        self.metrics.observewrite(100, 0.002)
+        self.metrics.observewrite(3, 0.002, failed=True)
+        snapshot = self.metrics.snapshot()
+
+        assert (snapshot["written"], snapshot["failed"]) == (101, 3)
+        assert snapshot["batchsize"]["buckets"]["1"] == 1
+        assert snapshot["batchsize"]["buckets"]["8"] == 2
+        assert snapshot["batchsize"]["buckets"]["+Inf"] == snapshot["batchsize"]["count"] == 3
+        assert snapshot["batchsize"]["sum"] == 104
+        assert snapshot["writelatencyseconds"]["buckets"]["0.0001"] == 1
+        assert snapshot["writelatencyseconds"]["buckets"]["0.005"] == 3
+
+    def test_queue_gauges_track_depth_and_high_water_mark(self):
+        queue = [1, 2]
+        self.metrics.setqueuedepth(lambda: len(queue))
+        self.metrics.observequeue(5)
+        self.metrics.observequeue(3)
+        self.metrics.observedrainlag(0.5)
+        self.metrics.observedrainlag(0.1)
+        snapshot = self.metrics.snapshot()
+
+        assert (snapshot["queuedepth"], snapshot["queuehighwatermark"]) == (2, 5)
+        assert (snapshot["drainlagseconds"], snapshot["maxdrainlagseconds"]) == (0.1, 0.5)
+
+    def test_prometheus_text_has_a_sample_per_sink(self):
+        self.registry.sink("audit").adddropped(2)
+        self.metrics.observewrite(4, 0.001)
+        text = self.registry.toprometheus()
+
+        assert '# TYPE logger_records_dropped_total counter' in text
+        assert 'logger_records_dropped_total{sink="audit"} 2' in text
+        assert 'logger_records_written_total{sink="file"} 4' in text
+        assert 'logger_batch_records_bucket{sink="file",le="8"} 1' in text
+        assert 'logger_write_latency_seconds_count{sink="file"} 1' in text
+        assert text.endswith("\n")
+
+    def test_prometheus_text_is_written_to_file(self):
+        self.metrics.addaccepted(3)
+        self.registry.writeprometheus(self.file_path)
+
+        with open(self.file_path, 'r') as f:
+            assert 'logger_records_accepted_total{sink="file"} 3' in f.read()
+
+    def test_prometheus_text_is_served_over_http(self):
+        self.metrics.addfiltered(7)
+        server = self.registry.serveprometheus(0)
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics", timeout=5) as response:
+                assert response.headers["Content-Type"] == PROMETHEUS_CONTENT_TYPE
+                assert 'logger_records_filtered_total{sink="file"} 7' in response.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def teardown_method(self):
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
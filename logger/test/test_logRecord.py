@@ -0,0 +1,58 @@
+import pytest
+
+from logger.src.logRecord import LogRecord
+from logger.src.logConstants import LogConstants
+
+class TestLogRecord:
+
+    def setup_method(self):
+        self.record = LogRecord("hello", "DEBUG", "module.function", 1769688161641322000)
+
+    def test_record_reads_like_logger_json(self):
+        assert self.record[LogConstants.LOG_MESSAGE] == "hello"
+        assert LogConstants.LOG_LEVEL in self.record
+        assert LogConstants.LOG_TIMESTAMP not in self.record
+        assert self.record.get(LogConstants.LOG_SERVICE_NAME) is None
+        assert len(self.record) == 3
+
+    def test_setting_a_key_sets_its_slot(self):
+        self.record[LogConstants.LOG_SERVICE_NAME] = "Service1"
+
+        assert self.record.servicename == "Service1"
+
+    def test_keys_without_slot_are_kept_as_extra_fields(self):
+        self.record["requestid"] = "request-1"
+
+        assert self.record["requestid"] == "request-1"
+        assert list(self.record) == [LogConstants.LOG_FUNCTION_NAME, LogConstants.LOG_LEVEL, LogConstants.LOG_MESSAGE, "requestid"]
+
+    def test_copy_is_independent_of_record(self):
+        self.record["requestid"] = "request-1"
+        record = self.record.copy()
+        record[LogConstants.LOG_MESSAGE] = "changed"
+        record["requestid"] = "request-2"
+
+        assert self.record[LogConstants.LOG_MESSAGE] == "hello"
+        assert self.record["requestid"] == "request-1"
+        assert record.timestampns == self.record.timestampns
+
+    def test_todict_returns_plain_logger_json(self):
+        self.record |= {LogConstants.LOG_SERVICE_NAME: "Service1", "requestid": "request-1"}
+
+        loggerjson = self.record.todict()
+
+        assert type(loggerjson) is dict
+        assert loggerjson == {LogConstants.LOG_MESSAGE: "hello", LogConstants.LOG_LEVEL: "DEBUG",
+                              LogConstants.LOG_FUNCTION_NAME: "module.function",
+                              LogConstants.LOG_SERVICE_NAME: "Service1", "requestid": "request-1"}
+        assert self.record == loggerjson
+
+    def test_deleting_a_field(self):
+        del self.record[LogConstants.LOG_LEVEL]
+
+        assert LogConstants.LOG_LEVEL not in self.record
+        with pytest.raises(KeyError):
+            del self.record[LogConstants.LOG_LEVEL]
+
+    def test_record_has_no_instance_dictionary(self):
+        assert not hasattr(self.record, "__dict__")
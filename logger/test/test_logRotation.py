@@ -0,0 +1,98 @@
+import os
+import gzip
+import shutil
+import tempfile
+
+from logger.src.logFileHandle import LogFileHandle
+from logger.src.logRotation import LogRotationPolicy
+from logger.src.writeLogMessage import AsyncFileWriterLog
+
+from unittest.mock import patch
+
+class TestLogRotationBySize:
+
+    def setup_method(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, 'file.txt')
+
+    def backups(self):
+        return sorted(name for name in os.listdir(self.directory) if name != 'file.txt')
+
+    def test_file_rolls_over_when_max_bytes_is_exceeded(self):
+        logfile = LogFileHandle(self.file_path, rotation=LogRotationPolicy(maxbytes=10, backupcount=0))
+        logfile.write("123456\n")
+        logfile.write("abcdef\n")
+
+        with open(self.file_path, 'r') as f:
+            assert f.read() == "abcdef\n"
+        assert len(self.backups()) == 1
+
+    def test_only_backup_count_backups_are_kept(self):
+        logfile = LogFileHandle(self.file_path, keepfileopen=True, rotation=LogRotationPolicy(maxbytes=4, backupcount=2))
+        for index in range(5):
+            logfile.write(f"{index}{index}{index}\n")
+        logfile.waitforrotation()
+        logfile.close()
+
+        backups = self.backups()
+        assert len(backups) == 2
+        with open(os.path.join(self.directory, backups[-1]), 'r') as f:
+            assert f.read() == "333\n"
+
+    def test_rotated_files_are_compressed(self):
+        logfile = LogFileHandle(self.file_path, rotation=LogRotationPolicy(maxbytes=4, compress=True))
+        logfile.write("one\n")
+        logfile.write("two\n")
+        logfile.waitforrotation()
+
+        backups = self.backups()
+        assert len(backups) == 1 and backups[0].endswith(".gz")
+        with gzip.open(os.path.join(self.directory, backups[0]), 'rt') as f:
+            assert f.read() == "one\n"
+
+    def test_async_writer_rotates_file(self):
+        writer = AsyncFileWriterLog(self.file_path, rotation=LogRotationPolicy(maxbytes=4, backupcount=0))
+        writer._AsyncFileWriterLog__write_to_file(["one\n"], 1)
+        writer._AsyncFileWriterLog__write_to_file(["two\n"], 1)
+
+        with open(self.file_path, 'r') as f:
+            assert f.read() == "two\n"
+        assert len(self.backups()) == 1
+
+    def teardown_method(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+class TestLogRotationByTime:
+
+    def setup_method(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, 'file.txt')
+
+    def test_file_rolls_over_on_interval_boundary(self):
+        with patch("logger.src.logRotation.time.time", return_value=7200.5):
+            logfile = LogFileHandle(self.file_path, rotation=LogRotationPolicy(rotateeveryseconds=3600, backupcount=0))
+            logfile.write("one\n")
+            logfile.write("two\n")
+
+        with patch("logger.src.logRotation.time.time", return_value=10800.0):
+            logfile.write("three\n")
+
+        with open(self.file_path, 'r') as f:
+            assert f.read() == "three\n"
+        assert len(os.listdir(self.directory)) == 2
+
+    def test_first_record_after_an_idle_boundary_starts_the_interval(self):
+        with patch("logger.src.logRotation.time.time", return_value=7200.5):
+            logfile = LogFileHandle(self.file_path, rotation=LogRotationPolicy(rotateeveryseconds=3600, backupcount=0))
+
+        with patch("logger.src.logRotation.time.time", return_value=10800.0):
+            logfile.write("one\n")
+        with patch("logger.src.logRotation.time.time", return_value=10801.0):
+            logfile.write("two\n")
+
+        with open(self.file_path, 'r') as f:
+            assert f.read() == "one\ntwo\n"
+        assert os.listdir(self.directory) == ['file.txt']
+
+    def teardown_method(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,118 @@
+import os
+import json
+import threading
+import pytest
+
+from collections import deque
+from logger.src.logRouter import LogRoute, RoutingWriterLog
+from logger.src.writeLogMessage import FileWriterLog, WriteLogsInQueue
+from logger.src.logFormatter import PipeLogFormatter, JsonLinesLogFormatter
+from logger.src.logConstants import LogConstants
+from logger.src.logLevelEnum import LoglevelEnum
+from logger.src.logMessage import LazyLogMessage
+from logger.src.logRecord import LogRecord
+from logger.src.logMetrics import LogMetricsRegistry
+
+from unittest.mock import patch
+
+class SlowWriterLog:
+    def __init__(self):
+        self.release = threading.Event()
+        self.records = []
+
+    def writelog(self, loggerjson):
+        self.release.wait(timeout=5)
+        self.records.append(loggerjson)
+
+class TestLogRouter:
+
+    def setup_method(self):
+        self.file_path = 'file.txt'
+        self.error_path = 'errors.txt'
+        self.router = None
+
+    def read_lines(self, path):
+        with open(path, 'r') as f:
+            return f.read().splitlines()
+
+    def test_records_are_routed_by_level(self):
+        self.router = RoutingWriterLog([LogRoute(FileWriterLog(self.file_path)),
+                                        LogRoute(FileWriterLog(self.error_path), minloglevel=LoglevelEnum.ERROR)])
+        self.router.writelog({LogConstants.LOG_LEVEL: LoglevelEnum.INFO.value, LogConstants.LOG_MESSAGE: "info"})
+        self.router.writelog({LogConstants.LOG_LEVEL: LoglevelEnum.ERROR.value, LogConstants.LOG_MESSAGE: "error"})
+
+        assert self.router.flush(timeout=5)
+        assert self.read_lines(self.file_path) == [f"{LoglevelEnum.INFO.value} || info", f"{LoglevelEnum.ERROR.value} || error"]
+        assert self.read_lines(self.error_path) == [f"{LoglevelEnum.ERROR.value} || error"]
+
+    def test_record_is_formatted_once_for_routes_with_equal_formatters(self):
+        self.router = RoutingWriterLog([LogRoute(FileWriterLog(self.file_path)),
+                                        LogRoute(FileWriterLog(self.error_path, formatter=PipeLogFormatter()))])
+        with patch.object(PipeLogFormatter, 'format', autospec=True, return_value="line\n") as format:
+            self.router.writelog({LogConstants.LOG_MESSAGE: "message"})
+            assert self.router.flush(timeout=5)
+
+        assert format.call_count == 1
+        assert self.read_lines(self.file_path) == self.read_lines(self.error_path) == ["line"]
+
+    def test_routes_with_different_formatters_format_separately(self):
+        self.router = RoutingWriterLog([LogRoute(FileWriterLog(self.file_path)),
+                                        LogRoute(FileWriterLog(self.error_path, formatter=JsonLinesLogFormatter()))])
+        self.router.writelog({LogConstants.LOG_MESSAGE: "message"})
+
+        assert self.router.flush(timeout=5)
+        assert self.read_lines(self.file_path) == ["message"]
+        assert [json.loads(line) for line in self.read_lines(self.error_path)] == [{"message": "message"}]
+
+    def test_lazy_message_is_rendered_once(self):
+        logqueue = deque()
+        render = patch.object(LazyLogMessage, 'render', autospec=True, return_value="rendered")
+        self.router = RoutingWriterLog([LogRoute(FileWriterLog(self.file_path)), LogRoute(WriteLogsInQueue(logqueue))])
+        with render as rendered:
+            self.router.writelog(LogRecord(LazyLogMessage("{}", ("rendered",))))
+            assert self.router.flush(timeout=5)
+
+        assert rendered.call_count == 1
+        assert self.read_lines(self.file_path) == ["rendered"]
+        assert logqueue[0] == {LogConstants.LOG_MESSAGE: "rendered"}
+        assert type(logqueue[0]) is dict
+
+    def test_slow_route_does_not_stall_other_routes(self):
+        slow = SlowWriterLog()
+        self.router = RoutingWriterLog([LogRoute(slow, maxqueuesize=2), LogRoute(FileWriterLog(self.file_path))])
+        for index in range(10):
+            self.router.writelog({LogConstants.LOG_MESSAGE: f"record-{index}"})
+
+        assert self.router.routes[1]._flush(None)
+        assert self.read_lines(self.file_path) == [f"record-{index}" for index in range(10)]
+        assert self.router.routes[0].droppedcount > 0
+
+        slow.release.set()
+        assert self.router.flush(timeout=5)
+        assert len(slow.records) + self.router.routes[0].droppedcount == 10
+
+    def test_close_drains_routes_and_stops_workers(self):
+        self.router = RoutingWriterLog([LogRoute(FileWriterLog(self.file_path), maxlatencyms=60_000)])
+        self.router.writelog({LogConstants.LOG_MESSAGE: "message"})
+
+        assert self.router.close(timeout=5) == 0
+        assert not self.router.routes[0]._LogRoute__worker.is_alive()
+        assert self.read_lines(self.file_path) == ["message"]
+
+    def test_route_metrics_count_filtered_and_written_records(self):
+        metrics = LogMetricsRegistry().sink("errors")
+        self.router = RoutingWriterLog([LogRoute(FileWriterLog(self.error_path), minloglevel=LoglevelEnum.ERROR, metrics=metrics)])
+        self.router.writelog({LogConstants.LOG_LEVEL: LoglevelEnum.INFO.value, LogConstants.LOG_MESSAGE: "info"})
+        self.router.writelog({LogConstants.LOG_LEVEL: LoglevelEnum.ERROR.value, LogConstants.LOG_MESSAGE: "error"})
+
+        assert self.router.flush(timeout=5)
+        snapshot = metrics.snapshot()
+
+        assert (snapshot["accepted"], snapshot["filtered"], snapshot["written"]) == (1, 1, 1)
+
+    def teardown_method(self):
+        if self.router is not None:
+            self.router.close()
+        for path in (self.file_path, self.error_path):
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,85 @@
+import threading
+import pytest
+
+from logger.src.logSampling import LogSampler, EveryNLogSampler, ProbabilisticLogSampler, RateLimitLogSampler
+
+from unittest.mock import patch
+
+class SamplerWithoutAdmit(LogSampler):
+    pass
+
+class TestLogSampling:
+
+    def test_sampler_without_admit_can_not_be_created(self):
+        with pytest.raises(TypeError):
+            SamplerWithoutAdmit()
+
+    def test_every_n_admits_first_record_and_one_in_n(self):
+        sampler = EveryNLogSampler(3)
+        admitted = [sampler.sample("site") is not None for _ in range(7)]
+
+        assert admitted == [True, False, False, True, False, False, True]
+
+    def test_every_n_counts_exactly_across_threads(self):
+        sampler = EveryNLogSampler(10)
+        admitted = []
+
+        def worker():
+            admitted.extend(1 for _ in range(10_000) if sampler.sample("site") is not None)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(admitted) == 4000
+
+    def test_sites_are_sampled_independently(self):
+        sampler = EveryNLogSampler(2)
+
+        assert sampler.sample("first") is not None
+        assert sampler.sample("second") is not None
+        assert sampler.sample("first") is None
+
+    def test_summary_reports_suppressed_records_once_per_interval(self):
+        sampler = EveryNLogSampler(2, summaryintervalms=60_000)
+
+        assert sampler.sample("site") == 0
+        assert sampler.sample("site") is None
+        with patch('logger.src.logSampling.time.monotonic', return_value=10**9):
+            assert sampler.sample("site") == 1
+            assert sampler.sample("site") is None
+            assert sampler.sample("site") == 0
+
+    def test_site_that_stopped_logging_is_reported_once_quiet(self):
+        sampler = EveryNLogSampler(10, summaryintervalms=0)
+        sampler.sample("site", "origin")
+        sampler.sample("site", "origin")
+        sampler.sample("site", "origin")
+
+        assert sampler.takesummaries() == []
+        assert sampler.takesummaries() == [("origin", 2)]
+        assert sampler.takesummaries() == []
+
+    def test_forced_summaries_report_every_site_right_away(self):
+        sampler = EveryNLogSampler(10, summaryintervalms=60_000)
+        for _ in range(3):
+            sampler.sample("first", "first")
+        sampler.sample("second", "second")
+
+        assert sampler.takesummaries(force=True) == [("first", 2)]
+
+    def test_probabilistic_admits_records_below_rate(self):
+        sampler = ProbabilisticLogSampler(0.5)
+        with patch.object(sampler, '_ProbabilisticLogSampler__random', side_effect=[0.2, 0.7]):
+            assert sampler.sample("site") is not None
+            assert sampler.sample("site") is None
+
+    def test_rate_limit_admits_burst_then_refills(self):
+        with patch('logger.src.logSampling.time.monotonic', return_value=100.0) as monotonic:
+            sampler = RateLimitLogSampler(2, burst=3)
+            assert [sampler.sample("site") is not None for _ in range(4)] == [True, True, True, False]
+
+            monotonic.return_value = 101.0
+            assert [sampler.sample("site") is not None for _ in range(3)] == [True, True, False]
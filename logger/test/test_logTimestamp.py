@@ -0,0 +1,47 @@
+from logger.src.logTimestamp import LogTimestampFormatter
+from logger.src.timestampFormatEnum import TimestampFormatEnum
+
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+class TestLogTimestampFormatter:
+
+    def setup_method(self):
+        self.datetime = datetime(2026, 1, 29, 12, 2, 41, 641322, tzinfo=timezone.utc)
+        self.timestampns = int(self.datetime.replace(microsecond=0).timestamp()) * 1_000_000_000 + 641322789
+
+    def test_default_format_matches_str_of_datetime(self):
+        formatter = LogTimestampFormatter()
+
+        assert formatter.format(self.timestampns) == str(self.datetime)
+        assert formatter.format(self.timestampns - 641322789) == str(self.datetime.replace(microsecond=0))
+
+    def test_iso8601_format(self):
+        formatter = LogTimestampFormatter(ZoneInfo("Asia/Kolkata"), TimestampFormatEnum.ISO8601)
+
+        assert formatter.format(self.timestampns) == "2026-01-29T17:32:41.641322+05:30"
+
+    def test_rfc3339_format_uses_z_for_utc(self):
+        formatter = LogTimestampFormatter(timestampformat=TimestampFormatEnum.RFC3339)
+
+        assert formatter.format(self.timestampns - 641322789) == "2026-01-29T12:02:41.000000Z"
+
+    def test_epoch_ns_format(self):
+        formatter = LogTimestampFormatter(timestampformat=TimestampFormatEnum.EPOCH_NS)
+
+        assert formatter.format(self.timestampns) == str(self.timestampns)
+
+    def test_cached_second_is_rendered_again_on_the_next_second(self):
+        formatter = LogTimestampFormatter(ZoneInfo("Europe/Berlin"))
+
+        for offset in range(0, 3_000_000_000, 250_000_000):
+            timestampns = self.timestampns + offset
+            expected = datetime.fromtimestamp(timestampns // 1000 / 1_000_000, ZoneInfo("Europe/Berlin"))
+            assert formatter.format(timestampns) == str(expected)
+
+    def test_offset_changes_across_daylight_saving_time(self):
+        formatter = LogTimestampFormatter(ZoneInfo("Europe/Berlin"))
+        transition = int(datetime(2026, 3, 29, 1, 0, tzinfo=timezone.utc).timestamp()) * 1_000_000_000
+
+        assert formatter.format(transition - 1_000_000_000) == "2026-03-29 01:59:59+01:00"
+        assert formatter.format(transition) == "2026-03-29 03:00:00+02:00"
@@ -1,185 +1,522 @@
-from unittest.mock import patch
-from logger import Logger
-import pytest
-import threading
-from logger.src.loggerException import LoggerException, LoggerExceptionMessageConstant
-from logger.src.logLevelEnum import LoglevelEnum
-from logger.src.logConstants import LogConstants
-from logger.src.loggerMessageDecorators import SimpleLogger
-
-class TestLogger:
-
-    def setup_method(self):
-        Logger._instance = None
-        Logger._thread_functionname = {}
-        Logger._isfunctionlevel_enable = {}
-        Logger._isgloballoggerenable = True
-        Logger._Logger__loggerMessageDecorator = SimpleLogger()
-        Logger._Logger__writeLoggerStrategy = None
-        Logger._Logger__includefunctionname = True
-        Logger._Logger__includeloglevel = True
-
-    def test_LoggerInitialization(self):
-        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
-            mock_writer_log = MockFileWriterLog.return_value 
-            
-        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
-            new_mock_writer_log = MockFileWriterLog.return_value 
-
-        logger = Logger(mock_writer_log)
-        newlogger = Logger(new_mock_writer_log)
-        
-        assert logger is newlogger
-        
-    def test_logger_singleton_thread_safety(self): 
-        instances = []
-        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
-            write_strategy = MockFileWriterLog.return_value 
-
-        def create():
-            instances.append(Logger(write_strategy))
-
-        threads = [threading.Thread(target=create) for _ in range(20)]
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
-
-        assert all(inst is instances[0] for inst in instances)
-    
-
-    def test_logger_init_only_first_time(self):
-        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
-            write_strategy = MockFileWriterLog.return_value 
-
-        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
-            other_strategy = MockFileWriterLog.return_value 
-
-        logger1 = Logger(write_strategy, includeloglevel=False)
-        logger2 = Logger(other_strategy, includeloglevel=True)
-
-        assert logger1 is logger2
-
-    def test_log_before_init_raises(self):
-        with pytest.raises(LoggerException) as logException:
-            Logger.log("This should raise an exception.")
-        
-        assert LoggerExceptionMessageConstant.LOGGER_INSTANTIATION_EXCEPTION in str(logException.value)
-
-    def test_log_does_not_happen_if_global_logger_disabled(self):
-        # Create a mock write strategy
-        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
-            mock_write_strategy = MockFileWriterLog.return_value 
-
-        # Initialize the logger with global logging disabled
-        logger = Logger(
-            writeLoggerStrategy=mock_write_strategy,
-            isgloballoggerenable=False
-        )
-
-        # Attempt to log a message
-        Logger.log("This should not be logged")
-
-        # Assert that writelog was never called
-        mock_write_strategy.writelog.assert_not_called()
-
-    def test_if_decorator_is_not_passed_and_used_log_directly_gives_an_exception(self):
-        # Create a mock write strategy
-        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
-            mock_write_strategy = MockFileWriterLog.return_value 
-
-        with pytest.raises(LoggerException) as logException:
-            # Initialize the logger with global logging disabled
-            logger = Logger(
-                writeLoggerStrategy=mock_write_strategy,
-                includeloglevel = True,
-                includefunctionname = False
-            )
-
-            def decorated_function():
-                    # Attempt to log a message
-                    Logger.log("This should not be logged")
-                
-            decorated_function()
-        
-        assert LoggerExceptionMessageConstant.LOGGER_DECORATOR_REQUIRED in str(logException.value)
-
-    def test_if_log_level_is_true_and_not_provide_log_level_exception(self):
-        # Create a mock write strategy
-        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
-            mock_write_strategy = MockFileWriterLog.return_value 
-
-        with pytest.raises(LoggerException) as logException:
-            # Initialize the logger with global logging disabled
-            logger = Logger(
-                writeLoggerStrategy=mock_write_strategy,
-                includeloglevel = True,
-                includefunctionname = False
-            )
-
-            with patch("logger.src.loggerDecorator.gaurav_logger", lambda func: func) as gaurav_logger:
-                @gaurav_logger
-                def decorated_function():
-                    # Attempt to log a message
-                    Logger.log("This should not be logged")
-                
-                decorated_function()
-        
-            assert LoggerExceptionMessageConstant.LOGGER_INCLUDE_LOG_LEVEL_EXCEPTION in str(logException.value)
-
-    def test_sending_logger_json_to_coresponding_strategy_function_to_write_logs(self):
-
-        # Create a mock write strategy
-        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
-            mock_write_strategy = MockFileWriterLog.return_value 
-
-        message = "This should not be logged"
-        functionname = "decorated_function"
-        
-        with pytest.raises(LoggerException) as logException:
-            # Initialize the logger with global logging disabled
-            logger = Logger(
-                writeLoggerStrategy=mock_write_strategy,
-                includeloglevel = True,
-                includefunctionname = False
-            )
-
-            Logger._thread_functionname[threading.get_ident()] = functionname        
-
-            with patch("logger.src.loggerDecorator.gaurav_logger", lambda func: func) as gaurav_logger:
-                @gaurav_logger
-                def decorated_function():
-                    # Attempt to log a message
-                    Logger.log(message, LoglevelEnum.DEBUG)
-                
-                decorated_function()
-
-                logger_json = {LogConstants.LOG_LEVEL: LoglevelEnum.DEBUG.value, LogConstants.LOG_MESSAGE: message, LogConstants.LOG_FUNCTION_NAME: functionname}
-                
-                mock_write_strategy.writelog.assert_called_once_with(logger_json)
-
-    def teardown_method(self):
-        Logger._instance = None
-        Logger._thread_functionname = {}
-        Logger._isfunctionlevel_enable = {}
-        Logger._isgloballoggerenable = True
-        Logger._Logger__loggerMessageDecorator = SimpleLogger()
-        Logger._Logger__writeLoggerStrategy = None
-        Logger._Logger__includefunctionname = True
-        Logger._Logger__includeloglevel = True
-        
-
-
-
-
-        
-        
-
-        
-
-        
-
-
-
-    
-
+from unittest.mock import patch, MagicMock, AsyncMock
+from logger import Logger
+from logger.src.logger import ThreadFunctionStack
+import pytest
+import threading
+import asyncio
+from logger.src.loggerException import LoggerException, LoggerExceptionMessageConstant
+from logger.src.logLevelEnum import LoglevelEnum
+from logger.src.logConstants import LogConstants
+from logger.src.loggerMessageDecorators import SimpleLogger
+from logger.src.loggerDecorator import gaurav_logger
+from logger.src.logMessage import LazyLogMessage
+from logger.src.logRecord import LogRecord
+from logger.src.logSampling import EveryNLogSampler
+from logger.src.logMetrics import LogMetricsRegistry
+
+class TestLogger:
+
+    def setup_method(self):
+        Logger._instance = None
+        Logger._thread_functionstack = ThreadFunctionStack()
+        Logger._isfunctionlevel_enable = {}
+        Logger._isgloballoggerenable = True
+        Logger._Logger__loggerMessageDecorator = SimpleLogger()
+        Logger._Logger__writeLoggerStrategy = None
+        Logger._Logger__includefunctionname = True
+        Logger._Logger__includeloglevel = True
+        Logger._minlogseverity = 0
+        Logger._functionminlogseverity = {}
+        Logger._functionsampler = {}
+
+    def test_LoggerInitialization(self):
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            mock_writer_log = MockFileWriterLog.return_value 
+            
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            new_mock_writer_log = MockFileWriterLog.return_value 
+
+        logger = Logger(mock_writer_log)
+        newlogger = Logger(new_mock_writer_log)
+        
+        assert logger is newlogger
+        
+    def test_logger_singleton_thread_safety(self): 
+        instances = []
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            write_strategy = MockFileWriterLog.return_value 
+
+        def create():
+            instances.append(Logger(write_strategy))
+
+        threads = [threading.Thread(target=create) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert all(inst is instances[0] for inst in instances)
+    
+
+    def test_logger_init_only_first_time(self):
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            write_strategy = MockFileWriterLog.return_value 
+
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            other_strategy = MockFileWriterLog.return_value 
+
+        logger1 = Logger(write_strategy, includeloglevel=False)
+        logger2 = Logger(other_strategy, includeloglevel=True)
+
+        assert logger1 is logger2
+
+    def test_log_before_init_raises(self):
+        with pytest.raises(LoggerException) as logException:
+            Logger.log("This should raise an exception.")
+        
+        assert LoggerExceptionMessageConstant.LOGGER_INSTANTIATION_EXCEPTION in str(logException.value)
+
+    def test_log_does_not_happen_if_global_logger_disabled(self):
+        # Create a mock write strategy
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            mock_write_strategy = MockFileWriterLog.return_value 
+
+        # Initialize the logger with global logging disabled
+        logger = Logger(
+            writeLoggerStrategy=mock_write_strategy,
+            isgloballoggerenable=False
+        )
+
+        # Attempt to log a message
+        Logger.log("This should not be logged")
+
+        # Assert that writelog was never called
+        mock_write_strategy.writelog.assert_not_called()
+
+    def test_if_decorator_is_not_passed_and_used_log_directly_gives_an_exception(self):
+        # Create a mock write strategy
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            mock_write_strategy = MockFileWriterLog.return_value 
+
+        with pytest.raises(LoggerException) as logException:
+            # Initialize the logger with global logging disabled
+            logger = Logger(
+                writeLoggerStrategy=mock_write_strategy,
+                includeloglevel = True,
+                includefunctionname = False
+            )
+
+            def decorated_function():
+                    # Attempt to log a message
+                    Logger.log("This should not be logged")
+                
+            decorated_function()
+        
+        assert LoggerExceptionMessageConstant.LOGGER_DECORATOR_REQUIRED in str(logException.value)
+
+    def test_if_log_level_is_true_and_not_provide_log_level_exception(self):
+        # Create a mock write strategy
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            mock_write_strategy = MockFileWriterLog.return_value 
+
+        with pytest.raises(LoggerException) as logException:
+            # Initialize the logger with global logging disabled
+            logger = Logger(
+                writeLoggerStrategy=mock_write_strategy,
+                includeloglevel = True,
+                includefunctionname = False
+            )
+
+            with patch("logger.src.loggerDecorator.gaurav_logger", lambda func: func) as gaurav_logger:
+                @gaurav_logger
+                def decorated_function():
+                    # Attempt to log a message
+                    Logger.log("This should not be logged")
+                
+                decorated_function()
+        
+            assert LoggerExceptionMessageConstant.LOGGER_INCLUDE_LOG_LEVEL_EXCEPTION in str(logException.value)
+
+    def test_sending_logger_json_to_coresponding_strategy_function_to_write_logs(self):
+
+        # Create a mock write strategy
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            mock_write_strategy = MockFileWriterLog.return_value 
+
+        message = "This should not be logged"
+        functionname = "decorated_function"
+        
+        with pytest.raises(LoggerException) as logException:
+            # Initialize the logger with global logging disabled
+            logger = Logger(
+                writeLoggerStrategy=mock_write_strategy,
+                includeloglevel = True,
+                includefunctionname = False
+            )
+
+            Logger._thread_functionstack.stack.append(functionname)        
+
+            with patch("logger.src.loggerDecorator.gaurav_logger", lambda func: func) as gaurav_logger:
+                @gaurav_logger
+                def decorated_function():
+                    # Attempt to log a message
+                    Logger.log(message, LoglevelEnum.DEBUG)
+                
+                decorated_function()
+
+                logger_json = {LogConstants.LOG_LEVEL: LoglevelEnum.DEBUG.value, LogConstants.LOG_MESSAGE: message, LogConstants.LOG_FUNCTION_NAME: functionname}
+                
+                mock_write_strategy.writelog.assert_called_once_with(logger_json)
+
+    def test_logs_below_min_log_level_are_not_written(self):
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            mock_write_strategy = MockFileWriterLog.return_value 
+
+        Logger(writeLoggerStrategy=mock_write_strategy, minloglevel=LoglevelEnum.WARNING)
+
+        @gaurav_logger()
+        def decorated_function():
+            Logger.log("debug message", LoglevelEnum.DEBUG)
+            Logger.log("error message", LoglevelEnum.ERROR)
+
+        decorated_function()
+
+        mock_write_strategy.writelog.assert_called_once()
+        assert mock_write_strategy.writelog.call_args.args[0][LogConstants.LOG_MESSAGE] == "error message"
+
+    def test_filtered_log_does_not_build_log_message(self):
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            mock_write_strategy = MockFileWriterLog.return_value 
+
+        Logger(writeLoggerStrategy=mock_write_strategy, minloglevel=LoglevelEnum.INFO)
+
+        with patch.object(Logger, "_Logger__loggerMessageDecorator") as mock_decorator:
+            # no decorator is needed because the log is discarded before the function lookup
+            Logger.log("debug message", LoglevelEnum.DEBUG)
+
+        mock_decorator.getLog.assert_not_called()
+        mock_write_strategy.writelog.assert_not_called()
+
+    def test_setloglevel_changes_min_log_level_at_runtime(self):
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            mock_write_strategy = MockFileWriterLog.return_value 
+
+        Logger(writeLoggerStrategy=mock_write_strategy, minloglevel=LoglevelEnum.ERROR)
+
+        @gaurav_logger()
+        def decorated_function():
+            Logger.log("info message", LoglevelEnum.INFO)
+
+        decorated_function()
+        Logger.setloglevel(LoglevelEnum.DEBUG)
+        decorated_function()
+
+        mock_write_strategy.writelog.assert_called_once()
+
+    def test_function_min_log_level_is_applied(self):
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            mock_write_strategy = MockFileWriterLog.return_value 
+
+        Logger(writeLoggerStrategy=mock_write_strategy)
+
+        @gaurav_logger(minloglevel=LoglevelEnum.ERROR)
+        def quiet_function():
+            Logger.log("info message", LoglevelEnum.INFO)
+
+        @gaurav_logger()
+        def verbose_function():
+            Logger.log("info message", LoglevelEnum.INFO)
+
+        quiet_function()
+        verbose_function()
+
+        mock_write_strategy.writelog.assert_called_once()
+        assert mock_write_strategy.writelog.call_args.args[0][LogConstants.LOG_FUNCTION_NAME].endswith("verbose_function")
+
+    def test_logwithack_returns_ack_of_write_strategy(self):
+        with patch("logger.src.writeLogMessage.AsyncFileWriterLog") as MockAsyncFileWriterLog:
+            mock_write_strategy = MockAsyncFileWriterLog.return_value
+
+        Logger(writeLoggerStrategy=mock_write_strategy, minloglevel=LoglevelEnum.INFO)
+
+        @gaurav_logger()
+        def decorated_function():
+            return Logger.logwithack("audit", LoglevelEnum.INFO), Logger.logwithack("debug", LoglevelEnum.DEBUG)
+
+        ack, suppressed = decorated_function()
+
+        assert ack is mock_write_strategy.writelogwithack.return_value
+        assert suppressed is None
+        mock_write_strategy.writelogwithack.assert_called_once()
+
+    def test_message_template_is_formatted_with_args(self):
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            mock_write_strategy = MockFileWriterLog.return_value 
+
+        Logger(writeLoggerStrategy=mock_write_strategy)
+
+        @gaurav_logger()
+        def decorated_function():
+            Logger.log("user {} took {ms}ms", LoglevelEnum.INFO, "alice", ms=12)
+
+        decorated_function()
+
+        assert mock_write_strategy.writelog.call_args.args[0][LogConstants.LOG_MESSAGE] == "user alice took 12ms"
+
+    def test_lazy_message_is_not_built_for_disabled_function(self):
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            mock_write_strategy = MockFileWriterLog.return_value 
+
+        Logger(writeLoggerStrategy=mock_write_strategy)
+        buildmessage = MagicMock(return_value="expensive message")
+
+        @gaurav_logger(enable=False)
+        def disabled_function():
+            Logger.log(buildmessage, LoglevelEnum.INFO)
+
+        @gaurav_logger()
+        def enabled_function():
+            Logger.log(buildmessage, LoglevelEnum.INFO)
+
+        disabled_function()
+        buildmessage.assert_not_called()
+
+        enabled_function()
+        buildmessage.assert_called_once()
+        assert mock_write_strategy.writelog.call_args.args[0][LogConstants.LOG_MESSAGE] == "expensive message"
+
+    def test_lazy_message_is_passed_unrendered_to_deferring_strategy(self):
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            mock_write_strategy = MockFileWriterLog.return_value 
+        mock_write_strategy.defersmessageformatting = True
+
+        Logger(writeLoggerStrategy=mock_write_strategy)
+
+        @gaurav_logger()
+        def decorated_function():
+            Logger.log("value {}", LoglevelEnum.INFO, 42)
+
+        decorated_function()
+
+        message = mock_write_strategy.writelog.call_args.args[0][LogConstants.LOG_MESSAGE]
+        assert isinstance(message, LazyLogMessage) and message.render() == "value 42"
+
+    def test_strategy_accepting_log_record_receives_log_record(self):
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            mock_write_strategy = MockFileWriterLog.return_value 
+        mock_write_strategy.acceptslogrecord = True
+
+        Logger(writeLoggerStrategy=mock_write_strategy)
+
+        @gaurav_logger()
+        def decorated_function():
+            Logger.log("message", LoglevelEnum.INFO)
+
+        decorated_function()
+
+        record = mock_write_strategy.writelog.call_args.args[0]
+        assert isinstance(record, LogRecord) and record.message == "message" and record.timestampns > 0
+
+    def test_other_strategies_receive_a_dictionary(self):
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            mock_write_strategy = MockFileWriterLog.return_value 
+
+        Logger(writeLoggerStrategy=mock_write_strategy)
+
+        @gaurav_logger()
+        def decorated_function():
+            Logger.log("message", LoglevelEnum.INFO)
+
+        decorated_function()
+
+        assert type(mock_write_strategy.writelog.call_args.args[0]) is dict
+
+    def test_outer_function_is_restored_after_nested_decorated_call(self):
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            mock_write_strategy = MockFileWriterLog.return_value 
+
+        Logger(writeLoggerStrategy=mock_write_strategy)
+
+        @gaurav_logger()
+        def inner_function():
+            Logger.log("inner message", LoglevelEnum.INFO)
+
+        @gaurav_logger()
+        def outer_function():
+            inner_function()
+            Logger.log("outer message", LoglevelEnum.INFO)
+
+        outer_function()
+
+        functionnames = [call.args[0][LogConstants.LOG_FUNCTION_NAME] for call in mock_write_strategy.writelog.call_args_list]
+        assert functionnames[0].endswith("inner_function")
+        assert functionnames[1].endswith("outer_function")
+        assert Logger._thread_functionstack.stack == []
+
+    def test_function_is_removed_from_stack_when_it_raises(self):
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            mock_write_strategy = MockFileWriterLog.return_value 
+
+        Logger(writeLoggerStrategy=mock_write_strategy)
+
+        @gaurav_logger()
+        def failing_function():
+            raise ValueError("failed")
+
+        @gaurav_logger()
+        def outer_function():
+            with pytest.raises(ValueError):
+                failing_function()
+            Logger.log("outer message", LoglevelEnum.INFO)
+
+        outer_function()
+
+        assert mock_write_strategy.writelog.call_args.args[0][LogConstants.LOG_FUNCTION_NAME].endswith("outer_function")
+        assert Logger._thread_functionstack.stack == []
+
+    def test_every_thread_has_its_own_function_stack(self):
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            mock_write_strategy = MockFileWriterLog.return_value 
+
+        Logger(writeLoggerStrategy=mock_write_strategy)
+        stacks = []
+
+        @gaurav_logger()
+        def thread_function():
+            stacks.append(list(Logger._thread_functionstack.stack))
+
+        @gaurav_logger()
+        def outer_function():
+            thread = threading.Thread(target=thread_function)
+            thread.start()
+            thread.join()
+
+        outer_function()
+
+        assert len(stacks) == 1 and len(stacks[0]) == 1
+        assert stacks[0][0].endswith("thread_function")
+
+    def test_sampled_out_logs_are_not_built(self):
+        mock_write_strategy = MagicMock()
+        Logger(writeLoggerStrategy=mock_write_strategy)
+        message = MagicMock(return_value="message")
+
+        @gaurav_logger(sampler=EveryNLogSampler(3, summaryintervalms=0))
+        def sampled_function():
+            for _ in range(7):
+                Logger.log(message, LoglevelEnum.INFO)
+
+        sampled_function()
+
+        messages = [str(call.args[0][LogConstants.LOG_MESSAGE]) for call in mock_write_strategy.writelog.call_args_list]
+        assert messages == ["message", "suppressed 2 similar messages", "message", "suppressed 2 similar messages", "message"]
+        assert message.call_count == 3
+
+    def test_sampler_per_call_site_samples_every_line_on_its_own(self):
+        mock_write_strategy = MagicMock()
+        Logger(writeLoggerStrategy=mock_write_strategy)
+
+        @gaurav_logger(sampler=EveryNLogSampler(10, percallsite=True))
+        def sampled_function():
+            for _ in range(5):
+                Logger.log("first", LoglevelEnum.INFO)
+                Logger.log("second", LoglevelEnum.INFO)
+
+        sampled_function()
+
+        messages = [call.args[0][LogConstants.LOG_MESSAGE] for call in mock_write_strategy.writelog.call_args_list]
+        assert messages == ["first", "second"]
+
+    def test_site_that_stopped_logging_reports_its_suppressed_logs(self):
+        mock_write_strategy = MagicMock()
+        Logger(writeLoggerStrategy=mock_write_strategy)
+
+        @gaurav_logger(sampler=EveryNLogSampler(10, summaryintervalms=0))
+        def sampled_function():
+            for _ in range(3):
+                Logger.log("message", LoglevelEnum.INFO)
+
+        sampled_function()
+        # the first check only sees the site was logging, the second one that it stopped
+        Logger._Logger__writesummaries(force=False)
+        Logger._Logger__writesummaries(force=False)
+
+        logs = [call.args[0] for call in mock_write_strategy.writelog.call_args_list]
+        assert [log[LogConstants.LOG_MESSAGE] for log in logs] == ["message", "suppressed 2 similar messages"]
+        assert logs[1][LogConstants.LOG_LEVEL] == LoglevelEnum.INFO.value
+        assert logs[1][LogConstants.LOG_FUNCTION_NAME].endswith("sampled_function")
+
+    def test_flush_suppressed_writes_summaries_that_are_not_due(self):
+        mock_write_strategy = MagicMock()
+        Logger(writeLoggerStrategy=mock_write_strategy)
+
+        @gaurav_logger(sampler=EveryNLogSampler(10, summaryintervalms=60_000))
+        def sampled_function():
+            for _ in range(4):
+                Logger.log("message", LoglevelEnum.INFO)
+
+        sampled_function()
+        Logger.flushsuppressed()
+
+        messages = [call.args[0][LogConstants.LOG_MESSAGE] for call in mock_write_strategy.writelog.call_args_list]
+        assert messages == ["message", "suppressed 3 similar messages"]
+
+    def test_alog_writes_the_summary_with_awritelog(self):
+        mock_write_strategy = MagicMock()
+        mock_write_strategy.awritelog = AsyncMock()
+        Logger(writeLoggerStrategy=mock_write_strategy)
+
+        @gaurav_logger(sampler=EveryNLogSampler(2, summaryintervalms=0))
+        async def sampled_function():
+            for _ in range(3):
+                await Logger.alog("message", LoglevelEnum.INFO)
+
+        asyncio.run(sampled_function())
+
+        messages = [call.args[0][LogConstants.LOG_MESSAGE] for call in mock_write_strategy.awritelog.call_args_list]
+        assert messages == ["message", "suppressed 1 similar messages", "message"]
+        mock_write_strategy.writelog.assert_not_called()
+
+    def test_metrics_count_accepted_and_filtered_logs(self):
+        metrics = LogMetricsRegistry().sink("logger")
+        Logger(writeLoggerStrategy=MagicMock(), minloglevel=LoglevelEnum.INFO, metrics=metrics)
+
+        @gaurav_logger(minloglevel=LoglevelEnum.WARNING)
+        def logging_function():
+            Logger.log("below global level", LoglevelEnum.DEBUG)
+            Logger.log("below function level", LoglevelEnum.INFO)
+            Logger.log("written", LoglevelEnum.ERROR)
+
+        logging_function()
+        snapshot = metrics.snapshot()
+
+        assert (snapshot["accepted"], snapshot["filtered"]) == (1, 2)
+
+    def teardown_method(self):
+        Logger._instance = None
+        Logger._thread_functionstack = ThreadFunctionStack()
+        Logger._isfunctionlevel_enable = {}
+        Logger._isgloballoggerenable = True
+        Logger._Logger__loggerMessageDecorator = SimpleLogger()
+        Logger._Logger__writeLoggerStrategy = None
+        Logger._Logger__includefunctionname = True
+        Logger._Logger__includeloglevel = True
+        Logger._minlogseverity = 0
+        Logger._functionminlogseverity = {}
+        Logger._functionsampler = {}
+        
+
+
+
+
+        
+        
+
+        
+
+        
+
+
+
+    
+
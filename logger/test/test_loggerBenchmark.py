@@ -0,0 +1,53 @@
+import json
+import shutil
+import tempfile
+
+from logger.src.logger import Logger, ThreadFunctionStack
+from logger.src.loggerMessageDecorators import SimpleLogger
+from logger.benchmark.loggerBenchmark import BenchmarkScenario, WRITERS, runscenario, findregressions, percentile, main
+
+class TestLoggerBenchmark:
+
+    def setup_method(self):
+        self.directory = tempfile.mkdtemp()
+
+    def test_every_writer_logs_all_records(self):
+        for writer in WRITERS:
+            result = runscenario(BenchmarkScenario(writer, "full", threads=4, records=202), self.directory, draintimeout=5)
+
+            assert result["scenario"] == f"{writer}/full/4"
+            assert result["drained"] is True
+            assert result["logspersecond"] > 0
+            assert 0 < result["p50ns"] <= result["p99ns"] <= result["maxns"]
+
+    def test_percentile_uses_nearest_rank(self):
+        values = list(range(1, 101))
+
+        assert percentile(values, 0.50) == 51
+        assert percentile(values, 0.99) == 100
+        assert percentile([], 0.99) == 0
+
+    def test_regressions_are_reported_beyond_tolerance(self):
+        baseline = [{"scenario": "async/full/10", "logspersecond": 1000.0, "p99ns": 100}]
+        results = [{"scenario": "async/full/10", "logspersecond": 700.0, "p99ns": 110}]
+
+        regressions = findregressions(results, baseline, tolerance=0.2)
+
+        assert len(regressions) == 1 and "logs/sec" in regressions[0]
+
+    def test_main_writes_json_report(self):
+        output = f"{self.directory}/results.json"
+
+        assert main(["--writers", "queue", "--chains", "simple", "--threads", "1", "2", "--records", "10", "--output", output]) == 0
+        with open(output, "r") as f:
+            report = json.load(f)
+        assert [result["scenario"] for result in report["results"]] == ["queue/simple/1", "queue/simple/2"]
+
+    def teardown_method(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        Logger._instance = None
+        Logger._thread_functionstack = ThreadFunctionStack()
+        Logger._isfunctionlevel_enable = {}
+        Logger._isgloballoggerenable = True
+        Logger._Logger__loggerMessageDecorator = SimpleLogger()
+        Logger._Logger__writeLoggerStrategy = None
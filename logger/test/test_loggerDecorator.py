@@ -1,126 +1,240 @@
-from unittest.mock import patch, Mock
-from logger.src.logger import Logger
-from logger.src.loggerMessageDecorators import SimpleLogger
-from logger.src.loggerDecorator import gaurav_logger
-
-class TestLoggerDecoratorWhenGlobalLoggerEnable:
-
-    def setup_method(self):
-        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
-            mock_writer_log = MockFileWriterLog.return_value         
-        self.logger = Logger(mock_writer_log)
-
-        self.mock_function = Mock()
-        self.mock_function.return_value = 42
-        self.mock_function.__qualname__ = "file"
-        self.mock_function.__name__ = "mock_function"
-        Logger._isfunctionlevel_enable = {}
-
-    def test_gaurav_decorator_returns_callable(self):
-        func = gaurav_logger()
-        assert callable(func)
-
-    def test_gaurav_decorator_return_a_callable_which_returns_a_callable(self):
-        func = gaurav_logger()
-        inside_func = func(self.mock_function)
-        assert callable(inside_func)
-
-    def test_gaurav_decorator_return_a_callable_which_returns_a_callable_which_returns_wrapper_callable(self):
-        func = gaurav_logger()
-        wrapper_func = func(self.mock_function)
-        wrapper_func()
-        assert callable(self.mock_function)
-
-    def test_is_logger_enable_is_true_when_provide_nothing_as_gaurav_decorator_args(self):
-        func = gaurav_logger()
-        wrapper_func = func(self.mock_function)
-        wrapper_func()
-        function_uid = f"{self.mock_function.__module__}.{self.mock_function.__qualname__}"
-
-        assert function_uid in Logger._isfunctionlevel_enable
-        assert Logger._isfunctionlevel_enable[function_uid] == True
-
-    def test_is_logger_enable_is_true_when_provide_true_as_gaurav_decorator_args(self):
-        func = gaurav_logger(enable=True)
-        wrapper_func = func(self.mock_function)
-        wrapper_func()
-        function_uid = f"{self.mock_function.__module__}.{self.mock_function.__qualname__}"
-
-        assert function_uid in Logger._isfunctionlevel_enable
-        assert Logger._isfunctionlevel_enable[function_uid] == True
-
-    def test_is_logger_enable_is_false_when_provide_false_as_gaurav_decorator_args(self):
-        func = gaurav_logger(enable=False)
-        wrapper_func = func(self.mock_function)
-        wrapper_func()
-        function_uid = f"{self.mock_function.__module__}.{self.mock_function.__qualname__}"
-
-        assert function_uid in Logger._isfunctionlevel_enable
-        assert Logger._isfunctionlevel_enable[function_uid] == False
-    
-    def teardown_method(self):
-        Logger._instance = None
-        Logger._thread_functionname = {}
-        Logger._isfunctionlevel_enable = {}
-        Logger._isgloballoggerenable = True
-        Logger._Logger__loggerMessageDecorator = SimpleLogger()
-        Logger._Logger__writeLoggerStrategy = None
-        Logger._Logger__includefunctionname = True
-        Logger._Logger__includeloglevel = True
-
-class TestLoggerDecoratorWhenGlobalLoggerDisable:
-    def setup_method(self):
-        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
-            mock_writer_log = MockFileWriterLog.return_value         
-        self.logger = Logger(mock_writer_log, isgloballoggerenable=False)
-
-        self.mock_function = Mock()
-        self.mock_function.return_value = 42
-        self.mock_function.__qualname__ = "file"
-        self.mock_function.__name__ = "mock_function"
-        Logger._isfunctionlevel_enable = {}
-
-    def test_gaurav_decorator_returns_callable(self):
-        func = gaurav_logger()
-        assert callable(func)
-
-    def test_gaurav_decorator_return_a_callable_which_returns_a_callable(self):
-        func = gaurav_logger()
-        inside_func = func(self.mock_function)
-        assert callable(inside_func)
-
-    def test_gaurav_decorator_return_a_callable_which_returns_a_callable_which_returns_wrapper_callable(self):
-        func = gaurav_logger()
-        wrapper_func = func(self.mock_function)
-        wrapper_func()
-        assert callable(self.mock_function)
-
-    def test_is_logger_enable_is_true_when_provide_nothing_as_gaurav_decorator_args(self):
-        func = gaurav_logger()
-        wrapper_func = func(self.mock_function)
-        wrapper_func()
-        function_uid = f"{self.mock_function.__module__}.{self.mock_function.__qualname__}"
-
-        assert function_uid not in Logger._isfunctionlevel_enable
-
-    def test_is_logger_enable_is_true_when_provide_true_as_gaurav_decorator_args(self):
-        func = gaurav_logger(enable=True)
-        wrapper_func = func(self.mock_function)
-        wrapper_func()
-        function_uid = f"{self.mock_function.__module__}.{self.mock_function.__qualname__}"
-
-        assert function_uid not in Logger._isfunctionlevel_enable
-
-    def teardown_method(self):
-        Logger._instance = None
-        Logger._thread_functionname = {}
-        Logger._isfunctionlevel_enable = {}
-        Logger._isgloballoggerenable = True
-        Logger._Logger__loggerMessageDecorator = SimpleLogger()
-        Logger._Logger__writeLoggerStrategy = None
-        Logger._Logger__includefunctionname = True
-        Logger._Logger__includeloglevel = True
-
-        
-
-
+from unittest.mock import patch, Mock
+from collections import deque
+import asyncio
+import inspect
+from logger.src.logger import Logger, ThreadFunctionStack
+from logger.src.logLevelEnum import LoglevelEnum
+from logger.src.logConstants import LogConstants
+from logger.src.writeLogMessage import WriteLogsInQueue
+from logger.src.loggerMessageDecorators import SimpleLogger
+from logger.src.loggerDecorator import gaurav_logger
+
+class TestLoggerDecoratorWhenGlobalLoggerEnable:
+
+    def setup_method(self):
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            mock_writer_log = MockFileWriterLog.return_value         
+        self.logger = Logger(mock_writer_log)
+
+        self.mock_function = Mock()
+        self.mock_function.return_value = 42
+        self.mock_function.__qualname__ = "file"
+        self.mock_function.__name__ = "mock_function"
+        Logger._isfunctionlevel_enable = {}
+
+    def test_gaurav_decorator_returns_callable(self):
+        func = gaurav_logger()
+        assert callable(func)
+
+    def test_gaurav_decorator_return_a_callable_which_returns_a_callable(self):
+        func = gaurav_logger()
+        inside_func = func(self.mock_function)
+        assert callable(inside_func)
+
+    def test_gaurav_decorator_return_a_callable_which_returns_a_callable_which_returns_wrapper_callable(self):
+        func = gaurav_logger()
+        wrapper_func = func(self.mock_function)
+        wrapper_func()
+        assert callable(self.mock_function)
+
+    def test_is_logger_enable_is_true_when_provide_nothing_as_gaurav_decorator_args(self):
+        func = gaurav_logger()
+        wrapper_func = func(self.mock_function)
+        wrapper_func()
+        function_uid = f"{self.mock_function.__module__}.{self.mock_function.__qualname__}"
+
+        assert function_uid in Logger._isfunctionlevel_enable
+        assert Logger._isfunctionlevel_enable[function_uid] == True
+
+    def test_is_logger_enable_is_true_when_provide_true_as_gaurav_decorator_args(self):
+        func = gaurav_logger(enable=True)
+        wrapper_func = func(self.mock_function)
+        wrapper_func()
+        function_uid = f"{self.mock_function.__module__}.{self.mock_function.__qualname__}"
+
+        assert function_uid in Logger._isfunctionlevel_enable
+        assert Logger._isfunctionlevel_enable[function_uid] == True
+
+    def test_is_logger_enable_is_false_when_provide_false_as_gaurav_decorator_args(self):
+        func = gaurav_logger(enable=False)
+        wrapper_func = func(self.mock_function)
+        wrapper_func()
+        function_uid = f"{self.mock_function.__module__}.{self.mock_function.__qualname__}"
+
+        assert function_uid in Logger._isfunctionlevel_enable
+        assert Logger._isfunctionlevel_enable[function_uid] == False
+
+    def test_function_uid_is_computed_once_at_decoration_time(self):
+        with patch("logger.src.loggerDecorator.function_uid", return_value="module.file") as mock_function_uid:
+            wrapper_func = gaurav_logger()(self.mock_function)
+            wrapper_func()
+            wrapper_func()
+
+        mock_function_uid.assert_called_once_with(self.mock_function)
+        assert self.mock_function.call_count == 2
+    
+    def teardown_method(self):
+        Logger._instance = None
+        Logger._thread_functionstack = ThreadFunctionStack()
+        Logger._isfunctionlevel_enable = {}
+        Logger._isgloballoggerenable = True
+        Logger._Logger__loggerMessageDecorator = SimpleLogger()
+        Logger._Logger__writeLoggerStrategy = None
+        Logger._Logger__includefunctionname = True
+        Logger._Logger__includeloglevel = True
+
+class TestLoggerDecoratorWhenGlobalLoggerDisable:
+    def setup_method(self):
+        with patch("logger.src.writeLogMessage.FileWriterLog") as MockFileWriterLog:
+            mock_writer_log = MockFileWriterLog.return_value         
+        self.logger = Logger(mock_writer_log, isgloballoggerenable=False)
+
+        self.mock_function = Mock()
+        self.mock_function.return_value = 42
+        self.mock_function.__qualname__ = "file"
+        self.mock_function.__name__ = "mock_function"
+        Logger._isfunctionlevel_enable = {}
+
+    def test_gaurav_decorator_returns_callable(self):
+        func = gaurav_logger()
+        assert callable(func)
+
+    def test_gaurav_decorator_return_a_callable_which_returns_a_callable(self):
+        func = gaurav_logger()
+        inside_func = func(self.mock_function)
+        assert callable(inside_func)
+
+    def test_gaurav_decorator_return_a_callable_which_returns_a_callable_which_returns_wrapper_callable(self):
+        func = gaurav_logger()
+        wrapper_func = func(self.mock_function)
+        wrapper_func()
+        assert callable(self.mock_function)
+
+    def test_is_logger_enable_is_true_when_provide_nothing_as_gaurav_decorator_args(self):
+        func = gaurav_logger()
+        wrapper_func = func(self.mock_function)
+        wrapper_func()
+        function_uid = f"{self.mock_function.__module__}.{self.mock_function.__qualname__}"
+
+        assert function_uid not in Logger._isfunctionlevel_enable
+
+    def test_is_logger_enable_is_true_when_provide_true_as_gaurav_decorator_args(self):
+        func = gaurav_logger(enable=True)
+        wrapper_func = func(self.mock_function)
+        wrapper_func()
+        function_uid = f"{self.mock_function.__module__}.{self.mock_function.__qualname__}"
+
+        assert function_uid not in Logger._isfunctionlevel_enable
+
+    def test_wrapper_does_not_attach_function_to_thread_when_global_logger_disabled(self):
+        wrapper_func = gaurav_logger()(self.mock_function)
+
+        assert wrapper_func(1, key="value") == 42
+        self.mock_function.assert_called_once_with(1, key="value")
+        assert Logger._thread_functionstack.stack == []
+
+    def teardown_method(self):
+        Logger._instance = None
+        Logger._thread_functionstack = ThreadFunctionStack()
+        Logger._isfunctionlevel_enable = {}
+        Logger._isgloballoggerenable = True
+        Logger._Logger__loggerMessageDecorator = SimpleLogger()
+        Logger._Logger__writeLoggerStrategy = None
+        Logger._Logger__includefunctionname = True
+        Logger._Logger__includeloglevel = True
+
+class TestLoggerDecoratorForCoroutines:
+    def setup_method(self):
+        self.logdeque = deque()
+        self.logger = Logger(WriteLogsInQueue(self.logdeque))
+
+    def logged_functions(self):
+        return [(log[LogConstants.LOG_FUNCTION_NAME].rsplit('.', 1)[-1], log[LogConstants.LOG_MESSAGE]) for log in self.logdeque]
+
+    def test_decorated_coroutine_function_stays_a_coroutine_function(self):
+        @gaurav_logger()
+        async def coroutine_function():
+            return 42
+
+        assert inspect.iscoroutinefunction(coroutine_function)
+        assert asyncio.run(coroutine_function()) == 42
+
+    def test_concurrent_tasks_keep_their_own_function(self):
+        @gaurav_logger()
+        async def first():
+            Logger.log("first before", LoglevelEnum.INFO)
+            await asyncio.sleep(0.01)
+            Logger.log("first after", LoglevelEnum.INFO)
+
+        @gaurav_logger()
+        async def second():
+            Logger.log("second before", LoglevelEnum.INFO)
+            await asyncio.sleep(0)
+            Logger.log("second after", LoglevelEnum.INFO)
+
+        async def main():
+            await asyncio.gather(first(), second())
+
+        asyncio.run(main())
+
+        assert sorted(self.logged_functions()) == [("first", "first after"), ("first", "first before"),
+                                                   ("second", "second after"), ("second", "second before")]
+
+    def test_sync_function_called_by_coroutine_is_attached_to_the_log(self):
+        @gaurav_logger()
+        def helper():
+            Logger.log("helper", LoglevelEnum.INFO)
+
+        @gaurav_logger()
+        async def handler():
+            helper()
+            Logger.log("handler", LoglevelEnum.INFO)
+
+        asyncio.run(handler())
+
+        assert self.logged_functions() == [("helper", "helper"), ("handler", "handler")]
+
+    def test_coroutine_run_by_decorated_sync_function_is_attached_to_the_log(self):
+        @gaurav_logger()
+        async def handler():
+            Logger.log("handler", LoglevelEnum.INFO)
+
+        @gaurav_logger()
+        def main():
+            asyncio.run(handler())
+
+        main()
+
+        assert self.logged_functions() == [("handler", "handler")]
+
+    def test_alog_awaits_awritelog_of_write_strategy(self):
+        class AwaitableWriter:
+            def __init__(self):
+                self.logs = []
+
+            def writelog(self, loggerjson):
+                raise AssertionError("awritelog should be used")
+
+            async def awritelog(self, loggerjson):
+                self.logs.append(loggerjson)
+
+        writer = AwaitableWriter()
+        Logger._Logger__writeLoggerStrategy = writer
+
+        @gaurav_logger()
+        async def handler():
+            await Logger.alog("handler", LoglevelEnum.INFO)
+
+        asyncio.run(handler())
+
+        assert [log[LogConstants.LOG_MESSAGE] for log in writer.logs] == ["handler"]
+
+    def teardown_method(self):
+        Logger._instance = None
+        Logger._thread_functionstack = ThreadFunctionStack()
+        Logger._isfunctionlevel_enable = {}
+        Logger._isgloballoggerenable = True
+        Logger._Logger__loggerMessageDecorator = SimpleLogger()
+        Logger._Logger__writeLoggerStrategy = None
+        Logger._Logger__includefunctionname = True
+        Logger._Logger__includeloglevel = True
@@ -1,79 +1,150 @@
-from logger.src.loggerMessageDecorators import LoggerMessageDecorator, SimpleLogger, LoggerWithTimeStamp, LoggerWithServiceName
-from logger.src.logConstants import LogConstants
-
-from unittest.mock import patch
-from datetime import timezone, datetime
-
-class TestLoggerMessageDecoratorForSimpleLogger:
-
-    def setup_method(self):
-        self.messagedecorator : LoggerMessageDecorator = SimpleLogger()
-
-    def testgetLogreturnsajson(self):
-        loggerjson = self.messagedecorator.getLog({LogConstants.LOG_MESSAGE : "hello"})
-        assert isinstance(loggerjson,dict)
-
-    def testandverifyitsjsonvalueforgetLog(self):
-        loggerjson = self.messagedecorator.getLog({LogConstants.LOG_MESSAGE : "hello"})
-        assert loggerjson == {LogConstants.LOG_MESSAGE : "hello"}
-
-    def testifapplynextloggertolognextvaluework(self):
-        with patch('logger.src.loggerMessageDecorators.LoggerWithTimeStamp') as LoggerWithTimeStamp:
-            timestamploggerdecorator = LoggerWithTimeStamp()
-            self.messagedecorator = SimpleLogger(timestamploggerdecorator)
-            self.messagedecorator.getLog({LogConstants.LOG_MESSAGE : "hello"})
-            assert timestamploggerdecorator.getLog.asset_called_once()
-
-
-class TestLoggerMessageDecoratorForLoggerWithTimeStamp:
-
-    def setup_method(self):
-        self.localtimezone : timezone = timezone.utc
-        self.messagedecorator : LoggerMessageDecorator = LoggerWithTimeStamp(self.localtimezone)
-
-    def testgetLogreturnsajson(self):
-        loggerjson = self.messagedecorator.getLog({LogConstants.LOG_MESSAGE : "hello"})
-        assert isinstance(loggerjson,dict)
-
-    def testandverifyitsjsonvalueforgetLog(self):
-        fixed_dt = datetime(
-            2026, 1, 29, 12, 2, 41, 641322, tzinfo=timezone.utc
-        )
-        with patch("logger.src.loggerMessageDecorators.datetime") as mock_datetime:
-            mock_datetime.now.return_value = fixed_dt
-            loggerjson = self.messagedecorator.getLog({LogConstants.LOG_MESSAGE : "hello"})
-
-        assert loggerjson == {LogConstants.LOG_MESSAGE : "hello", LogConstants.LOG_TIMESTAMP: "2026-01-29 12:02:41.641322+00:00"}
-
-    def testifapplynextloggertolognextvaluework(self):
-        with patch('logger.src.loggerMessageDecorators.LoggerWithServiceName') as LoggerWithServiceName:
-            servicenameloggerdecorator = LoggerWithServiceName()
-            self.messagedecorator = SimpleLogger(servicenameloggerdecorator)
-            self.messagedecorator.getLog({LogConstants.LOG_MESSAGE : "hello"})
-            assert servicenameloggerdecorator.getLog.asset_called_once()
-
-class TestLoggerMessageDecoratorForLoggerWithServiceName:
-
-    def setup_method(self):
-        self.servicename = "Service-1"
-        self.messagedecorator : LoggerMessageDecorator = LoggerWithServiceName(self.servicename)
-
-    def testgetLogreturnsajson(self):
-        loggerjson = self.messagedecorator.getLog({LogConstants.LOG_MESSAGE : "hello"})
-        assert isinstance(loggerjson,dict)
-
-    def testandverifyitsjsonvalueforgetLog(self):
-        loggerjson = self.messagedecorator.getLog({LogConstants.LOG_MESSAGE : "hello"})
-        assert loggerjson == {LogConstants.LOG_MESSAGE : "hello", LogConstants.LOG_SERVICE_NAME: self.servicename}
-
-    def testifapplynextloggertolognextvaluework(self):
-        with patch('logger.src.loggerMessageDecorators.LoggerWithTimeStamp') as LoggerWithTimeStamp:
-            timestamploggerdecorator = LoggerWithTimeStamp()
-            self.messagedecorator = SimpleLogger(timestamploggerdecorator)
-            self.messagedecorator.getLog({LogConstants.LOG_MESSAGE : "hello"})
-            assert timestamploggerdecorator.getLog.asset_called_once()
-
-
-
-
-    
\ No newline at end of file
+from logger.src.loggerMessageDecorators import LoggerMessageDecorator, SimpleLogger, LoggerWithTimeStamp, LoggerWithServiceName, CompiledLoggerDecorator, compileloggerdecorator
+from logger.src.logConstants import LogConstants
+from logger.src.logRecord import LogRecord
+
+from unittest.mock import patch
+from datetime import timezone, datetime
+
+class TestLoggerMessageDecoratorForSimpleLogger:
+
+    def setup_method(self):
+        self.messagedecorator : LoggerMessageDecorator = SimpleLogger()
+
+    def testgetLogreturnsajson(self):
+        loggerjson = self.messagedecorator.getLog({LogConstants.LOG_MESSAGE : "hello"})
+        assert isinstance(loggerjson,dict)
+
+    def testandverifyitsjsonvalueforgetLog(self):
+        loggerjson = self.messagedecorator.getLog({LogConstants.LOG_MESSAGE : "hello"})
+        assert loggerjson == {LogConstants.LOG_MESSAGE : "hello"}
+
+    def testifapplynextloggertolognextvaluework(self):
+        with patch('logger.src.loggerMessageDecorators.LoggerWithTimeStamp') as LoggerWithTimeStamp:
+            timestamploggerdecorator = LoggerWithTimeStamp()
+            self.messagedecorator = SimpleLogger(timestamploggerdecorator)
+            self.messagedecorator.getLog({LogConstants.LOG_MESSAGE : "hello"})
+            assert timestamploggerdecorator.getLog.asset_called_once()
+
+
+class TestLoggerMessageDecoratorForLoggerWithTimeStamp:
+
+    def setup_method(self):
+        self.localtimezone : timezone = timezone.utc
+        self.messagedecorator : LoggerMessageDecorator = LoggerWithTimeStamp(self.localtimezone)
+
+    def testgetLogreturnsajson(self):
+        loggerjson = self.messagedecorator.getLog({LogConstants.LOG_MESSAGE : "hello"})
+        assert isinstance(loggerjson,dict)
+
+    def testandverifyitsjsonvalueforgetLog(self):
+        fixed_dt = datetime(
+            2026, 1, 29, 12, 2, 41, 641322, tzinfo=timezone.utc
+        )
+        fixed_ns = int(fixed_dt.replace(microsecond=0).timestamp()) * 1_000_000_000 + fixed_dt.microsecond * 1000
+        with patch("logger.src.logTimestamp.time.time_ns", return_value=fixed_ns):
+            loggerjson = self.messagedecorator.getLog({LogConstants.LOG_MESSAGE : "hello"})
+
+        assert loggerjson == {LogConstants.LOG_MESSAGE : "hello", LogConstants.LOG_TIMESTAMP: "2026-01-29 12:02:41.641322+00:00"}
+
+    def testifapplynextloggertolognextvaluework(self):
+        with patch('logger.src.loggerMessageDecorators.LoggerWithServiceName') as LoggerWithServiceName:
+            servicenameloggerdecorator = LoggerWithServiceName()
+            self.messagedecorator = SimpleLogger(servicenameloggerdecorator)
+            self.messagedecorator.getLog({LogConstants.LOG_MESSAGE : "hello"})
+            assert servicenameloggerdecorator.getLog.asset_called_once()
+
+class TestLoggerMessageDecoratorForLoggerWithServiceName:
+
+    def setup_method(self):
+        self.servicename = "Service-1"
+        self.messagedecorator : LoggerMessageDecorator = LoggerWithServiceName(self.servicename)
+
+    def testgetLogreturnsajson(self):
+        loggerjson = self.messagedecorator.getLog({LogConstants.LOG_MESSAGE : "hello"})
+        assert isinstance(loggerjson,dict)
+
+    def testandverifyitsjsonvalueforgetLog(self):
+        loggerjson = self.messagedecorator.getLog({LogConstants.LOG_MESSAGE : "hello"})
+        assert loggerjson == {LogConstants.LOG_MESSAGE : "hello", LogConstants.LOG_SERVICE_NAME: self.servicename}
+
+    def testifapplynextloggertolognextvaluework(self):
+        with patch('logger.src.loggerMessageDecorators.LoggerWithTimeStamp') as LoggerWithTimeStamp:
+            timestamploggerdecorator = LoggerWithTimeStamp()
+            self.messagedecorator = SimpleLogger(timestamploggerdecorator)
+            self.messagedecorator.getLog({LogConstants.LOG_MESSAGE : "hello"})
+            assert timestamploggerdecorator.getLog.asset_called_once()
+
+class LoggerWithRequestId(LoggerMessageDecorator):
+
+    def __init__(self, additionallogger: LoggerMessageDecorator|None = None) -> None:
+        self.additionallogger = additionallogger
+
+    def getLog(self, loggerjson):
+        loggerjson["requestid"] = "request-1"
+        if self.additionallogger is None:
+            return loggerjson
+        return self.additionallogger.getLog(loggerjson)
+
+class RedactingLogger(LoggerWithServiceName):
+
+    def getLog(self, loggerjson):
+        loggerjson[LogConstants.LOG_MESSAGE] = "REDACTED"
+        return super().getLog(loggerjson)
+
+class TestCompiledLoggerDecorator:
+
+    def setup_method(self):
+        self.fixed_ns = 1769688161641322000
+
+    def test_compiled_chain_adds_the_same_fields_as_the_chain(self):
+        chain = SimpleLogger(LoggerWithTimeStamp(additionallogger=LoggerWithServiceName(serviceName="Service1")))
+        compiled = compileloggerdecorator(chain)
+
+        with patch("logger.src.logTimestamp.time.time_ns", return_value=self.fixed_ns):
+            expected = chain.getLog({LogConstants.LOG_MESSAGE : "hello"})
+            loggerjson = compiled.getLog({LogConstants.LOG_MESSAGE : "hello"})
+
+        assert isinstance(compiled, CompiledLoggerDecorator)
+        assert loggerjson == expected
+
+    def test_field_set_later_in_the_chain_wins(self):
+        compiled = compileloggerdecorator(LoggerWithServiceName("first", LoggerWithServiceName("second")))
+
+        assert compiled.getLog({}) == {LogConstants.LOG_SERVICE_NAME: "second"}
+
+    def test_custom_decorator_is_called_as_fallback_with_rest_of_chain(self):
+        chain = LoggerWithServiceName("Service1", LoggerWithRequestId(LoggerWithServiceName("Service2")))
+
+        loggerjson = compileloggerdecorator(chain).getLog({})
+
+        assert loggerjson == {LogConstants.LOG_SERVICE_NAME: "Service2", "requestid": "request-1"}
+
+    def test_subclass_overriding_getlog_is_not_compiled_away(self):
+        chain = SimpleLogger(RedactingLogger("Service1"))
+
+        loggerjson = compileloggerdecorator(chain).getLog({LogConstants.LOG_MESSAGE : "secret"})
+
+        assert loggerjson == {LogConstants.LOG_SERVICE_NAME: "Service1", LogConstants.LOG_MESSAGE: "REDACTED"}
+
+    def test_compiling_twice_gives_the_same_fields(self):
+        compiled = compileloggerdecorator(compileloggerdecorator(LoggerWithServiceName("Service1", LoggerWithRequestId())))
+
+        assert compiled.getLog({}) == {LogConstants.LOG_SERVICE_NAME: "Service1", "requestid": "request-1"}
+
+    def test_compiled_chain_fills_log_record_slots(self):
+        chain = SimpleLogger(LoggerWithTimeStamp(additionallogger=LoggerWithServiceName(serviceName="Service1")))
+
+        with patch("logger.src.logTimestamp.time.time_ns", return_value=self.fixed_ns):
+            record = compileloggerdecorator(chain).getLog(LogRecord("hello"))
+
+        assert record.servicename == "Service1"
+        assert record.timestamp == "2026-01-29 12:02:41.641322+00:00"
+
+    def test_compiled_chain_formats_the_creation_time_of_a_log_record(self):
+        compiled = compileloggerdecorator(SimpleLogger(LoggerWithTimeStamp()))
+
+        with patch("logger.src.logTimestamp.time.time_ns", side_effect=AssertionError("clock read again")):
+            record = compiled.getLog(LogRecord("hello", timestampns=self.fixed_ns))
+
+        assert record.timestamp == "2026-01-29 12:02:41.641322+00:00"
+
@@ -1,92 +1,793 @@
-import os
-import time
-import pytest
-
-from collections import deque
-from logger.src.writeLogMessage import WriteLogMessage, FileWriterLog, WriteLogsInQueue, AsyncFileWriterLog
-from logger.src.logConstants import LogConstants
-from logger.src.logLevelEnum import LoglevelEnum
-
-from unittest.mock import patch
-
-class TestWriteLogMessageFileWriteLogMessage:
-
-    def setup_method(self):
-        self.file_path = 'file.txt'
-        self.fileWriteLogger : WriteLogMessage = FileWriterLog(self.file_path)
-        self.loggerjson = { LogConstants.LOG_SERVICE_NAME : 'Service1',
-                      LogConstants.LOG_FUNCTION_NAME : 'function1',
-                      LogConstants.LOG_TIMESTAMP: '2026-01-29 12:02:41.641322+00:00',
-                      LogConstants.LOG_LEVEL : LoglevelEnum.DEBUG.value,
-                      LogConstants.LOG_MESSAGE: 'log message found' }
-
-    def test_preparemsg_returns_correct_msg_sequence(self):
-        message = self.fileWriteLogger._FileWriterLog__preparemsg(self.loggerjson)
-        real_message = f"Service1 || function1 || 2026-01-29 12:02:41.641322+00:00 || {LoglevelEnum.DEBUG.value} || log message found\n"
-        assert message == real_message
-    
-    def test_writelog_write_into_correct_file_path(self):
-
-        message = f"Service1 || function1 || 2026-01-29 12:02:41.641322+00:00 || {LoglevelEnum.DEBUG.value} || log message found\n"
-        with patch.object(self.fileWriteLogger, '_FileWriterLog__preparemsg',
-                          return_value = message):
-            self.fileWriteLogger.writelog(self.loggerjson)
-        assert os.path.exists(self.file_path)
-        
-        with open(self.file_path, 'r') as f:
-            file_content = f.read()
-        
-        assert file_content==message
-
-    def teardown_method(self):
-        if os.path.exists(self.file_path):
-            os.remove(self.file_path)
-            
-class TestWriteLogMessageWriteLogsInQueue:
-    def setup_method(self):
-        self.deque = deque([])
-        self.fileWriteLogger : WriteLogMessage = WriteLogsInQueue(self.deque)
-        self.loggerjson = { LogConstants.LOG_SERVICE_NAME : 'Service1',
-                      LogConstants.LOG_FUNCTION_NAME : 'function1',
-                      LogConstants.LOG_TIMESTAMP: '2026-01-29 12:02:41.641322+00:00',
-                      LogConstants.LOG_LEVEL : LoglevelEnum.DEBUG.value,
-                      LogConstants.LOG_MESSAGE: 'log message found' }
-    
-    def test_writelog_write_into_correct_file_path(self):
-        self.fileWriteLogger.writelog(self.loggerjson)
-        assert self.loggerjson in self.deque
-    
-class TestWriteLogMessageAsyncFileWriterLog:
-    def setup_method(self):
-        self.file_path = 'file.txt'
-        self.fileWriteLogger : WriteLogMessage = AsyncFileWriterLog(self.file_path)
-        self.loggerjson = { LogConstants.LOG_SERVICE_NAME : 'Service1',
-                      LogConstants.LOG_FUNCTION_NAME : 'function1',
-                      LogConstants.LOG_TIMESTAMP: '2026-01-29 12:02:41.641322+00:00',
-                      LogConstants.LOG_LEVEL : LoglevelEnum.DEBUG.value,
-                      LogConstants.LOG_MESSAGE: 'log message found' }
-    
-    def test_preparemsg_returns_correct_msg_sequence(self):
-        message = self.fileWriteLogger._AsyncFileWriterLog__preparemsg(self.loggerjson)
-        real_message = f"Service1 || function1 || 2026-01-29 12:02:41.641322+00:00 || {LoglevelEnum.DEBUG.value} || log message found\n"
-        assert message == real_message
-    
-    @pytest.mark.xfail(reason="This test can be failed becasue the multiple assertion in it depends upon the multithreading env and sleep duration of the machine")
-    def test_writelog_write_into_correct_file_path(self):
-        message = f"Service1 || function1 || 2026-01-29 12:02:41.641322+00:00 || {LoglevelEnum.DEBUG.value} || log message found\n"
-        with patch.object(self.fileWriteLogger, '_AsyncFileWriterLog__preparemsg',
-                          return_value = message):
-            self.fileWriteLogger.writelog(self.loggerjson)
-        assert self.loggerjson in self.fileWriteLogger._AsyncFileWriterLog__logdeque
-        time.sleep(1)
-        assert os.path.exists(self.file_path)
-        with open(self.file_path, 'r') as f:
-            file_content = f.read()
-        assert file_content==message
-
-    def teardown_method(self):
-        if os.path.exists(self.file_path):
-            os.remove(self.file_path)
-    
-
-    
+import os
+import time
+import asyncio
+import threading
+import tempfile
+import signal
+import sys
+import mmap
+import errno
+import shutil
+import pytest
+
+from collections import deque
+from logger.src.writeLogMessage import WriteLogMessage, FileWriterLog, WriteLogsInQueue, AsyncFileWriterLog, MmapFileWriterLog, RingBufferWriterLog
+from logger.src.logConstants import LogConstants
+from logger.src.logLevelEnum import LoglevelEnum
+from logger.src.overflowPolicyEnum import OverflowPolicyEnum
+from logger.src.logMessage import LazyLogMessage
+from logger.src.logRecord import LogRecord
+from logger.src.logMetrics import LogMetricsRegistry
+from logger.src.fsyncPolicyEnum import FsyncPolicyEnum
+from logger.src.logDurability import LogAck
+from logger.src.logFileHandle import LogFileHandle
+from logger.src.binaryLogFormat import BinaryLogFormatter, decodebinarylog
+from logger.src.loggerException import LoggerException, LoggerExceptionMessageConstant
+
+from unittest.mock import patch, MagicMock
+
+class TestWriteLogMessageFileWriteLogMessage:
+
+    def setup_method(self):
+        self.file_path = 'file.txt'
+        self.fileWriteLogger : WriteLogMessage = FileWriterLog(self.file_path)
+        self.loggerjson = { LogConstants.LOG_SERVICE_NAME : 'Service1',
+                      LogConstants.LOG_FUNCTION_NAME : 'function1',
+                      LogConstants.LOG_TIMESTAMP: '2026-01-29 12:02:41.641322+00:00',
+                      LogConstants.LOG_LEVEL : LoglevelEnum.DEBUG.value,
+                      LogConstants.LOG_MESSAGE: 'log message found' }
+
+    def test_preparemsg_returns_correct_msg_sequence(self):
+        message = self.fileWriteLogger._FileWriterLog__preparemsg(self.loggerjson)
+        real_message = f"Service1 || function1 || 2026-01-29 12:02:41.641322+00:00 || {LoglevelEnum.DEBUG.value} || log message found\n"
+        assert message == real_message
+    
+    def test_writelog_write_into_correct_file_path(self):
+
+        message = f"Service1 || function1 || 2026-01-29 12:02:41.641322+00:00 || {LoglevelEnum.DEBUG.value} || log message found\n"
+        with patch.object(self.fileWriteLogger, '_FileWriterLog__preparemsg',
+                          return_value = message):
+            self.fileWriteLogger.writelog(self.loggerjson)
+        assert os.path.exists(self.file_path)
+        
+        with open(self.file_path, 'r') as f:
+            file_content = f.read()
+        
+        assert file_content==message
+
+    def test_writelog_with_kept_open_file_writes_after_flush(self):
+        self.fileWriteLogger = FileWriterLog(self.file_path, keepfileopen=True, flusheveryrecords=0)
+        self.fileWriteLogger.writelog(self.loggerjson)
+        self.fileWriteLogger.writelog(self.loggerjson)
+        self.fileWriteLogger.flush()
+
+        message = f"Service1 || function1 || 2026-01-29 12:02:41.641322+00:00 || {LoglevelEnum.DEBUG.value} || log message found\n"
+        with open(self.file_path, 'r') as f:
+            file_content = f.read()
+
+        assert file_content==message*2
+        self.fileWriteLogger.close()
+
+    @pytest.mark.parametrize("fsyncpolicy", list(FsyncPolicyEnum))
+    def test_writelogwithack_fsyncs_file_opened_per_write(self, fsyncpolicy):
+        self.fileWriteLogger = FileWriterLog(self.file_path, fsyncpolicy=fsyncpolicy, fsynceveryrecords=1000, fsynceveryms=60_000)
+        with patch('logger.src.logFileHandle.os.fsync') as fsync:
+            ack = self.fileWriteLogger.writelogwithack(self.loggerjson)
+
+        assert ack.done
+        assert fsync.call_count == (0 if fsyncpolicy is FsyncPolicyEnum.NEVER else 1)
+
+    def teardown_method(self):
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+            
+class TestWriteLogMessageWriteLogsInQueue:
+    def setup_method(self):
+        self.deque = deque([])
+        self.fileWriteLogger : WriteLogMessage = WriteLogsInQueue(self.deque)
+        self.loggerjson = { LogConstants.LOG_SERVICE_NAME : 'Service1',
+                      LogConstants.LOG_FUNCTION_NAME : 'function1',
+                      LogConstants.LOG_TIMESTAMP: '2026-01-29 12:02:41.641322+00:00',
+                      LogConstants.LOG_LEVEL : LoglevelEnum.DEBUG.value,
+                      LogConstants.LOG_MESSAGE: 'log message found' }
+    
+    def test_writelog_write_into_correct_file_path(self):
+        self.fileWriteLogger.writelog(self.loggerjson)
+        assert self.loggerjson in self.deque
+    
+class TestWriteLogMessageAsyncFileWriterLog:
+    def setup_method(self):
+        self.file_path = 'file.txt'
+        self.fileWriteLogger : WriteLogMessage = AsyncFileWriterLog(self.file_path)
+        self.loggerjson = { LogConstants.LOG_SERVICE_NAME : 'Service1',
+                      LogConstants.LOG_FUNCTION_NAME : 'function1',
+                      LogConstants.LOG_TIMESTAMP: '2026-01-29 12:02:41.641322+00:00',
+                      LogConstants.LOG_LEVEL : LoglevelEnum.DEBUG.value,
+                      LogConstants.LOG_MESSAGE: 'log message found' }
+    
+    def test_preparemsg_returns_correct_msg_sequence(self):
+        message = self.fileWriteLogger._AsyncFileWriterLog__preparemsg(self.loggerjson)
+        real_message = f"Service1 || function1 || 2026-01-29 12:02:41.641322+00:00 || {LoglevelEnum.DEBUG.value} || log message found\n"
+        assert message == real_message
+    
+    def test_preparemsg_renders_lazy_message(self):
+        self.loggerjson[LogConstants.LOG_MESSAGE] = LazyLogMessage("log message {}", ("found",))
+        message = self.fileWriteLogger._AsyncFileWriterLog__preparemsg(self.loggerjson)
+        real_message = f"Service1 || function1 || 2026-01-29 12:02:41.641322+00:00 || {LoglevelEnum.DEBUG.value} || log message found\n"
+        assert message == real_message
+
+    @pytest.mark.xfail(reason="This test can be failed becasue the multiple assertion in it depends upon the multithreading env and sleep duration of the machine")
+    def test_writelog_write_into_correct_file_path(self):
+        message = f"Service1 || function1 || 2026-01-29 12:02:41.641322+00:00 || {LoglevelEnum.DEBUG.value} || log message found\n"
+        with patch.object(self.fileWriteLogger, '_AsyncFileWriterLog__preparemsg',
+                          return_value = message):
+            self.fileWriteLogger.writelog(self.loggerjson)
+        assert self.loggerjson in self.fileWriteLogger._AsyncFileWriterLog__logdeque
+        time.sleep(1)
+        assert os.path.exists(self.file_path)
+        with open(self.file_path, 'r') as f:
+            file_content = f.read()
+        assert file_content==message
+
+    def teardown_method(self):
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+class TestWriteLogMessageAsyncFileWriterLogWakeup:
+    def setup_method(self):
+        self.file_path = 'file.txt'
+        self.loggerjson = { LogConstants.LOG_LEVEL : LoglevelEnum.DEBUG.value,
+                      LogConstants.LOG_MESSAGE: 'log message found' }
+
+    def read_file(self):
+        if not os.path.exists(self.file_path):
+            return ""
+        with open(self.file_path, 'r') as f:
+            return f.read()
+
+    def test_daemon_is_woken_once_threshold_is_reached(self):
+        writer = AsyncFileWriterLog(self.file_path, wakeupthreshold=3, maxlatencyms=60_000)
+        time.sleep(0.05)  # let the daemon start waiting
+        writer.writelog(self.loggerjson)
+        writer.writelog(self.loggerjson)
+        time.sleep(0.2)
+        assert self.read_file() == ""
+
+        writer.writelog(self.loggerjson)
+        time.sleep(0.2)
+        assert self.read_file().count("log message found") == 3
+
+    def test_records_below_threshold_are_written_after_latency_deadline(self):
+        writer = AsyncFileWriterLog(self.file_path, wakeupthreshold=1000, maxlatencyms=20)
+        writer.writelog(self.loggerjson)
+        time.sleep(0.3)
+
+        assert self.read_file() == "DEBUG || log message found\n"
+
+    def test_records_from_many_threads_are_all_written(self):
+        writer = AsyncFileWriterLog(self.file_path, wakeupthreshold=64, maxlatencyms=10)
+        def produce(worker):
+            for index in range(200):
+                writer.writelog({LogConstants.LOG_MESSAGE: f"{worker}-{index}"})
+        threads = [threading.Thread(target=produce, args=(worker,)) for worker in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        time.sleep(0.3)
+
+        lines = self.read_file().splitlines()
+        assert len(lines) == 4000
+        for worker in range(20):
+            assert [line for line in lines if line.startswith(f"{worker}-")] == [f"{worker}-{index}" for index in range(200)]
+
+    def teardown_method(self):
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+class TestWriteLogMessageAsyncFileWriterLogBatching:
+    def setup_method(self):
+        self.file_path = 'file.txt'
+
+    def create_writer_without_daemon(self, records=None, **kwargs):
+        # stop the daemon thread so the batches can be drained by the test
+        writer = AsyncFileWriterLog(self.file_path, **kwargs)
+        writer._AsyncFileWriterLog__stop_daemon_work = True
+        writer._AsyncFileWriterLog__wakeup.set()
+        writer._AsyncFileWriterLog__process_log_thread.join()
+        if records is None:
+            records = [{LogConstants.LOG_MESSAGE: f"record-{index}"} for index in range(10)]
+        for record in records:
+            writer.writelog(record)
+        self.writer = writer
+        return writer
+
+    def test_queue_is_written_in_batches_of_max_batch_records(self):
+        writer = self.create_writer_without_daemon(maxbatchrecords=4)
+        logfile = writer._AsyncFileWriterLog__logfile
+        with patch.object(logfile, 'write', wraps=logfile.write) as write:
+            writer._AsyncFileWriterLog__writeloginactualfile()
+
+        assert [call.args[1] for call in write.call_args_list] == [4, 4, 2]
+        with open(self.file_path, 'r') as f:
+            assert f.read().splitlines() == [f"record-{index}" for index in range(10)]
+
+    def test_batch_is_cut_at_max_batch_bytes(self):
+        writer = self.create_writer_without_daemon(maxbatchbytes=20)
+        logfile = writer._AsyncFileWriterLog__logfile
+        with patch.object(logfile, 'write', wraps=logfile.write) as write:
+            writer._AsyncFileWriterLog__writeloginactualfile()
+
+        # every line is 9 characters, a batch ends once it reaches 20
+        assert [call.args[1] for call in write.call_args_list] == [3, 3, 3, 1]
+
+    def test_batch_encoded_together_is_cut_at_max_batch_bytes(self):
+        writer = self.create_writer_without_daemon(formatter=BinaryLogFormatter(), maxbatchbytes=20)
+        logfile = writer._AsyncFileWriterLog__logfile
+        with patch.object(logfile, 'write', wraps=logfile.write) as write:
+            writer._AsyncFileWriterLog__writeloginactualfile()
+
+        assert [call.args[1] for call in write.call_args_list] == [3, 3, 3, 1]
+        with open(self.file_path, 'rb') as f:
+            assert [record[LogConstants.LOG_MESSAGE] for record in decodebinarylog(f.read())] == [f"record-{index}" for index in range(10)]
+
+    def test_coalesced_batch_is_cut_at_max_batch_bytes(self):
+        records = [{LogConstants.LOG_TIMESTAMP: f"2026-01-01 00:00:0{index}", LogConstants.LOG_LEVEL: LoglevelEnum.ERROR.value,
+                    LogConstants.LOG_MESSAGE: f"record-{index}"} for index in range(10)]
+        writer = self.create_writer_without_daemon(records, coalescewindow=16, maxbatchbytes=60)
+        logfile = writer._AsyncFileWriterLog__logfile
+        with patch.object(logfile, 'write', wraps=logfile.write) as write:
+            writer._AsyncFileWriterLog__writeloginactualfile()
+
+        # the formatted lines count, not only their messages
+        assert [call.args[1] for call in write.call_args_list] == [2, 2, 2, 2, 2]
+
+    def test_file_is_kept_open_between_batches(self):
+        writer = self.create_writer_without_daemon(maxbatchrecords=5)
+        with patch('builtins.open', wraps=open) as opened:
+            writer._AsyncFileWriterLog__writeloginactualfile()
+
+        assert opened.call_count <= 1
+
+    def test_daemon_lingers_for_expected_batch_under_load(self):
+        writer = self.create_writer_without_daemon(lingerms=200, wakeupthreshold=100)
+        writer._AsyncFileWriterLog__arrivalrate = 10_000.0
+        writer._AsyncFileWriterLog__lastdrain = time.monotonic() + 3600  # keep the arrival rate as set
+        writer._AsyncFileWriterLog__stop_daemon_work = False
+
+        started = time.monotonic()
+        writer._AsyncFileWriterLog__lingerforbatch()
+
+        assert time.monotonic() - started >= 0.15
+
+    def teardown_method(self):
+        # nothing may be left for the exit handler to write after the file is removed
+        self.writer._AsyncFileWriterLog__logdeque.clear()
+        self.writer._AsyncFileWriterLog__logfile.close()
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+class TestWriteLogMessageAsyncFileWriterLogBoundedQueue:
+    def setup_method(self):
+        self.file_path = 'file.txt'
+        self.loggerjson = { LogConstants.LOG_FUNCTION_NAME : 'function1',
+                      LogConstants.LOG_LEVEL : LoglevelEnum.DEBUG.value,
+                      LogConstants.LOG_MESSAGE: 'log message found' }
+        self.errorjson = { LogConstants.LOG_FUNCTION_NAME : 'function1',
+                      LogConstants.LOG_LEVEL : LoglevelEnum.ERROR.value,
+                      LogConstants.LOG_MESSAGE: 'error message found' }
+
+    def create_writer_without_daemon(self, **kwargs):
+        # stop the daemon thread so the queue is not drained while testing it
+        self.fileWriteLogger = AsyncFileWriterLog(self.file_path, maxqueuesize=2, **kwargs)
+        self.fileWriteLogger._AsyncFileWriterLog__stop_daemon_work = True
+        self.fileWriteLogger._AsyncFileWriterLog__wakeup.set()
+        self.fileWriteLogger._AsyncFileWriterLog__process_log_thread.join()
+        return self.fileWriteLogger._AsyncFileWriterLog__logdeque
+
+    def test_drop_newest_drops_incoming_record(self):
+        logdeque = self.create_writer_without_daemon(overflowpolicy=OverflowPolicyEnum.DROP_NEWEST)
+        for _ in range(2):
+            self.fileWriteLogger.writelog(self.loggerjson)
+        self.fileWriteLogger.writelog(self.errorjson)
+
+        assert list(logdeque) == [self.loggerjson, self.loggerjson]
+        assert self.fileWriteLogger.droppedcount == 1
+
+    def test_drop_oldest_keeps_incoming_record(self):
+        logdeque = self.create_writer_without_daemon(overflowpolicy=OverflowPolicyEnum.DROP_OLDEST)
+        for _ in range(2):
+            self.fileWriteLogger.writelog(self.loggerjson)
+        self.fileWriteLogger.writelog(self.errorjson)
+
+        assert list(logdeque) == [self.loggerjson, self.errorjson]
+        assert self.fileWriteLogger.droppedcount == 1
+
+    def test_drop_oldest_never_drops_flush_markers(self):
+        logdeque = self.create_writer_without_daemon(overflowpolicy=OverflowPolicyEnum.DROP_OLDEST)
+        marker = LogAck()
+        self.fileWriteLogger.writelog(self.loggerjson)
+        logdeque.append(marker)
+        for _ in range(2):
+            self.fileWriteLogger.writelog(self.errorjson)
+
+        assert list(logdeque) == [marker, self.errorjson]
+        assert self.fileWriteLogger.droppedcount == 2
+
+    def test_flush_completes_while_drop_oldest_producers_overflow(self):
+        self.fileWriteLogger = AsyncFileWriterLog(self.file_path, maxqueuesize=2, overflowpolicy=OverflowPolicyEnum.DROP_OLDEST)
+        stop = threading.Event()
+
+        def produce():
+            while not stop.is_set():
+                self.fileWriteLogger.writelog(self.loggerjson)
+
+        producers = [threading.Thread(target=produce) for _ in range(2)]
+        for producer in producers:
+            producer.start()
+        try:
+            assert all(self.fileWriteLogger.flush(timeout=2) for _ in range(30))
+        finally:
+            stop.set()
+            for producer in producers:
+                producer.join()
+
+    def test_block_drops_record_after_timeout(self):
+        logdeque = self.create_writer_without_daemon(overflowpolicy=OverflowPolicyEnum.BLOCK, blocktimeout=0.05)
+        for _ in range(3):
+            self.fileWriteLogger.writelog(self.loggerjson)
+
+        assert len(logdeque) == 2
+        assert self.fileWriteLogger.droppedcount == 1
+
+    def test_drop_below_level_only_drops_less_severe_records(self):
+        logdeque = self.create_writer_without_daemon(overflowpolicy=OverflowPolicyEnum.DROP_BELOW_LEVEL,
+                                                     droplevel=LoglevelEnum.ERROR, blocktimeout=0.05)
+        for _ in range(3):
+            self.fileWriteLogger.writelog(self.loggerjson)
+        logdeque.popleft()
+        self.fileWriteLogger.writelog(self.errorjson)
+
+        assert list(logdeque) == [self.loggerjson, self.errorjson]
+        assert self.fileWriteLogger.droppedcount == 1
+
+    def test_awritelog_waits_for_room_without_blocking_event_loop(self):
+        logdeque = self.create_writer_without_daemon(overflowpolicy=OverflowPolicyEnum.BLOCK, blocktimeout=1)
+        for _ in range(2):
+            self.fileWriteLogger.writelog(self.loggerjson)
+
+        async def drain_later():
+            await asyncio.sleep(0.02)
+            logdeque.popleft()
+
+        async def main():
+            await asyncio.gather(self.fileWriteLogger.awritelog(self.errorjson), drain_later())
+
+        asyncio.run(main())
+
+        assert list(logdeque) == [self.loggerjson, self.errorjson]
+        assert self.fileWriteLogger.droppedcount == 0
+
+    def test_awritelog_drops_record_after_timeout(self):
+        logdeque = self.create_writer_without_daemon(overflowpolicy=OverflowPolicyEnum.BLOCK, blocktimeout=0.05)
+        for _ in range(3):
+            asyncio.run(self.fileWriteLogger.awritelog(self.loggerjson))
+
+        assert len(logdeque) == 2
+        assert self.fileWriteLogger.droppedcount == 1
+
+    def teardown_method(self):
+        self.fileWriteLogger._AsyncFileWriterLog__logdeque.clear()
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+class TestWriteLogMessageAsyncFileWriterLogDurability:
+    def setup_method(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, 'file.txt')
+        self.wal_path = os.path.join(self.directory, 'file.wal')
+        self.writers = []
+
+    def create_writer(self, **kwargs):
+        writer = AsyncFileWriterLog(self.file_path, **kwargs)
+        self.writers.append(writer)
+        return writer
+
+    def test_ack_completes_once_record_is_written_and_fsynced(self):
+        writer = self.create_writer(fsyncpolicy=FsyncPolicyEnum.EVERY_N_RECORDS, fsynceveryrecords=1000)
+        with patch('logger.src.logFileHandle.os.fsync') as fsync:
+            ack = writer.writelogwithack({LogConstants.LOG_MESSAGE: "audit"})
+            assert ack.wait(timeout=5)
+
+        assert fsync.call_count == 1
+        with open(self.file_path, 'r') as f:
+            assert f.read() == "audit\n"
+
+    def test_wal_stays_bounded_under_steady_load(self):
+        writer = self.create_writer(walpath=self.wal_path, maxqueuesize=50, overflowpolicy=OverflowPolicyEnum.BLOCK,
+                                    maxbatchrecords=10, maxlatencyms=1)
+        record = {LogConstants.LOG_MESSAGE: "x" * 100}
+        write = LogFileHandle.write
+        sizes = []
+
+        def slowwrite(logfile, *args, **kwargs):
+            time.sleep(0.001)  # the producer refills the queue before every batch is committed
+            return write(logfile, *args, **kwargs)
+
+        with patch('logger.src.writeLogMessage.WAL_COMPACT_SIZE', 4096), patch.object(LogFileHandle, 'write', slowwrite):
+            for index in range(3000):
+                writer.writelog(record)
+                if index % 10 == 0:
+                    sizes.append(os.path.getsize(self.wal_path))
+            assert writer.flush(timeout=10)
+
+        # without compaction the spill file would grow towards 3000 records, about 350 KB
+        assert max(sizes) < 4096 + 200 * 120
+
+    def test_wal_is_emptied_once_queue_is_written(self):
+        writer = self.create_writer(walpath=self.wal_path)
+        ack = writer.writelogwithack({LogConstants.LOG_MESSAGE: "audit"})
+
+        assert ack.wait(timeout=5)
+        assert os.path.getsize(self.wal_path) == 0
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+    def test_records_queued_by_killed_process_are_replayed_on_start(self):
+        pid = os.fork()
+        if pid == 0:
+            writer = AsyncFileWriterLog(self.file_path, walpath=self.wal_path)
+            # keep every record queued, then die without running atexit
+            writer._AsyncFileWriterLog__stop_daemon_work = True
+            writer._AsyncFileWriterLog__wakeup.set()
+            writer._AsyncFileWriterLog__process_log_thread.join()
+            for index in range(3):
+                writer.writelog({LogConstants.LOG_MESSAGE: f"record-{index}"})
+            os.kill(os.getpid(), signal.SIGKILL)
+        os.waitpid(pid, 0)
+        assert not os.path.exists(self.file_path) or os.path.getsize(self.file_path) == 0
+
+        self.create_writer(walpath=self.wal_path)
+
+        with open(self.file_path, 'r') as f:
+            assert f.read().splitlines() == ["record-0", "record-1", "record-2"]
+        assert os.path.getsize(self.wal_path) == 0
+
+    def test_wal_is_rejected_for_process_safe_writer(self):
+        with pytest.raises(LoggerException) as logException:
+            AsyncFileWriterLog(self.file_path, processsafe=True, walpath=self.wal_path)
+
+        assert LoggerExceptionMessageConstant.PROCESS_SAFE_WAL_EXCEPTION in str(logException.value)
+
+    def teardown_method(self):
+        for writer in self.writers:
+            writer._AsyncFileWriterLog__logdeque.clear()
+            writer._AsyncFileWriterLog__logfile.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+class TestWriteLogMessageAsyncFileWriterLogLifecycle:
+    def setup_method(self):
+        self.file_path = 'file.txt'
+        self.loggerjson = { LogConstants.LOG_MESSAGE: 'log message found' }
+
+    def read_lines(self):
+        with open(self.file_path, 'r') as f:
+            return f.read().splitlines()
+
+    def test_flush_blocks_until_queued_records_are_written(self):
+        self.writer = AsyncFileWriterLog(self.file_path, wakeupthreshold=1000, maxlatencyms=60_000)
+        for _ in range(3):
+            self.writer.writelog(self.loggerjson)
+
+        assert self.writer.flush(timeout=5)
+        assert self.read_lines() == ['log message found'] * 3
+
+    def test_close_drains_queue_and_stops_daemon(self):
+        self.writer = AsyncFileWriterLog(self.file_path, wakeupthreshold=1000, maxlatencyms=60_000)
+        for _ in range(3):
+            self.writer.writelog(self.loggerjson)
+
+        assert self.writer.close(timeout=5) == 0
+        assert not self.writer._AsyncFileWriterLog__process_log_thread.is_alive()
+        assert self.read_lines() == ['log message found'] * 3
+
+    def test_flush_and_close_return_when_writes_keep_failing(self):
+        self.writer = AsyncFileWriterLog(self.file_path, wakeupthreshold=1000, maxlatencyms=60_000)
+        results = []
+        with patch.object(self.writer._AsyncFileWriterLog__logfile, 'write', side_effect=OSError("disk full")):
+            self.writer.writelog(self.loggerjson)
+            ack = self.writer.writelogwithack(self.loggerjson)
+            flushing = threading.Thread(target=lambda: results.append(self.writer.flush()))
+            flushing.start()
+            flushing.join(timeout=5)
+
+            assert not flushing.is_alive()
+            assert results == [False]
+            assert ack.failed and not ack.wait(timeout=0)
+            assert self.writer.close() == 0
+
+    def test_context_manager_closes_writer(self):
+        with AsyncFileWriterLog(self.file_path, maxlatencyms=60_000) as self.writer:
+            self.writer.writelog(self.loggerjson)
+
+        assert self.read_lines() == ['log message found']
+
+    def test_records_logged_after_close_are_written_by_flush(self):
+        self.writer = AsyncFileWriterLog(self.file_path)
+        self.writer.close()
+        self.writer.writelog(self.loggerjson)
+
+        assert self.writer.flush(timeout=5)
+        assert self.read_lines() == ['log message found']
+
+    def test_close_reports_undrained_records_on_timeout(self):
+        self.writer = AsyncFileWriterLog(self.file_path, wakeupthreshold=1, lingerms=0)
+        logfile = self.writer._AsyncFileWriterLog__logfile
+        started = threading.Event()
+
+        def slow_write(*args):
+            started.set()
+            time.sleep(0.3)
+
+        with patch.object(logfile, 'write', side_effect=slow_write):
+            self.writer.writelog(self.loggerjson)
+            assert started.wait(timeout=5)
+            self.writer.writelog(self.loggerjson)
+
+            assert self.writer.close(timeout=0.05) == 1
+            self.writer._AsyncFileWriterLog__process_log_thread.join()
+
+    def teardown_method(self):
+        self.writer.close()
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+class TestWriteLogMessageAsyncFileWriterLogCoalescing:
+    def setup_method(self):
+        self.file_path = 'file.txt'
+
+    def read_lines(self):
+        with open(self.file_path, 'r') as f:
+            return f.read().splitlines()
+
+    def make_record(self, message, timestamp):
+        return {LogConstants.LOG_TIMESTAMP: timestamp, LogConstants.LOG_LEVEL: LoglevelEnum.ERROR.value,
+                LogConstants.LOG_MESSAGE: message}
+
+    def test_identical_records_of_a_batch_are_written_once(self):
+        self.writer = AsyncFileWriterLog(self.file_path, coalescewindow=16, wakeupthreshold=1000, maxlatencyms=60_000)
+        for index in range(5):
+            self.writer.writelog(self.make_record("connection refused", f"t{index}"))
+        self.writer.writelog(self.make_record("timeout", "t5"))
+        self.writer.writelog(self.make_record("connection refused", "t6"))
+
+        assert self.writer.flush(timeout=5)
+        assert self.read_lines() == [
+            f"t0 || {LoglevelEnum.ERROR.value} || connection refused [repeated 6 times, first t0, last t6]",
+            f"t5 || {LoglevelEnum.ERROR.value} || timeout",
+        ]
+
+    def test_lazy_messages_are_compared_rendered(self):
+        self.writer = AsyncFileWriterLog(self.file_path, coalescewindow=16, wakeupthreshold=1000, maxlatencyms=60_000)
+        self.writer.writelog({LogConstants.LOG_MESSAGE: LazyLogMessage("user {}", ("a",))})
+        self.writer.writelog({LogConstants.LOG_MESSAGE: LazyLogMessage("user {}", ("a",))})
+        self.writer.writelog({LogConstants.LOG_MESSAGE: LazyLogMessage("user {}", ("b",))})
+
+        assert self.writer.flush(timeout=5)
+        assert self.read_lines() == ["user a [repeated 2 times]", "user b"]
+
+    def teardown_method(self):
+        self.writer.close()
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+class TestWriteLogMessageMetrics:
+    def setup_method(self):
+        self.file_path = 'file.txt'
+        self.metrics = LogMetricsRegistry().sink("file")
+
+    def test_async_writer_reports_queue_and_batches(self):
+        self.writer = AsyncFileWriterLog(self.file_path, maxqueuesize=3, overflowpolicy=OverflowPolicyEnum.DROP_NEWEST,
+                                         wakeupthreshold=1000, maxlatencyms=60_000, metrics=self.metrics)
+        for _ in range(5):
+            self.writer.writelog(LogRecord("message", timestampns=time.time_ns()))
+        assert self.metrics.snapshot()["queuedepth"] == 3
+
+        assert self.writer.flush(timeout=5)
+        snapshot = self.metrics.snapshot()
+
+        assert (snapshot["accepted"], snapshot["dropped"], snapshot["written"], snapshot["failed"]) == (5, 2, 3, 0)
+        assert (snapshot["queuedepth"], snapshot["queuehighwatermark"]) == (0, 4)
+        assert snapshot["batchsize"]["count"] == 1 and snapshot["batchsize"]["sum"] == 3
+        assert snapshot["maxdrainlagseconds"] > 0
+
+    def test_file_writer_reports_failed_writes(self):
+        self.writer = FileWriterLog(self.file_path, metrics=self.metrics)
+        self.writer.writelog({LogConstants.LOG_MESSAGE: "message"})
+        with patch.object(self.writer._FileWriterLog__logfile, 'write', side_effect=OSError("disk full")):
+            self.writer.writelog({LogConstants.LOG_MESSAGE: "message"})
+        snapshot = self.metrics.snapshot()
+
+        assert (snapshot["accepted"], snapshot["written"], snapshot["failed"]) == (2, 1, 1)
+        assert snapshot["writelatencyseconds"]["count"] == 2
+
+    def test_file_writer_reports_acknowledged_writes(self):
+        self.writer = FileWriterLog(self.file_path, fsyncpolicy=FsyncPolicyEnum.EVERY_RECORD, metrics=self.metrics)
+        assert self.writer.writelogwithack({LogConstants.LOG_MESSAGE: "audit"}).done
+        snapshot = self.metrics.snapshot()
+
+        assert (snapshot["accepted"], snapshot["written"], snapshot["failed"]) == (1, 1, 0)
+        assert snapshot["writelatencyseconds"]["count"] == 1
+
+    def teardown_method(self):
+        self.writer.close()
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+class TestWriteLogMessageMmapFileWriterLog:
+    def setup_method(self):
+        self.file_path = 'file.txt'
+
+    def read_file(self):
+        with open(self.file_path, 'rb') as f:
+            return f.read()
+
+    def test_records_are_written_in_order_across_segments(self):
+        self.writer = MmapFileWriterLog(self.file_path, segmentsize=1)
+        records = [f"record-{index}" for index in range(2000)]
+        for record in records:
+            self.writer.writelog({LogConstants.LOG_MESSAGE: record})
+        self.writer.close()
+
+        assert self.read_file().decode().splitlines() == records
+
+    def test_close_truncates_file_to_written_length(self):
+        self.writer = MmapFileWriterLog(self.file_path)
+        self.writer.writelog({LogConstants.LOG_MESSAGE: "one"})
+        assert os.path.getsize(self.file_path) == 64 * 1024 * 1024
+
+        self.writer.close()
+
+        assert self.read_file() == b"one\n"
+
+    def test_zero_padding_of_unclosed_file_is_trimmed_on_open(self):
+        with open(self.file_path, 'wb') as f:
+            f.write(b"one\n" + b"\0" * 10000)
+
+        self.writer = MmapFileWriterLog(self.file_path, segmentsize=1)
+        self.writer.writelog({LogConstants.LOG_MESSAGE: "two"})
+        self.writer.close()
+
+        assert self.read_file() == b"one\ntwo\n"
+
+    @pytest.mark.skipif(not hasattr(os, "posix_fallocate"), reason="requires posix_fallocate")
+    def test_full_disk_fails_the_write_instead_of_crashing(self, capsys):
+        self.writer = MmapFileWriterLog(self.file_path, segmentsize=1)
+        record = {LogConstants.LOG_MESSAGE: "x" * mmap.ALLOCATIONGRANULARITY}
+        with patch('logger.src.writeLogMessage.os.posix_fallocate', side_effect=OSError(errno.ENOSPC, "No space left on device")):
+            self.writer.writelog(record)
+        self.writer.writelog({LogConstants.LOG_MESSAGE: "one"})
+        self.writer.close()
+
+        assert "[MmapFileWriterLog] Failed to write log" in capsys.readouterr().out
+        assert self.read_file() == b"one\n"
+
+    @pytest.mark.skipif(not hasattr(os, "posix_fallocate"), reason="requires posix_fallocate")
+    def test_segments_are_grown_where_allocation_is_unsupported(self):
+        self.writer = MmapFileWriterLog(self.file_path, segmentsize=1)
+        records = [f"record-{index}" for index in range(2000)]
+        with patch('logger.src.writeLogMessage.os.posix_fallocate', side_effect=OSError(errno.EOPNOTSUPP, "Operation not supported")):
+            for record in records:
+                self.writer.writelog({LogConstants.LOG_MESSAGE: record})
+            self.writer.close()
+
+        assert self.read_file().decode().splitlines() == records
+
+    def test_next_segment_is_mapped_in_background(self):
+        self.writer = MmapFileWriterLog(self.file_path, segmentsize=1)
+        record = {LogConstants.LOG_MESSAGE: "x" * (mmap.ALLOCATIONGRANULARITY // 2)}
+        self.writer.writelog(record)
+
+        deadline = time.monotonic() + 5
+        while self.writer._MmapFileWriterLog__nextsegment is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert self.writer._MmapFileWriterLog__nextsegment is not None
+
+    def teardown_method(self):
+        self.writer.close()
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+class TestWriteLogMessageRingBufferWriterLog:
+    def setup_method(self):
+        self.dumped = deque()
+        self.excepthooks = (sys.excepthook, threading.excepthook)
+        self.writer = RingBufferWriterLog(3, WriteLogsInQueue(self.dumped))
+
+    def record(self, message, level=LoglevelEnum.DEBUG):
+        return {LogConstants.LOG_LEVEL: level.value, LogConstants.LOG_MESSAGE: message}
+
+    def messages(self):
+        return [record[LogConstants.LOG_MESSAGE] for record in self.dumped]
+
+    def test_buffer_keeps_last_records_without_writing_them(self):
+        for index in range(5):
+            self.writer.writelog(self.record(f"record-{index}"))
+
+        assert [record[LogConstants.LOG_MESSAGE] for record in self.writer.snapshot()] == ["record-2", "record-3", "record-4"]
+        assert len(self.dumped) == 0
+
+    def test_error_dumps_buffered_context_once(self):
+        for index in range(4):
+            self.writer.writelog(self.record(f"record-{index}"))
+        self.writer.writelog(self.record("failed", LoglevelEnum.ERROR))
+        self.writer.writelog(self.record("after"))
+        self.writer.writelog(self.record("failed again", LoglevelEnum.CRITICAL))
+
+        assert self.messages() == ["record-2", "record-3", "failed", "after", "failed again"]
+
+    def test_record_still_being_stored_is_dumped_later(self):
+        # a producer drew its sequence number but has not stored its record yet
+        sequence = next(self.writer._RingBufferWriterLog__sequence)
+        self.writer.writelog(self.record("failed", LoglevelEnum.ERROR))
+        assert self.messages() == ["failed"]
+
+        self.writer._RingBufferWriterLog__buffer[sequence % 3] = (sequence, self.record("slow"))
+        self.writer.dump()
+
+        assert self.messages() == ["failed", "slow"]
+
+    def test_concurrent_producers_lose_no_record_between_dumps(self):
+        self.writer = RingBufferWriterLog(100_000, WriteLogsInQueue(self.dumped))
+
+        def produce(worker):
+            for index in range(5000):
+                level = LoglevelEnum.ERROR if index % 100 == 99 else LoglevelEnum.DEBUG
+                self.writer.writelog(self.record(f"worker-{worker}-{index}", level))
+
+        producers = [threading.Thread(target=produce, args=(worker,)) for worker in range(4)]
+        switchinterval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # preempt producers between drawing a number and storing the record
+        try:
+            for producer in producers:
+                producer.start()
+            for producer in producers:
+                producer.join()
+        finally:
+            sys.setswitchinterval(switchinterval)
+        self.writer.dump()
+
+        assert sorted(self.messages()) == sorted(f"worker-{worker}-{index}" for worker in range(4) for index in range(5000))
+
+    def test_lazy_messages_are_only_rendered_when_dumped(self):
+        message = MagicMock(return_value="rendered")
+        self.writer.writelog(LogRecord(LazyLogMessage(message), LoglevelEnum.DEBUG.value))
+        assert message.call_count == 0
+
+        self.writer.writelog(LogRecord("failed", LoglevelEnum.ERROR.value))
+
+        assert message.call_count == 1
+        assert self.dumped[0] == {LogConstants.LOG_LEVEL: LoglevelEnum.DEBUG.value, LogConstants.LOG_MESSAGE: "rendered"}
+        assert type(self.dumped[0]) is dict
+
+    def test_unhandled_exception_in_thread_dumps_buffer(self):
+        self.writer.writelog(self.record("context"))
+
+        def fail():
+            raise ValueError("boom")
+
+        with patch.object(self.writer, '_RingBufferWriterLog__previousthreadexcepthook'):
+            thread = threading.Thread(target=fail)
+            thread.start()
+            thread.join()
+
+        assert self.messages()[0] == "context"
+        assert self.dumped[1][LogConstants.LOG_LEVEL] == LoglevelEnum.CRITICAL.value
+        assert "ValueError: boom" in self.dumped[1][LogConstants.LOG_MESSAGE]
+
+    def test_close_restores_exception_hooks(self):
+        self.writer.close()
+
+        assert (sys.excepthook, threading.excepthook) == self.excepthooks
+
+    def teardown_method(self):
+        self.writer.close()